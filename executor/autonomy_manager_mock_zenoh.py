@@ -1,8 +1,6 @@
 from google.protobuf.wrappers_pb2 import BoolValue, StringValue
-from google.protobuf.message import DecodeError
 
 import rtr.pb2 as rtr
-import bridge_request.pb2 as bridge_pb
 
 import zenoh
 
@@ -18,212 +16,63 @@ import threading
 from threading import Event
 from queue import Queue, Full, Empty
 from functools import partial
+from typing import Dict
 
 import utils as aou
 
 logging.basicConfig(level=logging.INFO)
 
-from message_types import MessageType
+from service_runtime import ServiceError, ServiceRuntime
 from service_utils import make_service_reply
 
-def _proto_to_msg_type(mt: int) -> MessageType:
-    if mt == bridge_pb.IMU:
-        return MessageType.IMU
-    if mt == bridge_pb.DWM:
-        return MessageType.DWM
-    raise ValueError(f"Unknown BridgeMessageType: {mt}")
-
-class BridgeMgmtService:
-    def __init__(self, session: zenoh.Session, bridge_mgr, resource_name: str):
-        self._session = session
-        self._bridge_mgr = bridge_mgr
-        self._resource_name = resource_name
-        self._token = self._session.liveliness().declare_token(resource_name)
-
-        self._open_q = self._session.declare_queryable(
-            resource_name + "/open_bridge",
-            self.handle_open_bridge
-        )
-        self._close_q = self._session.declare_queryable(
-            resource_name + "/close_bridge",
-            self.handle_close_bridge
-        )
-
-    def handle_open_bridge(self, query: zenoh.Query):
-        try:
-            req = bridge_pb.OpenBridgeRequest()
-            req.ParseFromString(query.payload.to_bytes())
-
-            bridge_id = self._bridge_mgr.open_bridge(
-                req.outbound_topic,
-                _proto_to_msg_type(req.message_type)
-            )
-
-            rep = bridge_pb.OpenBridgeReply()
-            rep.status.CopyFrom(make_service_reply(
-                is_successful=True,
-                message="Bridge created successfully",
-                error=""
-            ))
-
-            query.reply(
-                self._open_q.key_expr,
-                payload=zenoh.ZBytes(rep.SerializeToString())
-            )
-
-        except DecodeError:
-            rep = bridge_pb.OpenBridgeReply()
-            rep.status.CopyFrom(make_service_reply(
-                is_successful=False,
-                message="Unable to parse open_bridge request",
-                error="DecodeError"
-            ))
-
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
-
-        except Exception as e:
-            rep = bridge_pb.OpenBridgeReply()
-            rep.status.CopyFrom(make_service_reply(
-                is_successful=False,
-                message="Failed to open bridge",
-                error=str(e)
-            ))
-
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
-
-    def handle_close_bridge(self, query: zenoh.Query):
-        try:
-            req = bridge_pb.CloseBridgeRequest()
-            req.ParseFromString(query.payload.to_bytes())
-
-            self._bridge_mgr.close_bridge(req.bridge_id)
-
-            rep = bridge_pb.CloseBridgeReply()
-            rep.status.CopyFrom(make_service_reply(
-                is_successful=True,
-                message=f"Bridge '{req.bridge_id}' closed successfully",
-                error=""
-            ))
-
-            query.reply(
-                self._close_q.key_expr,
-                payload=zenoh.ZBytes(rep.SerializeToString())
-            )
-
-        except DecodeError:
-            rep = bridge_pb.CloseBridgeReply()
-            rep.status.CopyFrom(make_service_reply(
-                is_successful=False,
-                message="Unable to parse close_bridge request",
-                error="DecodeError"
-            ))
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
-
-        except Exception as e:
-            rep = bridge_pb.CloseBridgeReply()
-            rep.status.CopyFrom(make_service_reply(
-                is_successful=False,
-                message="Failed to close bridge",
-                error=str(e)
-            ))
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
-
-    def stop(self):
-        self._open_q.undeclare()
-        self._close_q.undeclare()
-
 '''
 Alternative implementation using Zenoh query/reply framework.
 '''
 class TaskManagementService:
 
-    def __init__(self, session : zenoh.Session, task_queue : Queue, resource_name : str):
-        self._session = session
+    def __init__(self, session : zenoh.Session, runtime : ServiceRuntime, task_queue : Queue, resource_name : str):
+        self._runtime = runtime
         self._task_queue = task_queue
         self._resource_name = resource_name
-        self._token = self._session.liveliness().declare_token(resource_name)
+        self._token = session.liveliness().declare_token(resource_name)
 
-        self._submit_task_queryable = self._session.declare_queryable(
-            resource_name + "/submit_task",
-            self.handle_submit_task
-        )
-        self._cancel_task_queryable = self._session.declare_queryable(
-            resource_name + "/cancel_task",
-            self.handle_cancel_task
-        )
+        self._keys = (resource_name + "/submit_task", resource_name + "/cancel_task")
+        self._runtime.declare(self._keys[0], self.handle_submit_task, request_type=rtr.TaskAttempt)
+        self._runtime.declare(self._keys[1], self.handle_cancel_task, request_type=StringValue)
 
-    def handle_submit_task(self, query : zenoh.Query):
-        try:
-            taskatt_msg = rtr.TaskAttempt()
-            taskatt_msg.ParseFromString(query.payload.to_bytes())
-            logging.getLogger(__name__).info(f"Received new TaskAttempt:\n{taskatt_msg}")
+    def handle_submit_task(self, taskatt_msg):
+        logger = logging.getLogger(__name__)
+        logger.info("Received new TaskAttempt for '%s' from '%s'", taskatt_msg.task.task_name, taskatt_msg.agent_name)
+        # Formatting a whole TaskAttempt is costly; only do it when asked for.
+        logger.debug("TaskAttempt:\n%s", taskatt_msg)
 
+        try:
             self._task_queue.put_nowait(taskatt_msg)
-
-            rep = make_service_reply(
-                is_successful=True,
-                message="Task submitted successfully",
-                error=""
-            )
-            query.reply(
-                self._submit_task_queryable.key_expr,
-                payload=zenoh.ZBytes(rep.SerializeToString())
-            )
-
-        except DecodeError:
-            rep = make_service_reply(
-                is_successful=False,
-                message="Unable to parse TaskAttempt payload",
-                error="DecodeError"
-            )
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
-
         except Full:
-            rep = make_service_reply(
-                is_successful=False,
-                message="Task queue is full",
-                error="QueueFull"
-            )
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
-
-    def handle_cancel_task(self, query: zenoh.Query):
-        try:
-            task_name = StringValue()
-            task_name.ParseFromString(query.payload.to_bytes())
-            logging.getLogger(__name__).info(f"Received cancel request for {task_name}")
+            raise ServiceError("Task queue is full", "QueueFull") from None
 
-            self._task_queue.put_nowait("cancel")
+        return make_service_reply(
+            is_successful=True,
+            message="Task submitted successfully",
+            error=""
+        )
 
-            rep = make_service_reply(
-                is_successful=True,
-                message=f"Cancel request accepted for task '{task_name.value}'",
-                error=""
-            )
-            query.reply(
-                self._cancel_task_queryable.key_expr,
-                payload=zenoh.ZBytes(rep.SerializeToString())
-            )
-
-        except DecodeError:
-            rep = make_service_reply(
-                is_successful=False,
-                message="Unable to parse cancel request payload",
-                error="DecodeError"
-            )
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
+    def handle_cancel_task(self, task_name):
+        logging.getLogger(__name__).info("Received cancel request for '%s'", task_name.value)
 
+        try:
+            self._task_queue.put_nowait("cancel")
         except Full:
-            rep = make_service_reply(
-                is_successful=False,
-                message="Task queue is full; unable to enqueue cancel request",
-                error="QueueFull"
-            )
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
+            raise ServiceError("Task queue is full; unable to enqueue cancel request", "QueueFull") from None
 
+        return make_service_reply(
+            is_successful=True,
+            message=f"Cancel request accepted for task '{task_name.value}'",
+            error=""
+        )
 
     def stop(self):
-        self._submit_task_queryable.undeclare()
-        self._cancel_task_queryable.undeclare()
+        self._runtime.undeclare(*self._keys)
 
 
 class AutonomyManager:
@@ -231,27 +80,31 @@ class AutonomyManager:
     backend/bridge_mgmt/open_bridge
 
     backend/bridge_mgmt/close_bridge
+
+    All queryables (bridge management and task management) share one
+    ServiceRuntime, so no handler runs on a Zenoh callback thread.
     """
     def __init__(self, config):
         from bridge_executor_service import BridgeManager
 
-        # Create BridgeManager USING THE SAME SESSION
-        self._bridge_mgr = BridgeManager(self._zenoh_sesh, max_workers=6)
+        logging.getLogger(__name__).info("Initializing AutonomyManager...")
 
-        # Start sensor tasks (configurable)
-        self._bridge_mgr.start_sensors(enable_imu=True, enable_dwm=True)
+        self._zenoh_sesh = zenoh.open(zenoh.Config().from_file(Path(__file__).parent / "config" / "acl_config.json"))
+        self._runtime = ServiceRuntime(self._zenoh_sesh, name="autonomy-svc")
 
-        # Create Bridge Management Service (queryables)
-        self._bridge_mgmt = BridgeMgmtService(
+        # Create BridgeManager USING THE SAME SESSION; it serves
+        # backend/bridge_mgmt/* on the shared runtime.
+        self._bridge_mgr = BridgeManager(
             self._zenoh_sesh,
-            self._bridge_mgr,
-            aou.QueryableServices.BRIDGE_MGMT
+            aou.QueryableServices.BRIDGE_MGMT,
+            max_workers=6,
+            runtime=self._runtime,
         )
 
-        self._task_queue = Queue(maxsize=1)
-        logging.getLogger(__name__).info("Initializing AutonomyManager...")
+        # Start sensor tasks (configurable)
+        self._bridge_mgr.start_sensors(enable_imu=True, enable_dwm=True)
 
-        self._zenoh_sesh = zenoh.open(zenoh.Config().from_file(Path(__file__).parent / "config" / "acl_config.json"))
+        self._task_queue = Queue(maxsize=1)
 
         self._curr_task_name = ""
         self._task_machine = None
@@ -270,7 +123,12 @@ class AutonomyManager:
         logging.getLogger(__name__).info(f"Service queriers created:\n{list(self._queriers_dict.keys())}")
 
         logging.getLogger(__name__).info("Creating Task Management Service")
-        self._task_mgmt = TaskManagementService(self._zenoh_sesh, self._task_queue, aou.QueryableServices.TASK_MGMT)
+        self._task_mgmt = TaskManagementService(
+            self._zenoh_sesh,
+            self._runtime,
+            self._task_queue,
+            aou.QueryableServices.TASK_MGMT,
+        )
 
         logging.getLogger(__name__).info("Done.")
 
@@ -296,8 +154,8 @@ class AutonomyManager:
     def shutdown(self):
         logging.getLogger(__name__).warning("Autonomy Manager shutting down.")
         self._task_mgmt.stop()
-        self._bridge_mgmt.stop()
         self._bridge_mgr.shutdown()      # stops tasks/executor only
+        self._runtime.shutdown()         # waits for in-flight queries
         self._zenoh_sesh.close()         # closes the ONE shared session
 
 def main():
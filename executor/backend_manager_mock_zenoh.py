@@ -2,13 +2,20 @@ from pathlib import Path
 import argparse
 import logging
 import time
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import zenoh
 
 import utils as aou
 from bridge_executor_service import BridgeManager
-from constants import ZENOH_ENDPOINT
+from constants import IMU_REPORT_RATE_HZ, SIM_DWM_RATE_HZ, SIM_IMU_RATE_HZ, ZENOH_ENDPOINT
+
+if TYPE_CHECKING:
+    # Imported where --record / --replay* / --sim* are handled, so the
+    # default hardware path loads none of them.
+    from sample_log import SampleRecorder
+    from sample_replay import ReplayConfig
+    from sim_sensors import SimConfig
 
 logging.basicConfig(level=logging.INFO)
 
@@ -31,7 +38,12 @@ class BackendManager:
         enable_imu: bool = True,
         enable_dwm: bool = True,
         dwm_port: str = "/dev/ttyACM0",
+        imu_rate_hz: float = IMU_REPORT_RATE_HZ,
         zenoh_endpoint: Optional[str] = None,
+        sensor_processes: bool = False,
+        sim: Optional["SimConfig"] = None,
+        record_path: Optional[str] = None,
+        replay: Optional["ReplayConfig"] = None,
     ):
         """
         Store configuration only. Do not start network/session/sensors here.
@@ -41,17 +53,31 @@ class BackendManager:
             enable_imu: Whether to start the IMU sensor worker.
             enable_dwm: Whether to start the DWM sensor worker.
             dwm_port: Serial port for the DWM device.
+            imu_rate_hz: Report rate requested from the IMU.
             zenoh_endpoint: Optional Zenoh router endpoint, e.g. tcp/192.168.1.50:7447.
                             If None, Zenoh default discovery/config is used.
+            sensor_processes: Run each sensor worker in its own process, sharing
+                              state through shared memory.
+            sim: If set, run simulated IMU/DWM sources with these settings
+                 instead of the hardware workers.
+            record_path: If set, record every sensor sample to this sample log.
+            replay: If set, play IMU/DWM back from a recorded sample log instead
+                    of the hardware workers.
         """
         self._exec_period = float(exec_period)
         self._enable_imu = bool(enable_imu)
         self._enable_dwm = bool(enable_dwm)
         self._dwm_port = str(dwm_port)
+        self._imu_rate_hz = float(imu_rate_hz)
         self._zenoh_endpoint = zenoh_endpoint
+        self._sensor_processes = bool(sensor_processes)
+        self._sim = sim
+        self._record_path = record_path
+        self._replay = replay
 
         self._zenoh_sesh: Optional[zenoh.Session] = None
         self._bridge_mgr: Optional[BridgeManager] = None
+        self._recorder: Optional["SampleRecorder"] = None
         self._is_started = False
         self._is_shutdown = False
 
@@ -62,6 +88,7 @@ class BackendManager:
         This:
         - opens the shared Zenoh session
         - creates the BridgeManager
+        - starts the sample recorder, if configured
         - starts the configured sensor workers
 
         Safe to call once. Calling it multiple times is a no-op.
@@ -84,13 +111,24 @@ class BackendManager:
             self._zenoh_sesh,
             aou.QueryableServices.BRIDGE_MGMT,
             max_workers=6,
+            sensor_processes=self._sensor_processes,
         )
 
+        # Record from the first sample on
+        if self._record_path:
+            from sample_log import SampleRecorder
+
+            self._recorder = SampleRecorder(self._bridge_mgr.state, self._record_path)
+            self._recorder.start()
+
         # Start sensors
         self._bridge_mgr.start_sensors(
             enable_imu=self._enable_imu,
             enable_dwm=self._enable_dwm,
             dwm_port=self._dwm_port,
+            imu_rate_hz=self._imu_rate_hz,
+            sim=self._sim,
+            replay=self._replay,
         )
 
         self._is_started = True
@@ -122,6 +160,10 @@ class BackendManager:
 
         logging.getLogger(__name__).warning("BackendManager shutting down.")
 
+        if self._recorder is not None:
+            self._recorder.stop()
+            self._recorder = None
+
         if self._bridge_mgr is not None:
             self._bridge_mgr.shutdown()
             self._bridge_mgr = None
@@ -149,6 +191,23 @@ def build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument("--no-imu", action="store_true")
     parser.add_argument("--no-dwm", action="store_true")
     parser.add_argument("--dwm-port", default="/dev/ttyACM0")
+    parser.add_argument("--imu-rate-hz", type=float, default=IMU_REPORT_RATE_HZ)
+    parser.add_argument(
+        "--sensor-processes",
+        action="store_true",
+        help="Run sensor workers in separate processes over shared memory",
+    )
+    parser.add_argument("--sim", action="store_true", help="Use simulated sensors instead of hardware")
+    parser.add_argument("--sim-imu-rate-hz", type=float, default=SIM_IMU_RATE_HZ)
+    parser.add_argument("--sim-dwm-rate-hz", type=float, default=SIM_DWM_RATE_HZ)
+    parser.add_argument("--sim-noise", type=float, default=1.0, help="Noise multiplier (0 = noiseless)")
+    parser.add_argument("--sim-dropout", type=float, default=0.0, help="Probability of dropping each sample")
+    parser.add_argument("--sim-seed", type=int, default=None)
+    parser.add_argument("--record", default=None, help="Record all sensor samples to this log file")
+    parser.add_argument("--replay", default=None, help="Play sensors back from this recorded log")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="Playback speed (0 = as fast as possible)")
+    parser.add_argument("--replay-start-ts", type=float, default=None, help="Recorded time to start playback at")
+    parser.add_argument("--replay-loop", action="store_true")
     parser.add_argument(
         "--zenoh-endpoint",
         default=None,
@@ -158,6 +217,33 @@ def build_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def sim_config_from_args(args: argparse.Namespace) -> Optional["SimConfig"]:
+    if not args.sim:
+        return None
+    from sim_sensors import SimConfig
+
+    return SimConfig(
+        imu_rate_hz=args.sim_imu_rate_hz,
+        dwm_rate_hz=args.sim_dwm_rate_hz,
+        noise=args.sim_noise,
+        dropout=args.sim_dropout,
+        seed=args.sim_seed,
+    )
+
+
+def replay_config_from_args(args: argparse.Namespace) -> Optional["ReplayConfig"]:
+    if not args.replay:
+        return None
+    from sample_replay import ReplayConfig
+
+    return ReplayConfig(
+        path=args.replay,
+        speed=args.replay_speed,
+        start_ts=args.replay_start_ts,
+        loop=args.replay_loop,
+    )
+
+
 def main() -> None:
     parser = build_arg_parser()
     args = parser.parse_args()
@@ -167,7 +253,12 @@ def main() -> None:
         enable_imu=not args.no_imu,
         enable_dwm=not args.no_dwm,
         dwm_port=args.dwm_port,
+        imu_rate_hz=args.imu_rate_hz,
         zenoh_endpoint=args.zenoh_endpoint,
+        sensor_processes=args.sensor_processes,
+        sim=sim_config_from_args(args),
+        record_path=args.record,
+        replay=replay_config_from_args(args),
     )
 
     backend.start()
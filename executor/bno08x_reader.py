@@ -0,0 +1,149 @@
+import struct
+import time
+from typing import Callable, Dict, Iterable, Tuple
+
+from constants import IMU_I2C_FREQUENCY, IMU_IDLE_SLEEP_SEC, IMU_MAX_READ_ERRORS, IMU_REPORT_RATE_HZ, IMU_REPORTS
+
+# Report name -> (BNO08x report id, SharedState sensor)
+_REPORT_IDS = {
+    "rotation": (0x05, "imu"),  # BNO_REPORT_ROTATION_VECTOR
+    "game_rotation": (0x08, "imu"),  # BNO_REPORT_GAME_ROTATION_VECTOR (no magnetometer)
+    "accel": (0x01, "imu_accel"),  # BNO_REPORT_ACCELEROMETER
+    "linear_accel": (0x04, "imu_accel"),  # BNO_REPORT_LINEAR_ACCELERATION
+    "gyro": (0x02, "imu_gyro"),  # BNO_REPORT_GYROSCOPE
+}
+
+# StreamingBNO08X overrides or calls these adafruit_bno08x internals:
+# _separate_batch(), _packet_slices, _handle_packet(), _process_report(),
+# _readings and _process_available_packets(); enable_feature() also needs
+# the report_interval argument added in 1.3.0. Checked against 1.3.x
+# (adafruit-circuitpython-bno08x); re-check them before moving the pin.
+_BNO08X_PINNED = "1.3."
+
+_BASE_TIMESTAMP = 0xFB
+_TICK_NS = 100_000  # SH-2 timestamps are in 100 us ticks
+_INT32 = struct.Struct("<i")
+
+# Called as on_report(report_id, data, read_ns)
+ReportCallback = Callable[[int, tuple, int], None]
+
+
+def _streaming_bno_class():
+    """
+    Build the BNO08X_I2C subclass lazily so adafruit_bno08x is imported
+    only when an IMU is actually started.
+    """
+    import adafruit_bno08x
+    from adafruit_bno08x import _separate_batch
+    from adafruit_bno08x.i2c import BNO08X_I2C
+
+    version = getattr(adafruit_bno08x, "__version__", "unknown")
+    if not version.startswith(_BNO08X_PINNED):
+        print(f"[IMU] adafruit_bno08x {version} is untested; StreamingBNO08X expects {_BNO08X_PINNED}x")
+
+    class StreamingBNO08X(BNO08X_I2C):
+        """
+        BNO08X_I2C that hands every sensor report to a callback.
+
+        The stock driver keeps only the latest reading per report id and
+        processes batched reports newest-first, so intermediate reports are
+        overwritten. Here each packet's reports are processed in order and
+        streamed, with a timestamp rebuilt from the packet arrival time,
+        the base timestamp report and each report's own delay field.
+        """
+
+        def __init__(self, i2c, on_report: ReportCallback, stream_ids: Iterable[int], **kwargs):
+            # Set before super().__init__, which already processes packets.
+            self._on_report = on_report
+            self._stream_ids = frozenset(stream_ids)
+            self._arrival_ns = time.monotonic_ns()
+            self._base_delta_ns = 0
+            super().__init__(i2c, **kwargs)
+
+        def _handle_packet(self, packet) -> None:
+            self._arrival_ns = time.monotonic_ns()
+            self._base_delta_ns = 0
+            slices = self._packet_slices
+            _separate_batch(packet, slices)
+            pending = list(slices)
+            slices.clear()
+            for report_id, report_bytes in pending:
+                self._process_report(report_id, report_bytes)
+
+        def _process_report(self, report_id: int, report_bytes: bytearray) -> None:
+            if report_id == _BASE_TIMESTAMP:
+                self._base_delta_ns = _INT32.unpack_from(report_bytes, 1)[0] * _TICK_NS
+                return
+            super()._process_report(report_id, report_bytes)
+            if report_id in self._stream_ids:
+                delay_ticks = ((report_bytes[2] >> 2) << 8) | report_bytes[3]
+                read_ns = self._arrival_ns - self._base_delta_ns + delay_ticks * _TICK_NS
+                self._on_report(report_id, self._readings[report_id], read_ns)
+
+    return StreamingBNO08X
+
+
+def run_bno08x(
+    stop,
+    state,
+    *,
+    rate_hz: float = IMU_REPORT_RATE_HZ,
+    reports: Tuple[str, ...] = IMU_REPORTS,
+) -> None:
+    """
+    Stream BNO08x reports into SharedState until stop is set.
+
+    Enables each report in reports (see _REPORT_IDS) at rate_hz, then on
+    every wakeup drains all pending packets, storing each report as its
+    own sample with its sensor-side timestamp: orientation to "imu",
+    acceleration to "imu_accel" and angular rate to "imu_gyro".
+
+    Isolated read errors are skipped. After IMU_MAX_READ_ERRORS in a row
+    the bus is released and the last error is raised, so the sensor
+    supervisor reopens the device instead of this loop retrying a dead
+    bus forever.
+    """
+    import board
+    import busio
+
+    unknown = [name for name in reports if name not in _REPORT_IDS]
+    if unknown:
+        raise ValueError(f"Unknown IMU reports: {unknown}")
+    if rate_hz <= 0:
+        raise ValueError(f"rate_hz must be positive, got {rate_hz}")
+
+    sensors: Dict[int, str] = {_REPORT_IDS[name][0]: _REPORT_IDS[name][1] for name in reports}
+    received = 0
+
+    def on_report(report_id: int, data: tuple, read_ns: int) -> None:
+        nonlocal received
+        received += 1
+        state.update(sensors[report_id], data, read_ns)
+
+    print(f"[IMU] Initializing at {rate_hz:g} Hz, reports={','.join(reports)}...")
+    i2c = busio.I2C(board.SCL, board.SDA, frequency=IMU_I2C_FREQUENCY)
+    try:
+        bno = _streaming_bno_class()(i2c, on_report, sensors)
+        interval_us = int(1e6 / rate_hz)
+        for report_id in sensors:
+            bno.enable_feature(report_id, report_interval=interval_us)
+        print("[IMU] Worker started")
+
+        errors = 0
+        while not stop.is_set():
+            before = received
+            try:
+                bno._process_available_packets()
+                errors = 0
+            except Exception as e:
+                errors += 1
+                if errors == 1:
+                    print(f"[IMU] Read error: {e}")
+                if errors >= IMU_MAX_READ_ERRORS:
+                    raise RuntimeError(f"{errors} consecutive IMU read errors, last: {e}") from e
+            if received == before:
+                time.sleep(IMU_IDLE_SLEEP_SEC)
+    finally:
+        i2c.deinit()
+
+    print("[IMU] Worker stopping")
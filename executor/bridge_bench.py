@@ -0,0 +1,114 @@
+import argparse
+import time
+from threading import Lock
+
+import zenoh
+
+from bridge_executor_service import BridgeManager
+from frame_meta import FrameMeta
+from message_types import Codec, PublishMode
+from sample_replay import ReplayConfig
+from sim_sensors import SimConfig
+from sub_client import StreamStats
+
+
+def main():
+    """
+    Hardware-free load test: simulated (or replayed) sensors -> N bridges ->
+    local subscriber.
+
+    Reports delivered frame rate, per-stage latency and loss across all
+    bridges, plus the bridge manager's own CPU use.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zenoh-endpoint", default=None)
+    parser.add_argument("--bridges", type=int, default=10, help="Bridges to open")
+    parser.add_argument("--type", default="imu", help="Sensor type every bridge publishes")
+    parser.add_argument("--mode", default="on_change", choices=["periodic", "on_change"])
+    parser.add_argument("--codec", default="protobuf", choices=["json", "protobuf"])
+    parser.add_argument("--rate-hz", type=float, default=0.0, help="Per-bridge rate (0 = default)")
+    parser.add_argument("--batch-samples", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--sim-imu-rate-hz", type=float, default=1000.0)
+    parser.add_argument("--sim-dwm-rate-hz", type=float, default=50.0)
+    parser.add_argument("--sim-noise", type=float, default=1.0)
+    parser.add_argument("--sim-dropout", type=float, default=0.0)
+    parser.add_argument("--sensor-processes", action="store_true")
+    parser.add_argument("--replay", default=None, help="Feed bridges from this recorded log instead")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="0 = as fast as possible")
+    args = parser.parse_args()
+
+    config = zenoh.Config()
+    if args.zenoh_endpoint:
+        config.insert_json5("connect/endpoints", f'["{args.zenoh_endpoint}"]')
+    z = zenoh.open(config)
+
+    streams = {}
+    stats_lock = Lock()
+
+    def listener(sample):
+        recv_ts = time.time()
+        attachment = sample.attachment
+        meta = FrameMeta.unpack(attachment.to_bytes()) if attachment is not None else None
+        if meta is None:
+            return
+        with stats_lock:
+            stream = streams.get(str(sample.key_expr))
+            if stream is None:
+                stream = streams[str(sample.key_expr)] = StreamStats()
+            stream.add(meta, recv_ts)
+
+    sub = z.declare_subscriber("bench/**", listener)
+
+    mgr = BridgeManager(z, "bench/bridge_mgmt", sensor_processes=args.sensor_processes)
+    for i in range(args.bridges):
+        mgr.open_bridge(
+            f"bench/{i}",
+            args.type,
+            PublishMode(args.mode),
+            Codec(args.codec),
+            batch_max_samples=args.batch_samples,
+            rate_hz=args.rate_hz,
+        )
+    if args.replay:
+        mgr.start_sensors(replay=ReplayConfig(args.replay, speed=args.replay_speed, loop=True))
+    else:
+        mgr.start_sensors(
+            sim=SimConfig(
+                imu_rate_hz=args.sim_imu_rate_hz,
+                dwm_rate_hz=args.sim_dwm_rate_hz,
+                noise=args.sim_noise,
+                dropout=args.sim_dropout,
+            )
+        )
+
+    cpu_start = time.process_time()
+    time.sleep(args.duration)
+    cpu_sec = time.process_time() - cpu_start
+    rep = mgr.collect_stats()
+
+    mgr.shutdown()
+    sub.undeclare()
+    z.close()
+
+    # Merge every bridge into one distribution; loss stays per-stream gap based.
+    stats = StreamStats()
+    with stats_lock:
+        for stream in streams.values():
+            stats.received += stream.received
+            stats.lost += stream.lost
+            stats.reordered += stream.reordered
+            for stage, values in stream.latency_ms.items():
+                stats.latency_ms[stage].extend(values)
+
+    print(f"bridges={args.bridges} type={args.type} mode={args.mode} codec={args.codec}")
+    print(f"delivered {stats.received / args.duration:.0f} frames/s")
+    for line in stats.report():
+        print(line)
+    for s in rep.sensors:
+        print(f"sensor {s.name} rate={s.update_rate_hz:.1f}Hz")
+    print(f"scheduler cpu={rep.scheduler_cpu_sec:.3f}s process cpu={cpu_sec:.3f}s over {args.duration:g}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import position_pb2
+
+from message_types import Codec
+from sensor_drivers import SensorDriver
+from shared_state import Sample
+
+
+def sample_value(driver: SensorDriver, sample: Sample) -> Optional[tuple]:
+    """
+    Numeric value of a SharedState Sample as a plain tuple in the driver's
+    column order, e.g. (i, j, k, w) for IMU and (x_m, y_m, z_m) for DWM.
+    Returns None if the sensor has no usable sample yet.
+    """
+    if sample.value is None:
+        return None
+    return driver.to_row(sample.value)
+
+
+class SampleBatch:
+    """
+    Columnar accumulator for one batched bridge.
+
+    Samples are appended as parallel ts / seq / value columns so the codec
+    can write them straight into packed repeated fields. last_seq survives
+    clear() so a sample is never batched twice. read_ns is the read time
+    of the newest sample handed to the bridge, for frame timing.
+    """
+    __slots__ = ("max_samples", "max_sec", "ts", "seq", "values", "last_seq", "read_ns")
+
+    def __init__(self, max_samples: int = 0, max_sec: float = 0.0):
+        self.max_samples = max_samples
+        self.max_sec = max_sec
+        self.ts: List[float] = []
+        self.seq: List[int] = []
+        self.values: List[tuple] = []
+        self.last_seq: Optional[int] = None
+        self.read_ns = 0
+
+    def add(self, ts: float, seq: int, value: tuple) -> bool:
+        """
+        Append one sample. Returns True when the batch is full.
+        """
+        self.ts.append(ts)
+        self.seq.append(seq)
+        self.values.append(value)
+        self.last_seq = seq
+        return 0 < self.max_samples <= len(self.ts)
+
+    def clear(self) -> None:
+        self.ts.clear()
+        self.seq.clear()
+        self.values.clear()
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+class JsonCodec:
+    """
+    Human-readable JSON payloads (the original bridge wire format).
+
+    A sample is {"type", "ts", ...columns}, with the columns nested under
+    the driver's json_group if it has one (IMU: "quat"). Batches use
+    "<type>_batch" and one list per column.
+    """
+    codec = Codec.JSON
+
+    def encode(self, driver: SensorDriver, sample: Sample) -> Optional[bytes]:
+        value = sample.value
+        if value is None:
+            return None
+
+        data = {"type": driver.name, "ts": sample.ts}
+        if driver.json_fields is not None:
+            data.update(driver.json_fields(value))
+        else:
+            row = driver.to_row(value)
+            if row is None:
+                return None
+            data.update(self._group(driver, dict(zip(driver.columns, row))))
+        return json.dumps(data).encode()
+
+    def encode_batch(self, driver: SensorDriver, batch: SampleBatch) -> Optional[bytes]:
+        if not batch:
+            return None
+        data = {"type": f"{driver.name}_batch", "ts": batch.ts, "seq": batch.seq}
+        data.update(self._group(driver, dict(zip(driver.columns, zip(*batch.values)))))
+        return json.dumps(data).encode()
+
+    @staticmethod
+    def _group(driver: SensorDriver, columns: dict) -> dict:
+        return {driver.json_group: columns} if driver.json_group else columns
+
+
+class ProtobufCodec:
+    """
+    Binary payloads: the driver's position_pb2 message (telemetry.Orientation
+    for IMU, telemetry.Position for DWM) and its batch message.
+
+    Message objects are created once per driver and reused across calls,
+    so an instance must only be used from one thread at a time (the bridge
+    scheduler thread).
+    """
+    codec = Codec.PROTOBUF
+
+    def __init__(self, source: str = ""):
+        self._source = source
+        # (driver name, batch?) -> reusable message
+        self._messages: Dict[tuple, Any] = {}
+
+    def _message(self, driver: SensorDriver, batch: bool):
+        key = (driver.name, batch)
+        msg = self._messages.get(key)
+        if msg is None:
+            name = driver.proto_batch if batch else driver.proto_message
+            if not name:
+                return None
+            msg = self._messages[key] = getattr(position_pb2, name)(source=self._source)
+        return msg
+
+    def encode(self, driver: SensorDriver, sample: Sample) -> Optional[bytes]:
+        if sample.value is None:
+            return None
+        row = driver.to_row(sample.value)
+        msg = self._message(driver, batch=False)
+        if row is None or msg is None:
+            return None
+        for name, value in zip(driver.columns, row):
+            setattr(msg, name, value)
+        msg.ts = sample.ts
+        msg.seq = sample.seq
+        return msg.SerializeToString()
+
+    def encode_batch(self, driver: SensorDriver, batch: SampleBatch) -> Optional[bytes]:
+        if not batch:
+            return None
+        msg = self._message(driver, batch=True)
+        if msg is None:
+            return None
+
+        del msg.ts[:]
+        del msg.seq[:]
+        msg.ts.extend(batch.ts)
+        msg.seq.extend(batch.seq)
+        for name, values in zip(driver.columns, zip(*batch.values)):
+            column = getattr(msg, name)
+            del column[:]
+            column.extend(values)
+        return msg.SerializeToString()
+
+
+def make_codecs(source: str = "") -> Dict[Codec, Any]:
+    """
+    One instance of every codec, keyed by Codec.
+    """
+    return {
+        Codec.JSON: JsonCodec(),
+        Codec.PROTOBUF: ProtobufCodec(source=source),
+    }
@@ -1,278 +1,1122 @@
 # bridge_executor_service.py
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, Future
-from threading import Event, Lock
-from typing import Dict, Optional
-from dataclasses import dataclass
-import json
+from threading import Event, Lock, RLock
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, field
 import uuid
+from collections import Counter
 
 import zenoh
-from google.protobuf.message import DecodeError
 
 import bridge_request_pb2 as bridge_pb
+import service_reply_pb2 as service_reply_pb
 
 from constants import (
     PUBLISH_PERIOD_SEC,
     DWM_DEFAULT_PORT,
+    DWM_STALL_SEC,
+    DWM_STALL_UPDATES,
+    IMU_REPORT_RATE_HZ,
+    IMU_STALL_REPORTS,
+    IMU_STALL_SEC,
+    SENSOR_PROCESS_JOIN_SEC,
 )
-from shared_state import SharedState
-from message_types import MessageType
-from imu_executor_test import imu_worker
-from dwm_executor_test import dwm_worker
+from shared_state import Sample, SharedState
+from shm_state import SharedMemoryState, run_sensor_process
+from message_types import Codec, MessageType, PublishMode, SensorSource, StalePolicy
+from bridge_codecs import SampleBatch, make_codecs, sample_value
+from bridge_pipeline import BridgePipeline, StageKind, StageSpec
+from bridge_scheduler import BridgeScheduler, ScheduledTask
+from bridge_throttle import BridgeThrottle
+from bridge_stats import BridgeStats, process_cpu_sec, thread_cpu_sec
+from frame_meta import FRAME_STALE, FrameMeta
+from sensor_drivers import SensorDriver, driver_for_proto, get_driver, sensor_names
+from sensor_supervisor import SensorHealth, SensorStatus, SensorSupervisor
+from pose_fusion import PoseFusion
+from service_runtime import ServiceRuntime, method_stats_to_proto
 from service_utils import make_service_reply
 
+if TYPE_CHECKING:
+    # Annotations only: the sim and replay modules are imported by the
+    # workers that use them (see SensorDriver.load_worker).
+    from sample_replay import ReplayConfig
+    from sim_sensors import SimConfig
 
-def _proto_to_msg_type(mt: int) -> MessageType:
-    if mt == bridge_pb.IMU:
-        return MessageType.IMU
-    if mt == bridge_pb.DWM:
-        return MessageType.DWM
-    raise ValueError(f"Unknown BridgeMessageType: {mt}")
+
+# Sensor processes are spawned, never forked (see BridgeManager._spawn_sensor)
+_SPAWN = multiprocessing.get_context("spawn")
+
+
+def _stall_sec(rate_hz: float, periods: int, floor_sec: float) -> float:
+    """
+    Stall timeout of a sensor sampling at rate_hz: periods sample periods,
+    at least floor_sec.
+    """
+    return max(floor_sec, periods / rate_hz)
+
+
+def _proto_to_publish_mode(pm: int) -> PublishMode:
+    if pm == bridge_pb.PUBLISH_PERIODIC:
+        return PublishMode.PERIODIC
+    if pm == bridge_pb.PUBLISH_ON_CHANGE:
+        return PublishMode.ON_CHANGE
+    raise ValueError(f"Unknown BridgePublishMode: {pm}")
+
+
+def _proto_to_codec(c: int) -> Codec:
+    if c == bridge_pb.CODEC_JSON:
+        return Codec.JSON
+    if c == bridge_pb.CODEC_PROTOBUF:
+        return Codec.PROTOBUF
+    raise ValueError(f"Unknown BridgeCodec: {c}")
+
+
+# Proto enum -> zenoh.Priority / zenoh.CongestionControl member name
+_PROTO_PRIORITY = {
+    bridge_pb.BRIDGE_PRIORITY_DEFAULT: "DATA",
+    bridge_pb.BRIDGE_PRIORITY_REAL_TIME: "REAL_TIME",
+    bridge_pb.BRIDGE_PRIORITY_INTERACTIVE_HIGH: "INTERACTIVE_HIGH",
+    bridge_pb.BRIDGE_PRIORITY_INTERACTIVE_LOW: "INTERACTIVE_LOW",
+    bridge_pb.BRIDGE_PRIORITY_DATA_HIGH: "DATA_HIGH",
+    bridge_pb.BRIDGE_PRIORITY_DATA: "DATA",
+    bridge_pb.BRIDGE_PRIORITY_DATA_LOW: "DATA_LOW",
+    bridge_pb.BRIDGE_PRIORITY_BACKGROUND: "BACKGROUND",
+}
+
+_PROTO_CONGESTION = {
+    bridge_pb.CONGESTION_DEFAULT: "DROP",
+    bridge_pb.CONGESTION_DROP: "DROP",
+    bridge_pb.CONGESTION_BLOCK: "BLOCK",
+}
+
+
+@dataclass(frozen=True)
+class BridgeQos:
+    """
+    Zenoh QoS applied to a bridge's declared publisher.
+
+    priority and congestion_control are zenoh.Priority / zenoh.CongestionControl
+    member names, which keeps the record hashable and printable.
+    """
+    priority: str = "DATA"
+    express: bool = False
+    congestion_control: str = "DROP"
+
+    def publisher_kwargs(self) -> dict:
+        return {
+            "priority": getattr(zenoh.Priority, self.priority),
+            "express": self.express,
+            "congestion_control": getattr(zenoh.CongestionControl, self.congestion_control),
+        }
+
+
+_PROTO_STAGE_KIND = {
+    bridge_pb.STAGE_EMA: StageKind.EMA,
+    bridge_pb.STAGE_KALMAN_CV: StageKind.KALMAN_CV,
+    bridge_pb.STAGE_MEDIAN: StageKind.MEDIAN,
+    bridge_pb.STAGE_FRAME_TRANSFORM: StageKind.FRAME_TRANSFORM,
+    bridge_pb.STAGE_OUTLIER_GATE: StageKind.OUTLIER_GATE,
+}
+
+
+_PROTO_STALE_POLICY = {
+    bridge_pb.STALE_PUBLISH: StalePolicy.PUBLISH,
+    bridge_pb.STALE_SUPPRESS: StalePolicy.SUPPRESS,
+    bridge_pb.STALE_MARK: StalePolicy.MARK,
+}
+
+_PROTO_SENSOR_HEALTH = {
+    SensorHealth.STARTING: bridge_pb.SENSOR_STARTING,
+    SensorHealth.OK: bridge_pb.SENSOR_OK,
+    SensorHealth.STALE: bridge_pb.SENSOR_STALE,
+    SensorHealth.FAILED: bridge_pb.SENSOR_FAILED,
+    SensorHealth.STOPPED: bridge_pb.SENSOR_STOPPED,
+}
+
+
+def _proto_to_stale_policy(p: int) -> StalePolicy:
+    if p not in _PROTO_STALE_POLICY:
+        raise ValueError(f"Unknown BridgeStalePolicy: {p}")
+    return _PROTO_STALE_POLICY[p]
+
+
+def _proto_to_stage(st) -> StageSpec:
+    if st.type not in _PROTO_STAGE_KIND:
+        raise ValueError(f"Unknown BridgeStageType: {st.type}")
+    return StageSpec(
+        kind=_PROTO_STAGE_KIND[st.type],
+        alpha=st.alpha,
+        process_noise=st.process_noise,
+        measurement_noise=st.measurement_noise,
+        window=st.window,
+        translation=tuple(st.translation) or (0.0, 0.0, 0.0),
+        rotation=tuple(st.rotation) or (0.0, 0.0, 0.0, 1.0),
+        max_jump=st.max_jump,
+        max_rejects=st.max_rejects,
+    )
+
+
+def _proto_to_open_kwargs(req) -> dict:
+    """
+    OpenBridgeRequest -> open_bridge keyword arguments. Raises ValueError
+    for unknown enum values, before anything is opened.
+    """
+    return dict(
+        outbound_topic=req.outbound_topic,
+        message_type=driver_for_proto(req.message_type).name,
+        publish_mode=_proto_to_publish_mode(req.publish_mode),
+        codec=_proto_to_codec(req.codec),
+        qos=_proto_to_qos(req.qos),
+        batch_max_samples=req.batch_max_samples,
+        batch_max_ms=req.batch_max_ms,
+        rate_hz=req.rate_hz,
+        decimation=max(1, req.decimation),
+        deadband_m=req.deadband_m,
+        deadband_rad=req.deadband_rad,
+        stages=[_proto_to_stage(st) for st in req.stages],
+        stale_policy=_proto_to_stale_policy(req.stale_policy),
+    )
+
+
+def _written_by(sensor: str) -> List[str]:
+    """
+    State slots written by sensor's worker: its own and those of derived
+    streams fed only by it (the IMU worker also writes imu_accel/imu_gyro).
+    """
+    return [name for name in sensor_names() if name == sensor or get_driver(name).sources == (sensor,)]
+
+
+def _proto_to_qos(q) -> BridgeQos:
+    if q.priority not in _PROTO_PRIORITY:
+        raise ValueError(f"Unknown BridgePriority: {q.priority}")
+    if q.congestion_control not in _PROTO_CONGESTION:
+        raise ValueError(f"Unknown BridgeCongestionControl: {q.congestion_control}")
+    return BridgeQos(
+        priority=_PROTO_PRIORITY[q.priority],
+        express=q.express,
+        congestion_control=_PROTO_CONGESTION[q.congestion_control],
+    )
 
 
 @dataclass
 class BridgeHandle:
     """
-    Tracks one running bridge publisher task.
+    Tracks one bridge registered with the BridgeScheduler.
+
+    The Zenoh publisher is declared once when the bridge opens and is
+    reused for every put until the bridge closes. frame_seq counts frames
+    put on this bridge and is sent in each frame's FrameMeta attachment.
+    pipeline, if set, filters every sample before throttling and encoding.
+    stale_policy decides what happens while a source sensor is unhealthy.
+    key identifies the bridge's parameters for deduplication and refs
+    counts the open_bridge calls it serves.
     """
     outbound_topic: str
-    message_type: MessageType
-    stop: Event
-    future: Future
+    driver: SensorDriver
+    publish_mode: PublishMode
+    codec: Codec
+    qos: BridgeQos
+    publisher: zenoh.Publisher
+    batch: Optional[SampleBatch] = field(default=None, repr=False)
+    throttle: Optional[BridgeThrottle] = field(default=None, repr=False)
+    pipeline: Optional[BridgePipeline] = field(default=None, repr=False)
+    stale_policy: StalePolicy = StalePolicy.PUBLISH
+    stats: BridgeStats = field(default_factory=BridgeStats, repr=False)
+    task: Optional[ScheduledTask] = field(default=None, repr=False)
+    flush_task: Optional[ScheduledTask] = field(default=None, repr=False)
+    frame_seq: int = field(default=0, repr=False)
+    key: tuple = field(default=(), repr=False)
+    refs: int = 1
 
 
 class BridgeManager:
     """
     Unified bridge manager + bridge management service.
+
+    Sensor workers run on the ThreadPoolExecutor. Bridges do not take a
+    worker each; they are all multiplexed onto one BridgeScheduler thread,
+    so the number of open bridges is not capped by max_workers.
+
+    Management queries (open_bridge, close_bridge, stats) are served by a
+    ServiceRuntime worker pool, never on Zenoh's callback threads.
+
+    With sensor_processes=True the state lives in a SharedMemoryState and
+    each sensor worker runs in its own spawned process, so sensor reads
+    and parsing do not compete with bridges for this process's GIL.
+
+    Either way every sensor worker runs under a SensorSupervisor, which
+    restarts failed or stalled hardware workers and tracks sensor health
+    (see sensor_status()).
     """
 
-    def __init__(self, session: zenoh.Session, resource_name: str, *, max_workers: int = 6):
-        self.state = SharedState(_lock=Lock())
+    def __init__(
+        self,
+        session: zenoh.Session,
+        resource_name: str,
+        *,
+        max_workers: int = 6,
+        sensor_processes: bool = False,
+        runtime: Optional[ServiceRuntime] = None,
+    ):
+        self._sensor_processes_enabled = sensor_processes
+        if sensor_processes:
+            self.state = SharedMemoryState.create()
+        else:
+            self.state = SharedState(_lock=Lock())
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._scheduler = BridgeScheduler()
+        self._codecs = make_codecs()
+        # (type, codec) -> (seq, payload, encode monotonic ns) of the last
+        # encoded sample. Only touched from the scheduler thread, so it needs
+        # no lock.
+        self._encode_cache: Dict[Tuple[str, Codec], Tuple[int, Optional[bytes], int]] = {}
+        self.state.add_listener(self._on_state_update)
 
         self._zenoh = session
         self._resource_name = resource_name
 
-        self._sensor_stop = Event()
+        self._sensor_stop = _SPAWN.Event() if sensor_processes else Event()
         self._sensors_started = False
+        self._started_sensors = set()
+        self._fusion: Optional[PoseFusion] = None
+        self._supervisor = SensorSupervisor(self.state, self._sensor_stop)
+        # sensor name -> (worker thread ident, monotonic start time)
+        self._sensor_threads: Dict[str, Tuple[threading.Thread, float]] = {}
+        # sensor name -> (worker process, monotonic start time)
+        self._sensor_processes: Dict[str, Tuple[multiprocessing.Process, float]] = {}
 
         self._bridges: Dict[str, BridgeHandle] = {}
+        # BridgeHandle.key -> bridge_id, to reuse bridges opened twice
+        self._bridge_ids: Dict[tuple, str] = {}
+        # Makes open's find-or-create and close_bridges' check-then-close atomic.
+        self._bridges_lock = RLock()
 
         self._token = self._zenoh.liveliness().declare_token(resource_name)
-        self._open_q = self._zenoh.declare_queryable(
+        # Queries are served off Zenoh's callback threads; a runtime passed
+        # in is shared with other services and left running on shutdown.
+        self._owns_runtime = runtime is None
+        self._runtime = runtime if runtime is not None else ServiceRuntime(session, name="bridge-mgmt")
+        self._service_keys = (
             resource_name + "/open_bridge",
+            resource_name + "/close_bridge",
+            resource_name + "/open_bridges",
+            resource_name + "/close_bridges",
+            resource_name + "/stats",
+        )
+        open_key, close_key, open_many_key, close_many_key, stats_key = self._service_keys
+        self._runtime.declare(
+            open_key,
             self.handle_open_bridge,
+            request_type=bridge_pb.OpenBridgeRequest,
+            reply_type=bridge_pb.OpenBridgeReply,
         )
-        self._close_q = self._zenoh.declare_queryable(
-            resource_name + "/close_bridge",
+        self._runtime.declare(
+            close_key,
             self.handle_close_bridge,
+            request_type=bridge_pb.CloseBridgeRequest,
+            reply_type=bridge_pb.CloseBridgeReply,
+        )
+        self._runtime.declare(
+            open_many_key,
+            self.handle_open_bridges,
+            request_type=bridge_pb.OpenBridgesRequest,
+            reply_type=bridge_pb.OpenBridgesReply,
+        )
+        self._runtime.declare(close_many_key, self.handle_close_bridges, request_type=bridge_pb.CloseBridgesRequest)
+        self._runtime.declare(
+            stats_key,
+            self.handle_bridge_stats,
+            request_type=bridge_pb.BridgeStatsRequest,
+            failure_message="Failed to collect bridge stats",
         )
 
-    def start_sensors(self, *, enable_imu: bool = True, enable_dwm: bool = True, dwm_port: str = DWM_DEFAULT_PORT) -> None:
+    def start_sensors(
+        self,
+        *,
+        enable_imu: bool = True,
+        enable_dwm: bool = True,
+        dwm_port: str = DWM_DEFAULT_PORT,
+        imu_rate_hz: float = IMU_REPORT_RATE_HZ,
+        sim: Optional["SimConfig"] = None,
+        replay: Optional["ReplayConfig"] = None,
+        fuse_pose: bool = True,
+    ) -> None:
         """
-        Submit sensor tasks to the executor. Sensors write to SharedState.
+        Start the built-in IMU and DWM sensors. Sensors write to SharedState.
+
+        The IMU streams orientation, acceleration and gyro reports at
+        imu_rate_hz. With sim set, simulated sources replace the hardware
+        (no board, serial or driver libraries are imported) and run at the
+        rates in sim instead. With replay set, both sensors are played back
+        from a recorded sample log instead.
+
+        With both sensors enabled and fuse_pose set, a PoseFusion also
+        writes the combined "pose" stream at the IMU rate.
+
+        Stall timeouts follow the configured rates (IMU_STALL_REPORTS IMU
+        periods, DWM_STALL_UPDATES simulated DWM periods, floored at the
+        driver defaults), so a slow but healthy sensor is not restarted.
+        Replayed sensors keep the driver defaults.
         """
         if self._sensors_started:
             return
+        if sim is not None and replay is not None:
+            raise ValueError("sim and replay are mutually exclusive")
+
+        imu_stall_sec = dwm_stall_sec = None
+        if sim is not None:
+            source, imu_args, dwm_args = SensorSource.SIM, (sim,), (sim,)
+            imu_stall_sec = _stall_sec(sim.imu_rate_hz, IMU_STALL_REPORTS, IMU_STALL_SEC)
+            dwm_stall_sec = _stall_sec(sim.dwm_rate_hz, DWM_STALL_UPDATES, DWM_STALL_SEC)
+        elif replay is not None:
+            source, imu_args, dwm_args = SensorSource.REPLAY, (replay,), (replay,)
+        else:
+            if imu_rate_hz <= 0:
+                raise ValueError(f"imu_rate_hz must be positive, got {imu_rate_hz}")
+            source, imu_args, dwm_args = SensorSource.HARDWARE, (imu_rate_hz,), (dwm_port,)
+            imu_stall_sec = _stall_sec(imu_rate_hz, IMU_STALL_REPORTS, IMU_STALL_SEC)
 
         if enable_imu:
-            self._executor.submit(imu_worker, self._sensor_stop, self.state)
+            self.start_sensor(MessageType.IMU, *imu_args, source=source, stall_sec=imu_stall_sec)
 
         if enable_dwm:
-            self._executor.submit(dwm_worker, self._sensor_stop, self.state, dwm_port)
+            self.start_sensor(MessageType.DWM, *dwm_args, source=source, stall_sec=dwm_stall_sec)
+
+        if enable_imu and enable_dwm and fuse_pose:
+            self._fusion = PoseFusion(self.state)
+            self._fusion.start()
 
         self._sensors_started = True
-        print("[BRIDGE_MGR] Sensors started")
+        print(f"[BRIDGE_MGR] Sensors started ({source.value})")
 
-    def open_bridge(self, outbound_topic: str, message_type: MessageType) -> str:
+    def start_sensor(
+        self,
+        name: str,
+        *args,
+        source: SensorSource = SensorSource.HARDWARE,
+        stall_sec: Optional[float] = None,
+    ) -> None:
         """
-        Create a publishing bridge task and return bridge_id.
+        Start the worker of a registered sensor driver as
+        worker(stop, state, *args); source picks the hardware, simulated or
+        replay worker. stall_sec overrides the driver's stall timeout, e.g.
+        for a sensor configured to sample slower than usual.
+
+        The worker's module (and so its hardware libraries) is imported
+        only here. It runs on the executor, or in its own spawned process
+        when sensor_processes is enabled, supervised either way: hardware
+        workers that fail or stall are restarted with backoff; simulated
+        and replay workers only have their health tracked.
         """
-        bridge_id = uuid.uuid4().hex
-        stop = Event()
+        driver = get_driver(name)
+        worker_path = driver.worker_path(source)
+        if driver.name in self._started_sensors:
+            raise ValueError(f"Sensor already started: {driver.name}")
+        self._started_sensors.add(driver.name)
+        restart = SensorSource(source) == SensorSource.HARDWARE
+        if stall_sec is None:
+            stall_sec = driver.stall_sec
+
+        if self._sensor_processes_enabled:
+            self._supervisor.add_process(
+                driver.name,
+                lambda: self._spawn_sensor(driver.name, worker_path, args),
+                stall_sec=stall_sec,
+                restart=restart,
+            )
+            return
+
+        worker = driver.load_worker(source)
+        self._executor.submit(self._run_sensor, driver.name, worker, args, stall_sec, restart)
+
+    def _run_sensor(self, name: str, worker, args: tuple, stall_sec: float, restart: bool) -> None:
+        """
+        Run a sensor worker under the supervisor, remembering its thread
+        for CPU accounting.
+        """
+        self._sensor_threads[name] = (threading.current_thread(), time.monotonic())
+        try:
+            self._supervisor.run_thread(name, worker, args, stall_sec=stall_sec, restart=restart)
+        finally:
+            self._sensor_threads.pop(name, None)
+
+    def _spawn_sensor(self, name: str, worker_path: str, args: tuple) -> multiprocessing.Process:
+        """
+        Spawn a sensor process attached to the shared memory state.
+        Also called by the supervisor to replace a dead or stalled one.
+
+        spawn (not fork) so children do not inherit the Zenoh session's
+        runtime threads.
+        """
+        # A predecessor killed mid-write would leave its slots locked.
+        self.state.recover_writer(_written_by(name))
+        proc = _SPAWN.Process(
+            target=run_sensor_process,
+            args=(self.state.name, worker_path, self._sensor_stop, *args),
+            name=f"sensor-{name}",
+            daemon=True,
+        )
+        proc.start()
+        _, started_at = self._sensor_processes.get(name, (None, time.monotonic()))
+        self._sensor_processes[name] = (proc, started_at)
+        return proc
+
+    def _stop_sensor_processes(self) -> None:
+        for name, (proc, _) in list(self._sensor_processes.items()):
+            proc.join(timeout=SENSOR_PROCESS_JOIN_SEC)
+            if proc.is_alive():
+                print(f"[BRIDGE_MGR] Sensor process {name} did not stop; terminating")
+                proc.terminate()
+                proc.join()
+        self._sensor_processes.clear()
+
+    def open_bridge(
+        self,
+        outbound_topic: str,
+        message_type: Union[MessageType, str],
+        publish_mode: PublishMode = PublishMode.PERIODIC,
+        codec: Codec = Codec.JSON,
+        qos: BridgeQos = BridgeQos(),
+        batch_max_samples: int = 0,
+        batch_max_ms: int = 0,
+        rate_hz: float = 0.0,
+        decimation: int = 1,
+        deadband_m: float = 0.0,
+        deadband_rad: float = 0.0,
+        stages: Sequence[StageSpec] = (),
+        stale_policy: StalePolicy = StalePolicy.PUBLISH,
+    ) -> str:
+        """
+        Register a publishing bridge with the scheduler and return bridge_id.
+
+        message_type names any registered sensor driver (see sensor_drivers).
+
+        PERIODIC bridges re-publish the latest sample every PUBLISH_PERIOD_SEC
+        (or 1 / rate_hz). ON_CHANGE bridges publish the latest sample at
+        most once per scheduler wake-up after their sensor writes; samples
+        written faster than the scheduler wakes are coalesced to the newest
+        unless the bridge batches or has stages, which read every sample
+        from the sensor's history ring. codec selects the payload encoding
+        (JSON or protobuf). qos sets priority, express and congestion
+        control on the bridge's declared publisher.
+
+        If batch_max_samples or batch_max_ms is non-zero, distinct samples
+        are accumulated and published as one multi-sample frame when the
+        batch fills or batch_max_ms elapses.
+
+        rate_hz sets the tick rate of a PERIODIC bridge and caps the publish
+        rate of an ON_CHANGE bridge (0 keeps the default). decimation
+        publishes every Nth sample or tick. deadband_m / deadband_rad
+        suppress DWM / IMU samples that barely moved since the last publish.
 
-        fut = self._executor.submit(
-            self._bridge_publisher_loop,
-            stop,
+        stages is an ordered filter pipeline (see bridge_pipeline) run on
+        every new sample before rate control, batching and encoding; the
+        bridge then publishes filtered values instead of the raw latest one.
+
+        stale_policy applies while any sensor feeding the bridge is not
+        healthy (see SensorSupervisor): SUPPRESS skips publishing, MARK sets
+        FRAME_STALE in each frame's FrameMeta.
+
+        Opening is idempotent: if a bridge with the same topic, type and
+        parameters is already open, its id is returned and its reference
+        count raised instead of starting a duplicate publisher (e.g. for a
+        client retrying after a timeout). close_bridge releases one
+        reference.
+        """
+        driver = get_driver(message_type)
+        key = (
             outbound_topic,
-            message_type,
+            driver.name,
+            PublishMode(publish_mode),
+            Codec(codec),
+            qos,
+            batch_max_samples,
+            batch_max_ms,
+            rate_hz,
+            decimation,
+            deadband_m,
+            deadband_rad,
+            tuple(stages),
+            StalePolicy(stale_policy),
         )
+        with self._bridges_lock:
+            bridge_id = self._bridge_ids.get(key)
+            if bridge_id is not None:
+                handle = self._bridges[bridge_id]
+                handle.refs += 1
+                print(f"[BRIDGE_MGR] Bridge reused id={bridge_id} type={driver.name} topic={outbound_topic} refs={handle.refs}")
+                return bridge_id
+
+            bridge_id = self._open_bridge(
+                key, driver, outbound_topic, publish_mode, codec, qos,
+                batch_max_samples, batch_max_ms, rate_hz, decimation,
+                deadband_m, deadband_rad, stages, stale_policy,
+            )
+            self._bridge_ids[key] = bridge_id
+            return bridge_id
+
+    def _open_bridge(
+        self,
+        key: tuple,
+        driver: SensorDriver,
+        outbound_topic: str,
+        publish_mode: PublishMode,
+        codec: Codec,
+        qos: BridgeQos,
+        batch_max_samples: int,
+        batch_max_ms: int,
+        rate_hz: float,
+        decimation: int,
+        deadband_m: float,
+        deadband_rad: float,
+        stages: Sequence[StageSpec],
+        stale_policy: StalePolicy,
+    ) -> str:
+        """
+        Create and schedule a new bridge: open_bridge without deduplication.
+        """
+        if batch_max_samples < 0 or batch_max_ms < 0:
+            raise ValueError("Batch limits must be non-negative")
+        if rate_hz < 0:
+            raise ValueError(f"rate_hz must be non-negative, got {rate_hz}")
+
+        period_sec = 1.0 / rate_hz if rate_hz > 0 else PUBLISH_PERIOD_SEC
+        # Periodic bridges are already paced by the scheduler.
+        rate_capped = rate_hz > 0 and publish_mode == PublishMode.ON_CHANGE
+        throttle = None
+        if rate_capped or decimation > 1 or deadband_m > 0 or deadband_rad > 0:
+            throttle = BridgeThrottle(
+                min_interval_sec=period_sec if rate_capped else 0.0,
+                decimation=decimation,
+                deadband_m=deadband_m,
+                deadband_rad=deadband_rad,
+                deadband_kind=driver.deadband,
+            )
 
-        self._bridges[bridge_id] = BridgeHandle(
+        pipeline = None
+        if stages:
+            pipeline = BridgePipeline(driver, stages)
+            # Start from the newest sample already written.
+            pipeline.last_seq = max(0, self.state.seq(driver.name) - 1)
+
+        bridge_id = uuid.uuid4().hex
+
+        publisher = self._zenoh.declare_publisher(outbound_topic, **qos.publisher_kwargs())
+        handle = BridgeHandle(
             outbound_topic=outbound_topic,
-            message_type=message_type,
-            stop=stop,
-            future=fut,
+            driver=driver,
+            publish_mode=publish_mode,
+            codec=codec,
+            qos=qos,
+            publisher=publisher,
+            throttle=throttle,
+            pipeline=pipeline,
+            stale_policy=StalePolicy(stale_policy),
+            key=key,
         )
+        if batch_max_samples or batch_max_ms:
+            handle.batch = SampleBatch(batch_max_samples, batch_max_ms / 1000.0)
+            # Batch only samples written after the bridge opened.
+            handle.batch.last_seq = self.state.seq(driver.name)
 
-        print(f"[BRIDGE_MGR] Bridge opened id={bridge_id} type={message_type.value} topic={outbound_topic}")
+        source_sensors = driver.source_sensors
+
+        def publish() -> None:
+            if handle.stale_policy == StalePolicy.SUPPRESS and self._supervisor.is_stale(source_sensors):
+                handle.stats.stale += 1
+                return
+            sample = self.state.latest(driver.name)
+            if handle.pipeline is not None:
+                self._publish_filtered(handle, sample)
+                return
+            if handle.batch is not None:
+                # Throttled per sample inside, as a wake-up may batch several.
+                self._batch_sample(handle, sample)
+                return
+            if handle.throttle is not None and not self._throttle_admits(handle, sample):
+                return
+            self._publish_sample(handle, sample)
+
+        try:
+            if publish_mode == PublishMode.ON_CHANGE:
+                handle.task = self._scheduler.add_on_change(bridge_id, driver.name, publish)
+            else:
+                handle.task = self._scheduler.add_periodic(bridge_id, period_sec, publish)
+            if batch_max_ms:
+                handle.flush_task = self._scheduler.add_periodic(
+                    bridge_id + "/flush",
+                    batch_max_ms / 1000.0,
+                    lambda: self._flush_batch(handle),
+                )
+        except Exception:
+            if handle.task is not None:
+                self._scheduler.remove(bridge_id)
+            publisher.undeclare()
+            raise
+
+        self._bridges[bridge_id] = handle
+
+        stage_names = ",".join(StageKind(spec.kind).value for spec in stages)
+        print(
+            f"[BRIDGE_MGR] Bridge opened id={bridge_id} type={driver.name} "
+            f"mode={publish_mode.value} codec={codec.value} topic={outbound_topic}"
+            + (f" stages={stage_names}" if stages else "")
+            + (f" stale={handle.stale_policy.value}" if handle.stale_policy != StalePolicy.PUBLISH else "")
+        )
         return bridge_id
 
-    def close_bridge(self, bridge_id: str) -> None:
+    def close_bridge(self, bridge_id: str) -> int:
         """
-        Stop a single bridge by signaling its stop Event.
+        Release one reference to a bridge and return the references left.
+        The bridge is removed from the scheduler when none are left.
         Raises ValueError if bridge_id does not exist.
         """
-        handle = self._bridges.get(bridge_id)
-        if not handle:
-            raise ValueError(f"No bridge with id '{bridge_id}'")
+        with self._bridges_lock:
+            handle = self._bridges.get(bridge_id)
+            if not handle:
+                raise ValueError(f"No bridge with id '{bridge_id}'")
+            handle.refs -= 1
+            if handle.refs > 0:
+                print(f"[BRIDGE_MGR] Bridge released id={bridge_id} refs={handle.refs}")
+                return handle.refs
+            self._remove_bridge(bridge_id)
+            return 0
+
+    def _remove_bridge(self, bridge_id: str) -> None:
+        """
+        Stop a bridge regardless of its references.
+        """
+        with self._bridges_lock:
+            handle = self._bridges.pop(bridge_id)
+            del self._bridge_ids[handle.key]
 
         print(f"[BRIDGE_MGR] Closing bridge id={bridge_id} ...")
-        handle.stop.set()
-        del self._bridges[bridge_id]
+        self._scheduler.remove(bridge_id)
+        if handle.flush_task is not None:
+            self._scheduler.remove(handle.flush_task.key)
+        handle.publisher.undeclare()
         print(f"[BRIDGE_MGR] Bridge closed id={bridge_id}")
 
-    def handle_open_bridge(self, query: zenoh.Query) -> None:
+    def open_bridges(self, bridges: Sequence[dict]) -> List[str]:
         """
-        Zenoh query handler for open_bridge.
+        Open several bridges, all or nothing, and return their ids in order.
 
-        Expects:
-            bridge_pb.OpenBridgeRequest
+        Each item holds open_bridge keyword arguments (outbound_topic,
+        message_type, ...). If any bridge fails to open, the ones already
+        opened are released again (see close_bridge) and the error is
+        re-raised. The whole batch, rollback included, runs under the
+        bridge lock, so no other open or close sees it half done.
+        """
+        opened: List[str] = []
+        with self._bridges_lock:
+            try:
+                for kwargs in bridges:
+                    opened.append(self.open_bridge(**kwargs))
+            except Exception:
+                for bridge_id in reversed(opened):
+                    try:
+                        self.close_bridge(bridge_id)
+                    except Exception as e:
+                        print(f"[BRIDGE_MGR] Rollback of bridge {bridge_id} failed: {e}")
+                raise
+        return opened
 
-        Replies with:
-            ServiceReply
+    def close_bridges(self, bridge_ids: Sequence[str]) -> None:
         """
-        try:
-            req = bridge_pb.OpenBridgeRequest()
-            req.ParseFromString(query.payload.to_bytes())
+        Release one reference per listed id (see close_bridge), or none:
+        raises ValueError without releasing anything if any id does not
+        exist or is listed more times than it has references.
+        """
+        with self._bridges_lock:
+            counts = Counter(bridge_ids)
+            unknown = [bid for bid in counts if bid not in self._bridges]
+            if unknown:
+                raise ValueError(f"No bridge with id(s) {', '.join(repr(bid) for bid in unknown)}")
+            over = [bid for bid, n in counts.items() if n > self._bridges[bid].refs]
+            if over:
+                raise ValueError(f"More closes than references for bridge id(s) {', '.join(repr(bid) for bid in over)}")
+            for bridge_id in bridge_ids:
+                self.close_bridge(bridge_id)
 
-            self.open_bridge(
-                req.outbound_topic,
-                _proto_to_msg_type(req.message_type),
-            )
+    def handle_open_bridge(self, req: bridge_pb.OpenBridgeRequest) -> bridge_pb.OpenBridgeReply:
+        """
+        Service handler for open_bridge (run by the ServiceRuntime).
+        """
+        with self._bridges_lock:
+            bridge_id = self.open_bridge(**_proto_to_open_kwargs(req))
+            ref_count = self._bridges[bridge_id].refs
+        rep = bridge_pb.OpenBridgeReply(bridge_id=bridge_id, ref_count=ref_count, reused=ref_count > 1)
+        rep.status.CopyFrom(make_service_reply(
+            is_successful=True,
+            message="Bridge reused" if rep.reused else "Bridge created successfully",
+            error="",
+        ))
+        return rep
 
-            rep = make_service_reply(
-                is_successful=True,
-                message="Bridge created successfully",
-                error="",
-            )
+    def handle_close_bridge(self, req: bridge_pb.CloseBridgeRequest) -> bridge_pb.CloseBridgeReply:
+        """
+        Service handler for close_bridge (run by the ServiceRuntime).
+        """
+        ref_count = self.close_bridge(req.bridge_id)
+        rep = bridge_pb.CloseBridgeReply(ref_count=ref_count, closed=ref_count == 0)
+        rep.status.CopyFrom(make_service_reply(
+            is_successful=True,
+            message=(
+                f"Bridge '{req.bridge_id}' closed successfully"
+                if rep.closed
+                else f"Bridge '{req.bridge_id}' released; {ref_count} reference(s) left"
+            ),
+            error="",
+        ))
+        return rep
 
-            query.reply(
-                self._open_q.key_expr,
-                payload=zenoh.ZBytes(rep.SerializeToString()),
-            )
+    def sensor_status(self) -> Dict[str, SensorStatus]:
+        """
+        Supervisor status (health, restarts, last_error) of every started
+        sensor worker, keyed by sensor name.
+        """
+        return self._supervisor.statuses()
 
-        except DecodeError:
-            rep = make_service_reply(
-                is_successful=False,
-                message="Unable to parse open_bridge request",
-                error="DecodeError",
-            )
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
+    def bridge_jitter(self) -> Dict[str, dict]:
+        """
+        Per-bridge dispatch jitter statistics keyed by bridge_id.
+        """
+        return {bid: h.task.jitter.as_dict() for bid, h in list(self._bridges.items())}
 
-        except Exception as e:
-            rep = make_service_reply(
-                is_successful=False,
-                message="Failed to open bridge",
-                error=str(e),
-            )
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
+    def collect_stats(self, bridge_id: str = "") -> bridge_pb.BridgeStatsReply:
+        """
+        Build a BridgeStatsReply for one bridge (or all if bridge_id is empty).
 
-    def handle_close_bridge(self, query: zenoh.Query) -> None:
+        Reads counters maintained on the hot path; nothing is computed there
+        beyond increments and histogram bucket updates.
+        Raises ValueError if bridge_id does not exist.
         """
-        Zenoh query handler for close_bridge.
+        if bridge_id:
+            handle = self._bridges.get(bridge_id)
+            if not handle:
+                raise ValueError(f"No bridge with id '{bridge_id}'")
+            selected = {bridge_id: handle}
+        else:
+            selected = dict(self._bridges)
+
+        rep = bridge_pb.BridgeStatsReply()
+        for bid, handle in selected.items():
+            stats = handle.stats
+            msg = rep.bridges.add()
+            msg.bridge_id = bid
+            msg.outbound_topic = handle.outbound_topic
+            msg.message_type = handle.driver.proto_type
+            msg.uptime_sec = stats.uptime_sec
+            msg.publishes = stats.publishes
+            msg.publish_rate_hz = stats.publish_rate_hz
+            msg.suppressed = handle.throttle.suppressed if handle.throttle is not None else 0
+            msg.rejected = handle.pipeline.rejected if handle.pipeline is not None else 0
+            msg.stale = stats.stale
+            msg.empty = stats.empty
+            msg.publish_errors = stats.publish_errors
+            msg.encode_cache_hits = stats.encode_cache_hits
+            msg.bytes_out = stats.bytes_out
+            stats.encode.to_proto(msg.encode_us)
+            stats.put.to_proto(msg.put_us)
+            stats.pipeline.to_proto(msg.pipeline_us)
+            if handle.task is not None:
+                msg.missed_ticks = handle.task.jitter.missed_ticks
+                handle.task.lateness.to_proto(msg.lateness_us)
+                msg.cpu_sec = handle.task.cpu_ns / 1e9
+            if handle.flush_task is not None:
+                msg.cpu_sec += handle.flush_task.cpu_ns / 1e9
+
+        now = time.monotonic()
+        sensors = [
+            (name, started_at, thread_cpu_sec(thread))
+            for name, (thread, started_at) in list(self._sensor_threads.items())
+            if thread.is_alive()
+        ]
+        sensors += [(name, started_at, process_cpu_sec(proc.pid)) for name, (proc, started_at) in list(self._sensor_processes.items())]
+        for name, started_at, cpu_sec in sensors:
+            latest = self.state.latest(name)
+            msg = rep.sensors.add()
+            msg.name = name
+            msg.updates = latest.seq
+            elapsed = now - started_at
+            msg.update_rate_hz = msg.updates / elapsed if elapsed > 0 else 0.0
+            msg.last_update_ts = latest.ts
+            msg.cpu_sec = cpu_sec
+            status = self._supervisor.status(name)
+            if status is not None:
+                msg.health = _PROTO_SENSOR_HEALTH[status.health]
+                msg.restarts = status.restarts
+                msg.last_error = status.last_error
 
-        Expects:
-            bridge_pb.CloseBridgeRequest
+        rep.scheduler_cpu_sec = self._scheduler.thread_cpu_sec()
+        method_stats_to_proto(self._runtime, rep.services)
+        return rep
 
-        Replies with:
-            ServiceReply
+    def handle_open_bridges(self, req: bridge_pb.OpenBridgesRequest) -> bridge_pb.OpenBridgesReply:
         """
-        try:
-            req = bridge_pb.CloseBridgeRequest()
-            req.ParseFromString(query.payload.to_bytes())
+        Service handler for open_bridges (run by the ServiceRuntime).
 
-            self.close_bridge(req.bridge_id)
+        Every request is validated before any bridge is opened.
+        """
+        bridge_ids = self.open_bridges([_proto_to_open_kwargs(r) for r in req.bridges])
+        rep = bridge_pb.OpenBridgesReply()
+        rep.bridge_ids.extend(bridge_ids)
+        rep.status.CopyFrom(make_service_reply(
+            is_successful=True,
+            message=f"{len(bridge_ids)} bridge(s) created successfully",
+            error="",
+        ))
+        return rep
 
-            rep = make_service_reply(
-                is_successful=True,
-                message=f"Bridge '{req.bridge_id}' closed successfully",
-                error="",
-            )
+    def handle_close_bridges(self, req: bridge_pb.CloseBridgesRequest) -> service_reply_pb.ServiceReply:
+        """
+        Service handler for close_bridges (run by the ServiceRuntime).
+        """
+        self.close_bridges(req.bridge_ids)
+        return make_service_reply(
+            is_successful=True,
+            message=f"{len(req.bridge_ids)} bridge reference(s) released",
+            error="",
+        )
 
-            query.reply(
-                self._close_q.key_expr,
-                payload=zenoh.ZBytes(rep.SerializeToString()),
-            )
+    def handle_bridge_stats(self, req: bridge_pb.BridgeStatsRequest) -> bridge_pb.BridgeStatsReply:
+        """
+        Service handler for stats (run by the ServiceRuntime). An empty
+        request returns every bridge.
+        """
+        rep = self.collect_stats(req.bridge_id)
+        rep.status.CopyFrom(make_service_reply(
+            is_successful=True,
+            message=f"Stats for {len(rep.bridges)} bridge(s)",
+            error="",
+        ))
+        return rep
 
-        except DecodeError:
-            rep = make_service_reply(
-                is_successful=False,
-                message="Unable to parse close_bridge request",
-                error="DecodeError",
-            )
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
+    def _on_state_update(self, sensor: str, seq: int) -> None:
+        """
+        SharedState listener: wake on-change bridges for this sensor.
+        """
+        self._scheduler.notify(sensor)
 
+    def _publish_sample(self, handle: BridgeHandle, sample: Sample) -> None:
+        """
+        Encode one sample and put it on the bridge's declared publisher.
+        """
+        stats = handle.stats
+        start = time.perf_counter_ns()
+        # Filtered samples are private to their bridge; only raw samples share the encode cache.
+        payload, encode_ns = self._encode_payload(
+            handle.driver, handle.codec, sample, stats, cache=handle.pipeline is None
+        )
+        stats.encode.record(time.perf_counter_ns() - start)
+        if payload is None:
+            stats.empty += 1
+            return
+        self._put(handle, payload, sample.seq, sample.read_ns, encode_ns)
+
+    def _put(self, handle: BridgeHandle, payload: bytes, sample_seq: int, read_ns: int, encode_ns: int) -> None:
+        """
+        Put payload on the bridge's publisher with a FrameMeta attachment
+        and account for it.
+        """
+        stats = handle.stats
+        handle.frame_seq += 1
+        start = time.perf_counter_ns()
+        flags = 0
+        if handle.stale_policy == StalePolicy.MARK and self._supervisor.is_stale(handle.driver.source_sensors):
+            flags = FRAME_STALE
+            stats.stale += 1
+        meta = FrameMeta(handle.frame_seq, sample_seq, read_ns, encode_ns, time.monotonic_ns(), time.time(), flags)
+        try:
+            handle.publisher.put(payload, attachment=meta.pack())
         except Exception as e:
-            rep = make_service_reply(
-                is_successful=False,
-                message="Failed to close bridge",
-                error=str(e),
-            )
-            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
+            stats.publish_errors += 1
+            print(f"[BRIDGE] publish error topic={handle.outbound_topic}: {e}")
+            return
+        stats.put.record(time.perf_counter_ns() - start)
+        stats.publishes += 1
+        stats.bytes_out += len(payload)
+
+    def _throttle_admits(self, handle: BridgeHandle, sample: Sample, now: Optional[float] = None) -> bool:
+        """
+        Apply the bridge's rate cap, decimation and deadband to a sample.
+
+        now defaults to the current monotonic time; batched bridges pass
+        each sample's ts instead, so samples drained together in one
+        wake-up are rate-capped by when they were written.
+        """
+        throttle = handle.throttle
+        value = None
+        if throttle.needs_value:
+            value = sample_value(handle.driver, sample)
+            if value is None:
+                return False
+        return throttle.admit(value, time.monotonic() if now is None else now)
+
+    def _filter_new_samples(self, handle: BridgeHandle, sample: Sample) -> List[Sample]:
+        """
+        Feed every sample written since the last call, up to and including
+        sample, through the bridge's pipeline; return the outputs.
 
-    def _bridge_publisher_loop(self, stop: Event, outbound_topic: str, message_type: MessageType) -> None:
+        Uses the sensor's history ring when there is one, so stage state
+        sees every sample even when scheduler wakeups coalesce; otherwise
+        only the latest sample is filtered.
         """
-        Worker for one bridge: periodically publish from SharedState to Zenoh.
+        pipeline = handle.pipeline
+        if sample.seq == pipeline.last_seq or sample.value is None:
+            return []
+        driver = handle.driver
+        start = time.perf_counter_ns()
+        outputs = []
+        ring = self.state.history(driver.name)
+        if ring is not None:
+            window = ring.after_seq(pipeline.last_seq)
+            for ts, seq, row in zip(window.ts.tolist(), window.seq.tolist(), window.values.tolist()):
+                if seq > sample.seq:
+                    break
+                out = pipeline.process(ts, seq, sample.read_ns if seq == sample.seq else 0, row)
+                if out is not None:
+                    outputs.append(out)
+        else:
+            row = sample_value(driver, sample)
+            out = pipeline.process(sample.ts, sample.seq, sample.read_ns, row) if row is not None else None
+            if out is not None:
+                outputs.append(out)
+        pipeline.last_seq = sample.seq
+        handle.stats.pipeline.record(time.perf_counter_ns() - start)
+        return outputs
+
+    def _publish_filtered(self, handle: BridgeHandle, sample: Sample) -> None:
         """
-        print(f"[BRIDGE] Start type={message_type.value} topic={outbound_topic} period={PUBLISH_PERIOD_SEC}s")
+        Publish path of a bridge with a pipeline.
 
-        while not stop.is_set():
-            snap = self.state.snapshot()
-            payload = self._encode_payload(message_type, snap)
-            if payload is not None:
-                try:
-                    self._zenoh.put(outbound_topic, payload)
-                except Exception as e:
-                    print(f"[BRIDGE] publish error topic={outbound_topic}: {e}")
-            time.sleep(PUBLISH_PERIOD_SEC)
+        Batched bridges batch every filtered sample that passes the
+        throttle. Otherwise the newest filtered sample is published; a
+        periodic bridge with no new sample re-publishes the last output.
+        """
+        outputs = self._filter_new_samples(handle, sample)
+        batch = handle.batch
+        if batch is not None:
+            for out in outputs:
+                if handle.throttle is not None and not self._throttle_admits(handle, out, out.ts):
+                    continue
+                if out.read_ns:
+                    batch.read_ns = out.read_ns
+                if batch.add(out.ts, out.seq, sample_value(handle.driver, out)):
+                    self._flush_batch(handle)
+            return
 
-        print(f"[BRIDGE] Stop type={message_type.value} topic={outbound_topic}")
+        if outputs:
+            out = outputs[-1]
+        elif handle.publish_mode == PublishMode.PERIODIC:
+            out = handle.pipeline.last_output
+        else:
+            return
+        if out is None:
+            handle.stats.empty += 1
+            return
+        if handle.throttle is not None and not self._throttle_admits(handle, out):
+            return
+        self._publish_sample(handle, out)
 
-    def _encode_payload(self, message_type: MessageType, snap: dict) -> Optional[bytes]:
+    def _batch_sample(self, handle: BridgeHandle, sample: Sample) -> None:
         """
-        Encode SharedState snapshot -> bytes. Currently JSON.
+        Add a sample to the bridge's batch; publish when full.
+
+        Re-reads of an already batched sample (same seq) are ignored. When
+        the sensor keeps a history ring, every sample written since the
+        last batched one is considered, so bursts faster than the scheduler
+        wakes up are not coalesced away. Each sample goes through the
+        bridge's throttle (rate cap, decimation, deadband) before it is
+        added; a sample the throttle rejects is skipped for good.
         """
-        if message_type == MessageType.IMU:
-            quat = snap["imu_quat"]
-            if quat is None:
-                return None
-            data = {
-                "type": "imu",
-                "ts": snap["imu_ts"],
-                "quat": {"i": quat[0], "j": quat[1], "k": quat[2], "w": quat[3]},
-            }
-            return json.dumps(data).encode()
+        batch = handle.batch
+        if sample.seq == batch.last_seq:
+            return
+        batch.read_ns = sample.read_ns
+        throttle = handle.throttle
 
-        if message_type == MessageType.DWM:
-            pos = snap["dwm_pos"]
-            if pos is None:
-                return None
+        ring = self.state.history(handle.driver.name)
+        if ring is not None:
+            window = ring.after_seq(batch.last_seq)
+            for ts, seq, row in zip(window.ts.tolist(), window.seq.tolist(), window.values.tolist()):
+                value = tuple(row)
+                if throttle is not None and not throttle.admit(value if throttle.needs_value else None, ts):
+                    batch.last_seq = seq
+                    continue
+                if batch.add(ts, seq, value):
+                    self._flush_batch(handle)
+            return
 
-            data = {"type": "dwm", "ts": snap["dwm_ts"]}
-            found = False
-            for name in ("x_m", "y_m", "z_m", "x", "y", "z"):
-                if hasattr(pos, name):
-                    data[name] = float(getattr(pos, name))
-                    found = True
-            if not found:
-                data["raw"] = str(pos)
+        value = sample_value(handle.driver, sample)
+        if value is None:
+            return
+        if throttle is not None and not throttle.admit(value if throttle.needs_value else None, sample.ts):
+            batch.last_seq = sample.seq
+            return
+        if batch.add(sample.ts, sample.seq, value):
+            self._flush_batch(handle)
 
-            return json.dumps(data).encode()
+    def _flush_batch(self, handle: BridgeHandle) -> None:
+        """
+        Publish everything accumulated in the bridge's batch as one frame.
+        """
+        batch = handle.batch
+        if not batch:
+            return
+        start = time.perf_counter_ns()
+        payload = self._codecs[handle.codec].encode_batch(handle.driver, batch)
+        handle.stats.encode.record(time.perf_counter_ns() - start)
+        sample_seq = batch.seq[-1]
+        batch.clear()
+        if payload is None:
+            return
+        self._put(handle, payload, sample_seq, batch.read_ns, time.monotonic_ns())
+
+    def _encode_payload(
+        self,
+        driver: SensorDriver,
+        codec: Codec,
+        sample: Sample,
+        stats: Optional[BridgeStats] = None,
+        cache: bool = True,
+    ) -> Tuple[Optional[bytes], int]:
+        """
+        Encode a SharedState sample -> bytes with the bridge's codec.
+
+        Returns (payload, monotonic ns it was encoded at). Each distinct
+        sample is encoded once per codec; every bridge of the same type and
+        codec shares the cached bytes object and encode time. cache=False
+        encodes without touching the shared cache.
+        """
+        if not cache:
+            return self._codecs[codec].encode(driver, sample), time.monotonic_ns()
 
-        return None
+        seq = sample.seq
+        key = (driver.name, codec)
+        cached = self._encode_cache.get(key)
+        if cached is not None and cached[0] == seq:
+            if stats is not None:
+                stats.encode_cache_hits += 1
+            return cached[1], cached[2]
+
+        payload = self._codecs[codec].encode(driver, sample)
+        encode_ns = time.monotonic_ns()
+        self._encode_cache[key] = (seq, payload, encode_ns)
+        return payload, encode_ns
 
     def stop(self) -> None:
         """
         Undeclare the bridge management queryables.
         """
-        self._open_q.undeclare()
-        self._close_q.undeclare()
+        self._runtime.undeclare(*self._service_keys)
 
     def shutdown(self) -> None:
         """
-        Stop all bridges + sensors, queryables, and shut down executor.
+        Stop all bridges + sensors, queryables, scheduler, and shut down executor.
         """
         print("[BRIDGE_MGR] Shutting down...")
 
@@ -281,11 +1125,22 @@ class BridgeManager:
 
         for bridge_id in list(self._bridges.keys()):
             try:
-                self.close_bridge(bridge_id)
+                self._remove_bridge(bridge_id)
             except Exception as e:
                 print(f"[BRIDGE_MGR] Error closing bridge {bridge_id}: {e}")
 
+        if self._fusion is not None:
+            self._fusion.stop()
+            self._fusion = None
+        self.state.remove_listener(self._on_state_update)
+        self._scheduler.stop()
+        if self._owns_runtime:
+            self._runtime.shutdown()
         self._executor.shutdown(wait=True)
+        self._supervisor.join()
+        if self._sensor_processes_enabled:
+            self._stop_sensor_processes()
+            self.state.close()
         print("[BRIDGE_MGR] Shutdown complete")
     
 
@@ -0,0 +1,117 @@
+import json
+from typing import Optional
+
+import zenoh
+
+import bridge_request_pb2 as bridge_pb
+from constants import SENSOR_HISTORY_LEN, TASK_BRIDGE_BATCH_MS, TASK_BRIDGE_MGMT, TASK_BRIDGE_TIMEOUT_SEC
+from ring_buffer import SampleRing
+from sensor_drivers import get_driver
+
+
+class BridgeHistory:
+    """
+    SampleRing history of one sensor, fed by a bridge of a running
+    BridgeManager instead of by local sensor workers.
+
+    open() asks the manager at mgmt_key for an ON_CHANGE JSON bridge that
+    batches every sample for batch_ms, subscribes to it and appends each
+    received sample to a local ring, so consumers read it with since() /
+    last() / after_seq() exactly like SharedState.history(). The bridge is
+    opened through the idempotent open_bridge service, so several task
+    loops on the same topic share one publisher; close() releases this
+    loop's reference. Nothing here touches sensor hardware or declares
+    service keys.
+    """
+
+    def __init__(
+        self,
+        session: zenoh.Session,
+        sensor: str,
+        *,
+        mgmt_key: str = TASK_BRIDGE_MGMT,
+        topic: Optional[str] = None,
+        capacity: int = SENSOR_HISTORY_LEN,
+        batch_ms: int = TASK_BRIDGE_BATCH_MS,
+    ):
+        self.driver = get_driver(sensor)
+        self.topic = topic or f"history/{self.driver.name}"
+        self.mgmt_key = mgmt_key
+        self.batch_ms = batch_ms
+        self._session = session
+        self._ring = SampleRing(capacity, self.driver.width)
+        self._last_seq = 0
+        self._subscriber: Optional[zenoh.Subscriber] = None
+        self._bridge_id: Optional[str] = None
+
+    def history(self) -> SampleRing:
+        return self._ring
+
+    def open(self) -> None:
+        """
+        Subscribe, then open the bridge. Raises RuntimeError if the
+        manager does not answer or refuses the bridge.
+        """
+        if self._bridge_id is not None:
+            return
+        self._subscriber = self._session.declare_subscriber(self.topic, self._on_frame)
+        req = bridge_pb.OpenBridgeRequest(
+            outbound_topic=self.topic,
+            message_type=self.driver.proto_type,
+            publish_mode=bridge_pb.PUBLISH_ON_CHANGE,
+            codec=bridge_pb.CODEC_JSON,
+            batch_max_ms=self.batch_ms,
+        )
+        try:
+            rep = self._query("open_bridge", req, bridge_pb.OpenBridgeReply())
+        except Exception:
+            self._subscriber.undeclare()
+            self._subscriber = None
+            raise
+        self._bridge_id = rep.bridge_id
+        print(f"[HISTORY] {self.driver.name} from {self.topic} (bridge {rep.bridge_id}, refs={rep.ref_count})")
+
+    def close(self) -> None:
+        if self._subscriber is not None:
+            self._subscriber.undeclare()
+            self._subscriber = None
+        if self._bridge_id is not None:
+            req = bridge_pb.CloseBridgeRequest(bridge_id=self._bridge_id)
+            self._bridge_id = None
+            try:
+                self._query("close_bridge", req, bridge_pb.CloseBridgeReply())
+            except RuntimeError as e:
+                print(f"[HISTORY] Close of {self.topic} failed: {e}")
+
+    def _query(self, method: str, req, rep):
+        key = f"{self.mgmt_key}/{method}"
+        replies = self._session.get(key, payload=req.SerializeToString(), timeout=TASK_BRIDGE_TIMEOUT_SEC)
+        for reply in replies:
+            result = reply.ok if reply.ok is not None else reply.err
+            rep.ParseFromString(result.payload.to_bytes())
+            if not rep.status.is_successful:
+                raise RuntimeError(f"{key}: {rep.status.message} {rep.status.error}".strip())
+            return rep
+        raise RuntimeError(f"No reply from {key}; is the bridge manager running?")
+
+    def _on_frame(self, sample: zenoh.Sample) -> None:
+        """
+        Subscriber callback (the ring's single writer): append the samples
+        of one JSON batch frame, skipping any already held.
+        """
+        try:
+            data = json.loads(sample.payload.to_bytes())
+        except ValueError:
+            return
+        driver = self.driver
+        cols = data.get(driver.json_group, {}) if driver.json_group else data
+        try:
+            rows = zip(data["ts"], data["seq"], *(cols[c] for c in driver.columns))
+        except (KeyError, TypeError):
+            print(f"[HISTORY] Unexpected frame on {self.topic}")
+            return
+        for ts, seq, *row in rows:
+            if seq <= self._last_seq:
+                continue
+            self._ring.append(ts, seq, row)
+            self._last_seq = seq
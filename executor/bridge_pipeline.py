@@ -0,0 +1,356 @@
+import math
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from sensor_drivers import SensorDriver
+from shared_state import Sample
+
+
+class StageKind(str, Enum):
+    """
+    Built-in bridge pipeline stages.
+    """
+    EMA = "ema"
+    KALMAN_CV = "kalman_cv"
+    MEDIAN = "median"
+    FRAME_TRANSFORM = "frame_transform"
+    OUTLIER_GATE = "outlier_gate"
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """
+    Configuration of one pipeline stage; only the fields of kind are used.
+
+    - alpha: EMA weight of the new sample, (0, 1]
+    - process_noise / measurement_noise: Kalman acceleration noise density
+      and measurement variance
+    - window: median window length in samples
+    - translation / rotation: frame transform offset (metres) and rotation
+      quaternion (i, j, k, w)
+    - max_jump: outlier gate threshold, metres for position/vector columns
+      or radians for orientation-only streams
+    - max_rejects: gate accepts a sample anyway after this many consecutive
+      rejects, so a real step change is followed (0 = never)
+    """
+    kind: StageKind
+    alpha: float = 0.0
+    process_noise: float = 0.0
+    measurement_noise: float = 0.0
+    window: int = 0
+    translation: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    rotation: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0)
+    max_jump: float = 0.0
+    max_rejects: int = 0
+
+
+def _span(columns: Tuple[str, ...], names: Tuple[str, ...]) -> Optional[slice]:
+    """
+    Slice of columns holding names consecutively, or None if absent.
+    """
+    if names[0] not in columns:
+        return None
+    start = columns.index(names[0])
+    if columns[start:start + len(names)] != names:
+        raise ValueError(f"Columns {names} must be consecutive in {columns}")
+    return slice(start, start + len(names))
+
+
+class ColumnRoles:
+    """
+    Which driver columns are a position, a free vector or a quaternion.
+    """
+    __slots__ = ("position", "vector", "quat")
+
+    def __init__(self, columns: Tuple[str, ...]):
+        self.position = _span(columns, ("x_m", "y_m", "z_m"))
+        self.vector = _span(columns, ("x", "y", "z"))
+        self.quat = _span(columns, ("i", "j", "k", "w"))
+
+
+# Every stage works in place on the pipeline's preallocated row buffer x:
+# apply(x, t) updates x and returns False to drop the sample. All state
+# and scratch arrays are allocated in __init__, and per-sample arithmetic
+# uses in-place ufuncs, so running a stage allocates no arrays.
+
+
+class EmaStage:
+    __slots__ = ("alpha", "_state", "_tmp", "_primed")
+
+    def __init__(self, width: int, alpha: float):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"EMA alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self._state = np.zeros(width)
+        self._tmp = np.zeros(width)
+        self._primed = False
+
+    def apply(self, x: np.ndarray, t: float) -> bool:
+        if self._primed:
+            np.subtract(x, self._state, out=self._tmp)
+            self._tmp *= self.alpha
+            self._state += self._tmp
+        else:
+            self._state[:] = x
+            self._primed = True
+        x[:] = self._state
+        return True
+
+
+class KalmanCvStage:
+    """
+    Independent constant-velocity Kalman filter per column, vectorized.
+
+    State per column is (position, velocity) with covariance
+    [[p00, p01], [p01, p11]]; process noise is white acceleration of
+    density process_noise, measurements have variance measurement_noise.
+    """
+    __slots__ = ("q", "r", "_pos", "_vel", "_p00", "_p01", "_p11", "_s", "_k0", "_k1", "_y", "_tmp", "_last_t")
+
+    def __init__(self, width: int, process_noise: float, measurement_noise: float):
+        if process_noise <= 0 or measurement_noise <= 0:
+            raise ValueError("Kalman process_noise and measurement_noise must be positive")
+        self.q = process_noise
+        self.r = measurement_noise
+        self._pos, self._vel = np.zeros(width), np.zeros(width)
+        self._p00, self._p01, self._p11 = np.zeros(width), np.zeros(width), np.zeros(width)
+        self._s, self._k0, self._k1 = np.zeros(width), np.zeros(width), np.zeros(width)
+        self._y, self._tmp = np.zeros(width), np.zeros(width)
+        self._last_t: Optional[float] = None
+
+    def apply(self, x: np.ndarray, t: float) -> bool:
+        if self._last_t is None:
+            self._pos[:] = x
+            self._vel[:] = 0.0
+            self._p00[:] = self.r
+            self._p01[:] = 0.0
+            self._p11[:] = 1.0
+            self._last_t = t
+            return True
+
+        dt = max(0.0, t - self._last_t)
+        self._last_t = t
+        tmp = self._tmp
+
+        # Predict
+        np.multiply(self._vel, dt, out=tmp)
+        self._pos += tmp
+        dt2 = dt * dt
+        np.multiply(self._p01, 2.0 * dt, out=tmp)
+        self._p00 += tmp
+        np.multiply(self._p11, dt2, out=tmp)
+        self._p00 += tmp
+        self._p00 += self.q * dt2 * dt2 / 4.0
+        np.multiply(self._p11, dt, out=tmp)
+        self._p01 += tmp
+        self._p01 += self.q * dt2 * dt / 2.0
+        self._p11 += self.q * dt2
+
+        # Update
+        np.add(self._p00, self.r, out=self._s)
+        np.divide(self._p00, self._s, out=self._k0)
+        np.divide(self._p01, self._s, out=self._k1)
+        np.subtract(x, self._pos, out=self._y)
+        np.multiply(self._k0, self._y, out=tmp)
+        self._pos += tmp
+        np.multiply(self._k1, self._y, out=tmp)
+        self._vel += tmp
+        np.multiply(self._k1, self._p01, out=tmp)
+        self._p11 -= tmp
+        np.multiply(self._k0, self._p01, out=tmp)
+        self._p01 -= tmp
+        np.multiply(self._k0, self._p00, out=tmp)
+        self._p00 -= tmp
+
+        x[:] = self._pos
+        return True
+
+
+class MedianStage:
+    """
+    Per-column median of the last window samples.
+
+    The window is copied into a preallocated scratch array and partitioned
+    there in place (np.median would allocate its own copy per sample).
+    """
+    __slots__ = ("window", "_buf", "_scratch", "_count")
+
+    def __init__(self, width: int, window: int):
+        if window < 1:
+            raise ValueError(f"Median window must be >= 1, got {window}")
+        self.window = window
+        self._buf = np.zeros((window, width))
+        self._scratch = np.zeros((window, width))
+        self._count = 0
+
+    def apply(self, x: np.ndarray, t: float) -> bool:
+        self._buf[self._count % self.window] = x
+        self._count += 1
+        n = min(self._count, self.window)
+        held = self._scratch[:n]
+        np.copyto(held, self._buf[:n])
+        mid = n // 2
+        if n % 2:
+            held.partition(mid, axis=0)
+            x[:] = held[mid]
+        else:
+            held.partition((mid - 1, mid), axis=0)
+            np.add(held[mid - 1], held[mid], out=x)
+            x *= 0.5
+        return True
+
+
+class FrameTransformStage:
+    """
+    Express samples in another frame: positions are rotated and
+    translated, free vectors (acceleration, rate) only rotated, and
+    orientations pre-multiplied by the frame rotation.
+    """
+    __slots__ = ("_roles", "_rot", "_quat_left", "_translation", "_tmp3", "_tmp4")
+
+    def __init__(self, roles: ColumnRoles, translation: Sequence[float], rotation: Sequence[float]):
+        if roles.position is None and roles.vector is None and roles.quat is None:
+            raise ValueError("Frame transform needs position, vector or quaternion columns")
+        if len(translation) != 3 or len(rotation) != 4:
+            raise ValueError("Frame transform needs a 3-element translation and a 4-element rotation")
+        norm = math.sqrt(sum(c * c for c in rotation))
+        if norm == 0:
+            raise ValueError("Frame transform rotation must be a non-zero quaternion")
+        i, j, k, w = (c / norm for c in rotation)
+
+        self._roles = roles
+        self._rot = np.array([
+            [1 - 2 * (j * j + k * k), 2 * (i * j - k * w), 2 * (i * k + j * w)],
+            [2 * (i * j + k * w), 1 - 2 * (i * i + k * k), 2 * (j * k - i * w)],
+            [2 * (i * k - j * w), 2 * (j * k + i * w), 1 - 2 * (i * i + j * j)],
+        ])
+        # q' = r * q as a matrix acting on (i, j, k, w)
+        self._quat_left = np.array([
+            [w, -k, j, i],
+            [k, w, -i, j],
+            [-j, i, w, k],
+            [-i, -j, -k, w],
+        ])
+        self._translation = np.array(translation, dtype=np.float64)
+        self._tmp3 = np.zeros(3)
+        self._tmp4 = np.zeros(4)
+
+    def apply(self, x: np.ndarray, t: float) -> bool:
+        roles = self._roles
+        if roles.position is not None:
+            np.dot(self._rot, x[roles.position], out=self._tmp3)
+            self._tmp3 += self._translation
+            x[roles.position] = self._tmp3
+        if roles.vector is not None:
+            np.dot(self._rot, x[roles.vector], out=self._tmp3)
+            x[roles.vector] = self._tmp3
+        if roles.quat is not None:
+            np.dot(self._quat_left, x[roles.quat], out=self._tmp4)
+            x[roles.quat] = self._tmp4
+        return True
+
+
+class OutlierGateStage:
+    """
+    Drop samples further than max_jump from the last accepted sample.
+
+    Distance is Euclidean over the position (or vector) columns, or the
+    rotation angle for streams that only carry an orientation.
+    """
+    __slots__ = ("max_jump", "max_rejects", "_span", "_is_rotation", "_last", "_tmp", "_primed", "_rejects")
+
+    def __init__(self, width: int, roles: ColumnRoles, max_jump: float, max_rejects: int):
+        if max_jump <= 0:
+            raise ValueError(f"Outlier gate max_jump must be positive, got {max_jump}")
+        span = roles.position or roles.vector
+        self._is_rotation = span is None and roles.quat is not None
+        self._span = span or roles.quat or slice(0, width)
+        self.max_jump = max_jump
+        self.max_rejects = max_rejects
+        self._last = np.zeros(width)
+        self._tmp = np.zeros(self._span.stop - self._span.start)
+        self._primed = False
+        self._rejects = 0
+
+    def apply(self, x: np.ndarray, t: float) -> bool:
+        if self._primed:
+            if self._is_rotation:
+                dot = min(1.0, abs(float(np.dot(x[self._span], self._last[self._span]))))
+                jump = 2.0 * math.acos(dot)
+            else:
+                np.subtract(x[self._span], self._last[self._span], out=self._tmp)
+                jump = math.sqrt(float(np.dot(self._tmp, self._tmp)))
+            if jump > self.max_jump:
+                self._rejects += 1
+                if not self.max_rejects or self._rejects <= self.max_rejects:
+                    return False
+        self._last[:] = x
+        self._primed = True
+        self._rejects = 0
+        return True
+
+
+def build_stage(spec: StageSpec, width: int, roles: ColumnRoles):
+    kind = StageKind(spec.kind)
+    if kind == StageKind.EMA:
+        return EmaStage(width, spec.alpha)
+    if kind == StageKind.KALMAN_CV:
+        return KalmanCvStage(width, spec.process_noise, spec.measurement_noise)
+    if kind == StageKind.MEDIAN:
+        return MedianStage(width, spec.window)
+    if kind == StageKind.FRAME_TRANSFORM:
+        return FrameTransformStage(roles, spec.translation, spec.rotation)
+    return OutlierGateStage(width, roles, spec.max_jump, spec.max_rejects)
+
+
+class BridgePipeline:
+    """
+    Ordered stages run by one bridge on every new sample of its sensor.
+
+    Each sample's row is copied into a preallocated buffer and passed
+    through the stages in place. Quaternion columns are first flipped into
+    the hemisphere of the previous output (q and -q are the same rotation,
+    but averaging them is not) and renormalized after the last stage.
+
+    last_seq is the newest sensor seq fed through; last_output the newest
+    sample that came out. Only used from the scheduler thread.
+    """
+
+    def __init__(self, driver: SensorDriver, specs: Sequence[StageSpec]):
+        if not specs:
+            raise ValueError("A pipeline needs at least one stage")
+        self.driver = driver
+        self.specs = tuple(specs)
+        self._roles = ColumnRoles(driver.columns)
+        self._stages = [build_stage(spec, driver.width, self._roles) for spec in self.specs]
+        self._buf = np.zeros(driver.width)
+        self._last_quat = np.zeros(4)
+        self.last_seq = 0
+        self.last_output: Optional[Sample] = None
+        self.rejected = 0
+
+    def process(self, ts: float, seq: int, read_ns: int, row: Sequence[float]) -> Optional[Sample]:
+        """
+        Run one sample through the stages. Returns the filtered Sample, or
+        None if a stage dropped it. Stages see ts as the sample time.
+        """
+        x = self._buf
+        x[:] = row
+        quat = self._roles.quat
+        if quat is not None and self.last_output is not None and float(np.dot(x[quat], self._last_quat)) < 0.0:
+            x[quat] *= -1.0
+
+        for stage in self._stages:
+            if not stage.apply(x, ts):
+                self.rejected += 1
+                return None
+
+        if quat is not None:
+            x[quat] /= math.sqrt(float(np.dot(x[quat], x[quat])))
+            self._last_quat[:] = x[quat]
+        out = Sample(self.driver.from_row(tuple(x.tolist())), ts, seq, read_ns)
+        self.last_output = out
+        return out
@@ -2,51 +2,69 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: bridge_request.proto
 """Generated protocol buffer code."""
-from google.protobuf.internal import enum_type_wrapper
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
 
 
+import service_reply_pb2 as service__reply__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14\x62ridge_request.proto\x12\x13hrt_interfaces.core\"i\n\x11OpenBridgeRequest\x12\x16\n\x0eoutbound_topic\x18\x01 \x01(\t\x12<\n\x0cmessage_type\x18\x02 \x01(\x0e\x32&.hrt_interfaces.core.BridgeMessageType\"\'\n\x12\x43loseBridgeRequest\x12\x11\n\tbridge_id\x18\x01 \x01(\t*=\n\x11\x42ridgeMessageType\x12\x16\n\x12\x42RIDGE_MSG_UNKNOWN\x10\x00\x12\x07\n\x03IMU\x10\x01\x12\x07\n\x03\x44WM\x10\x02\x62\x06proto3')
-
-_BRIDGEMESSAGETYPE = DESCRIPTOR.enum_types_by_name['BridgeMessageType']
-BridgeMessageType = enum_type_wrapper.EnumTypeWrapper(_BRIDGEMESSAGETYPE)
-BRIDGE_MSG_UNKNOWN = 0
-IMU = 1
-DWM = 2
-
-
-_OPENBRIDGEREQUEST = DESCRIPTOR.message_types_by_name['OpenBridgeRequest']
-_CLOSEBRIDGEREQUEST = DESCRIPTOR.message_types_by_name['CloseBridgeRequest']
-OpenBridgeRequest = _reflection.GeneratedProtocolMessageType('OpenBridgeRequest', (_message.Message,), {
-  'DESCRIPTOR' : _OPENBRIDGEREQUEST,
-  '__module__' : 'bridge_request_pb2'
-  # @@protoc_insertion_point(class_scope:hrt_interfaces.core.OpenBridgeRequest)
-  })
-_sym_db.RegisterMessage(OpenBridgeRequest)
-
-CloseBridgeRequest = _reflection.GeneratedProtocolMessageType('CloseBridgeRequest', (_message.Message,), {
-  'DESCRIPTOR' : _CLOSEBRIDGEREQUEST,
-  '__module__' : 'bridge_request_pb2'
-  # @@protoc_insertion_point(class_scope:hrt_interfaces.core.CloseBridgeRequest)
-  })
-_sym_db.RegisterMessage(CloseBridgeRequest)
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14\x62ridge_request.proto\x12\x13hrt_interfaces.core\x1a\x13service_reply.proto\"\x9d\x01\n\tBridgeQos\x12\x35\n\x08priority\x18\x01 \x01(\x0e\x32#.hrt_interfaces.core.BridgePriority\x12\x0f\n\x07\x65xpress\x18\x02 \x01(\x08\x12H\n\x12\x63ongestion_control\x18\x03 \x01(\x0e\x32,.hrt_interfaces.core.BridgeCongestionControl\"\xe0\x01\n\x0b\x42ridgeStage\x12\x32\n\x04type\x18\x01 \x01(\x0e\x32$.hrt_interfaces.core.BridgeStageType\x12\r\n\x05\x61lpha\x18\x02 \x01(\x02\x12\x15\n\rprocess_noise\x18\x03 \x01(\x02\x12\x19\n\x11measurement_noise\x18\x04 \x01(\x02\x12\x0e\n\x06window\x18\x05 \x01(\r\x12\x13\n\x0btranslation\x18\x06 \x03(\x02\x12\x10\n\x08rotation\x18\x07 \x03(\x02\x12\x10\n\x08max_jump\x18\x08 \x01(\x02\x12\x13\n\x0bmax_rejects\x18\t \x01(\r\"\xf5\x03\n\x11OpenBridgeRequest\x12\x16\n\x0eoutbound_topic\x18\x01 \x01(\t\x12<\n\x0cmessage_type\x18\x02 \x01(\x0e\x32&.hrt_interfaces.core.BridgeMessageType\x12<\n\x0cpublish_mode\x18\x03 \x01(\x0e\x32&.hrt_interfaces.core.BridgePublishMode\x12/\n\x05\x63odec\x18\x04 \x01(\x0e\x32 .hrt_interfaces.core.BridgeCodec\x12+\n\x03qos\x18\x05 \x01(\x0b\x32\x1e.hrt_interfaces.core.BridgeQos\x12\x19\n\x11\x62\x61tch_max_samples\x18\x06 \x01(\r\x12\x14\n\x0c\x62\x61tch_max_ms\x18\x07 \x01(\r\x12\x0f\n\x07rate_hz\x18\x08 \x01(\x02\x12\x12\n\ndecimation\x18\t \x01(\r\x12\x12\n\ndeadband_m\x18\n \x01(\x02\x12\x14\n\x0c\x64\x65\x61\x64\x62\x61nd_rad\x18\x0b \x01(\x02\x12\x30\n\x06stages\x18\x0c \x03(\x0b\x32 .hrt_interfaces.core.BridgeStage\x12<\n\x0cstale_policy\x18\r \x01(\x0e\x32&.hrt_interfaces.core.BridgeStalePolicy\"z\n\x0fOpenBridgeReply\x12\x31\n\x06status\x18\x01 \x01(\x0b\x32!.hrt_interfaces.core.ServiceReply\x12\x11\n\tbridge_id\x18\x02 \x01(\t\x12\x11\n\tref_count\x18\x03 \x01(\r\x12\x0e\n\x06reused\x18\x04 \x01(\x08\"\'\n\x12\x43loseBridgeRequest\x12\x11\n\tbridge_id\x18\x01 \x01(\t\"h\n\x10\x43loseBridgeReply\x12\x31\n\x06status\x18\x01 \x01(\x0b\x32!.hrt_interfaces.core.ServiceReply\x12\x11\n\tref_count\x18\x02 \x01(\r\x12\x0e\n\x06\x63losed\x18\x03 \x01(\x08\"M\n\x12OpenBridgesRequest\x12\x37\n\x07\x62ridges\x18\x01 \x03(\x0b\x32&.hrt_interfaces.core.OpenBridgeRequest\"Y\n\x10OpenBridgesReply\x12\x31\n\x06status\x18\x01 \x01(\x0b\x32!.hrt_interfaces.core.ServiceReply\x12\x12\n\nbridge_ids\x18\x02 \x03(\t\")\n\x13\x43loseBridgesRequest\x12\x12\n\nbridge_ids\x18\x01 \x03(\t\"\'\n\x12\x42ridgeStatsRequest\x12\x11\n\tbridge_id\x18\x01 \x01(\t\"Q\n\x10LatencyHistogram\x12\x0e\n\x06\x63ounts\x18\x01 \x03(\x04\x12\r\n\x05total\x18\x02 \x01(\x04\x12\x0e\n\x06sum_us\x18\x03 \x01(\x01\x12\x0e\n\x06max_us\x18\x04 \x01(\x01\"\xd0\x04\n\x0b\x42ridgeStats\x12\x11\n\tbridge_id\x18\x01 \x01(\t\x12\x16\n\x0eoutbound_topic\x18\x02 \x01(\t\x12<\n\x0cmessage_type\x18\x03 \x01(\x0e\x32&.hrt_interfaces.core.BridgeMessageType\x12\x12\n\nuptime_sec\x18\x04 \x01(\x01\x12\x11\n\tpublishes\x18\x05 \x01(\x04\x12\x17\n\x0fpublish_rate_hz\x18\x06 \x01(\x01\x12\x12\n\nsuppressed\x18\x07 \x01(\x04\x12\r\n\x05\x65mpty\x18\x08 \x01(\x04\x12\x16\n\x0epublish_errors\x18\t \x01(\x04\x12\x19\n\x11\x65ncode_cache_hits\x18\n \x01(\x04\x12\x11\n\tbytes_out\x18\x0b \x01(\x04\x12\x14\n\x0cmissed_ticks\x18\x0c \x01(\x04\x12\x38\n\tencode_us\x18\r \x01(\x0b\x32%.hrt_interfaces.core.LatencyHistogram\x12\x35\n\x06put_us\x18\x0e \x01(\x0b\x32%.hrt_interfaces.core.LatencyHistogram\x12:\n\x0blateness_us\x18\x0f \x01(\x0b\x32%.hrt_interfaces.core.LatencyHistogram\x12\x0f\n\x07\x63pu_sec\x18\x10 \x01(\x01\x12\x10\n\x08rejected\x18\x11 \x01(\x04\x12:\n\x0bpipeline_us\x18\x12 \x01(\x0b\x32%.hrt_interfaces.core.LatencyHistogram\x12\r\n\x05stale\x18\x13 \x01(\x04\"\xc6\x01\n\x0bSensorStats\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07updates\x18\x02 \x01(\x04\x12\x16\n\x0eupdate_rate_hz\x18\x03 \x01(\x01\x12\x16\n\x0elast_update_ts\x18\x04 \x01(\x01\x12\x0f\n\x07\x63pu_sec\x18\x05 \x01(\x01\x12\x31\n\x06health\x18\x06 \x01(\x0e\x32!.hrt_interfaces.core.SensorHealth\x12\x10\n\x08restarts\x18\x07 \x01(\r\x12\x12\n\nlast_error\x18\x08 \x01(\t\"\xd8\x01\n\x12ServiceMethodStats\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x63\x61lls\x18\x02 \x01(\x04\x12\x0e\n\x06\x65rrors\x18\x03 \x01(\x04\x12\x10\n\x08rejected\x18\x04 \x01(\x04\x12\x11\n\tin_flight\x18\x05 \x01(\r\x12\x36\n\x07wait_us\x18\x06 \x01(\x0b\x32%.hrt_interfaces.core.LatencyHistogram\x12\x38\n\thandle_us\x18\x07 \x01(\x0b\x32%.hrt_interfaces.core.LatencyHistogram\"\x81\x02\n\x10\x42ridgeStatsReply\x12\x31\n\x06status\x18\x01 \x01(\x0b\x32!.hrt_interfaces.core.ServiceReply\x12\x31\n\x07\x62ridges\x18\x02 \x03(\x0b\x32 .hrt_interfaces.core.BridgeStats\x12\x31\n\x07sensors\x18\x03 \x03(\x0b\x32 .hrt_interfaces.core.SensorStats\x12\x19\n\x11scheduler_cpu_sec\x18\x04 \x01(\x01\x12\x39\n\x08services\x18\x05 \x03(\x0b\x32\'.hrt_interfaces.core.ServiceMethodStats*d\n\x11\x42ridgeMessageType\x12\x16\n\x12\x42RIDGE_MSG_UNKNOWN\x10\x00\x12\x07\n\x03IMU\x10\x01\x12\x07\n\x03\x44WM\x10\x02\x12\r\n\tIMU_ACCEL\x10\x03\x12\x0c\n\x08IMU_GYRO\x10\x04\x12\x08\n\x04POSE\x10\x05*@\n\x11\x42ridgePublishMode\x12\x14\n\x10PUBLISH_PERIODIC\x10\x00\x12\x15\n\x11PUBLISH_ON_CHANGE\x10\x01*1\n\x0b\x42ridgeCodec\x12\x0e\n\nCODEC_JSON\x10\x00\x12\x12\n\x0e\x43ODEC_PROTOBUF\x10\x01*\x8e\x02\n\x0e\x42ridgePriority\x12\x1b\n\x17\x42RIDGE_PRIORITY_DEFAULT\x10\x00\x12\x1d\n\x19\x42RIDGE_PRIORITY_REAL_TIME\x10\x01\x12$\n BRIDGE_PRIORITY_INTERACTIVE_HIGH\x10\x02\x12#\n\x1f\x42RIDGE_PRIORITY_INTERACTIVE_LOW\x10\x03\x12\x1d\n\x19\x42RIDGE_PRIORITY_DATA_HIGH\x10\x04\x12\x18\n\x14\x42RIDGE_PRIORITY_DATA\x10\x05\x12\x1c\n\x18\x42RIDGE_PRIORITY_DATA_LOW\x10\x06\x12\x1e\n\x1a\x42RIDGE_PRIORITY_BACKGROUND\x10\x07*\\\n\x17\x42ridgeCongestionControl\x12\x16\n\x12\x43ONGESTION_DEFAULT\x10\x00\x12\x13\n\x0f\x43ONGESTION_DROP\x10\x01\x12\x14\n\x10\x43ONGESTION_BLOCK\x10\x02*\x8d\x01\n\x0f\x42ridgeStageType\x12\x11\n\rSTAGE_UNKNOWN\x10\x00\x12\r\n\tSTAGE_EMA\x10\x01\x12\x13\n\x0fSTAGE_KALMAN_CV\x10\x02\x12\x10\n\x0cSTAGE_MEDIAN\x10\x03\x12\x19\n\x15STAGE_FRAME_TRANSFORM\x10\x04\x12\x16\n\x12STAGE_OUTLIER_GATE\x10\x05*J\n\x11\x42ridgeStalePolicy\x12\x11\n\rSTALE_PUBLISH\x10\x00\x12\x12\n\x0eSTALE_SUPPRESS\x10\x01\x12\x0e\n\nSTALE_MARK\x10\x02*\x7f\n\x0cSensorHealth\x12\x12\n\x0eSENSOR_UNKNOWN\x10\x00\x12\x13\n\x0fSENSOR_STARTING\x10\x01\x12\r\n\tSENSOR_OK\x10\x02\x12\x10\n\x0cSENSOR_STALE\x10\x03\x12\x11\n\rSENSOR_FAILED\x10\x04\x12\x12\n\x0eSENSOR_STOPPED\x10\x05\x62\x06proto3')
 
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'bridge_request_pb2', globals())
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
-  _BRIDGEMESSAGETYPE._serialized_start=193
-  _BRIDGEMESSAGETYPE._serialized_end=254
-  _OPENBRIDGEREQUEST._serialized_start=45
-  _OPENBRIDGEREQUEST._serialized_end=150
-  _CLOSEBRIDGEREQUEST._serialized_start=152
-  _CLOSEBRIDGEREQUEST._serialized_end=191
-# @@protoc_insertion_point(module_scope)
\ No newline at end of file
+  _BRIDGEMESSAGETYPE._serialized_start=2840
+  _BRIDGEMESSAGETYPE._serialized_end=2940
+  _BRIDGEPUBLISHMODE._serialized_start=2942
+  _BRIDGEPUBLISHMODE._serialized_end=3006
+  _BRIDGECODEC._serialized_start=3008
+  _BRIDGECODEC._serialized_end=3057
+  _BRIDGEPRIORITY._serialized_start=3060
+  _BRIDGEPRIORITY._serialized_end=3330
+  _BRIDGECONGESTIONCONTROL._serialized_start=3332
+  _BRIDGECONGESTIONCONTROL._serialized_end=3424
+  _BRIDGESTAGETYPE._serialized_start=3427
+  _BRIDGESTAGETYPE._serialized_end=3568
+  _BRIDGESTALEPOLICY._serialized_start=3570
+  _BRIDGESTALEPOLICY._serialized_end=3644
+  _SENSORHEALTH._serialized_start=3646
+  _SENSORHEALTH._serialized_end=3773
+  _BRIDGEQOS._serialized_start=67
+  _BRIDGEQOS._serialized_end=224
+  _BRIDGESTAGE._serialized_start=227
+  _BRIDGESTAGE._serialized_end=451
+  _OPENBRIDGEREQUEST._serialized_start=454
+  _OPENBRIDGEREQUEST._serialized_end=955
+  _OPENBRIDGEREPLY._serialized_start=957
+  _OPENBRIDGEREPLY._serialized_end=1079
+  _CLOSEBRIDGEREQUEST._serialized_start=1081
+  _CLOSEBRIDGEREQUEST._serialized_end=1120
+  _CLOSEBRIDGEREPLY._serialized_start=1122
+  _CLOSEBRIDGEREPLY._serialized_end=1226
+  _OPENBRIDGESREQUEST._serialized_start=1228
+  _OPENBRIDGESREQUEST._serialized_end=1305
+  _OPENBRIDGESREPLY._serialized_start=1307
+  _OPENBRIDGESREPLY._serialized_end=1396
+  _CLOSEBRIDGESREQUEST._serialized_start=1398
+  _CLOSEBRIDGESREQUEST._serialized_end=1439
+  _BRIDGESTATSREQUEST._serialized_start=1441
+  _BRIDGESTATSREQUEST._serialized_end=1480
+  _LATENCYHISTOGRAM._serialized_start=1482
+  _LATENCYHISTOGRAM._serialized_end=1563
+  _BRIDGESTATS._serialized_start=1566
+  _BRIDGESTATS._serialized_end=2158
+  _SENSORSTATS._serialized_start=2161
+  _SENSORSTATS._serialized_end=2359
+  _SERVICEMETHODSTATS._serialized_start=2362
+  _SERVICEMETHODSTATS._serialized_end=2578
+  _BRIDGESTATSREPLY._serialized_start=2581
+  _BRIDGESTATSREPLY._serialized_end=2838
+# @@protoc_insertion_point(module_scope)
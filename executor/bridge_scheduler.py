@@ -0,0 +1,220 @@
+import heapq
+import math
+import time
+from dataclasses import dataclass, field
+from threading import Condition, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bridge_stats import LatencyHistogram, thread_cpu_sec
+
+
+@dataclass
+class JitterStats:
+    """
+    Running dispatch-lateness statistics for one scheduled task.
+
+    Lateness is how far after its deadline (periodic) or after the sensor
+    update (on-change) the task actually ran. Uses Welford's algorithm so
+    recording is O(1) with no allocation.
+    """
+    count: int = 0
+    mean_sec: float = 0.0
+    max_sec: float = 0.0
+    missed_ticks: int = 0
+    _m2: float = 0.0
+
+    def record(self, lateness_sec: float) -> None:
+        self.count += 1
+        delta = lateness_sec - self.mean_sec
+        self.mean_sec += delta / self.count
+        self._m2 += delta * (lateness_sec - self.mean_sec)
+        if lateness_sec > self.max_sec:
+            self.max_sec = lateness_sec
+
+    @property
+    def stddev_sec(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_sec": self.mean_sec,
+            "stddev_sec": self.stddev_sec,
+            "max_sec": self.max_sec,
+            "missed_ticks": self.missed_ticks,
+        }
+
+
+@dataclass(eq=False)
+class ScheduledTask:
+    """
+    One callback driven by the BridgeScheduler.
+
+    Periodic tasks have a period and a deadline on the timer heap.
+    On-change tasks have a sensor name and run when that sensor updates.
+    cpu_ns accumulates the scheduler-thread CPU time spent in callback.
+    """
+    key: str
+    callback: Callable[[], None]
+    period_sec: Optional[float] = None
+    sensor: Optional[str] = None
+    deadline: float = 0.0
+    cancelled: bool = False
+    jitter: JitterStats = field(default_factory=JitterStats)
+    lateness: LatencyHistogram = field(default_factory=LatencyHistogram)
+    cpu_ns: int = 0
+
+
+class BridgeScheduler:
+    """
+    Drives any number of bridge publishes from a single thread.
+
+    Periodic tasks sit on a deadline-ordered heap. Each new deadline is
+    the previous deadline plus the period (not "now + period"), so timing
+    does not drift; if a task falls more than a full period behind, the
+    missed ticks are skipped and counted rather than replayed in a burst.
+
+    On-change tasks are woken through notify(sensor), which SharedState
+    listeners call on every write. Notifies that arrive before the task
+    runs coalesce into one run.
+    """
+
+    def __init__(self, name: str = "bridge-scheduler"):
+        self._cond = Condition()
+        self._heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._counter = 0
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._on_change: Dict[str, List[ScheduledTask]] = {}
+        self._pending: Dict[str, float] = {}
+        self._stopped = False
+        self._thread = Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def add_periodic(self, key: str, period_sec: float, callback: Callable[[], None]) -> ScheduledTask:
+        """
+        Run callback every period_sec, starting one period from now.
+        """
+        if period_sec <= 0:
+            raise ValueError(f"period_sec must be positive, got {period_sec}")
+        task = ScheduledTask(key=key, callback=callback, period_sec=period_sec)
+        with self._cond:
+            self._register(task)
+            task.deadline = time.monotonic() + period_sec
+            self._push(task)
+            self._cond.notify()
+        return task
+
+    def add_on_change(self, key: str, sensor: str, callback: Callable[[], None]) -> ScheduledTask:
+        """
+        Run callback once per notify(sensor).
+        """
+        task = ScheduledTask(key=key, callback=callback, sensor=sensor)
+        with self._cond:
+            self._register(task)
+            self._on_change.setdefault(sensor, []).append(task)
+        return task
+
+    def remove(self, key: str) -> None:
+        """
+        Stop scheduling the task registered under key.
+
+        Raises KeyError if key is unknown.
+        """
+        with self._cond:
+            task = self._tasks.pop(key)
+            task.cancelled = True
+            if task.sensor is not None:
+                self._on_change[task.sensor].remove(task)
+            # Periodic entries are dropped lazily when they reach the top of the heap.
+
+    def notify(self, sensor: str) -> None:
+        """
+        Signal that sensor has a new sample. Safe to call from any thread.
+
+        A no-op unless an on-change task watches sensor, so writes of
+        unwatched sensors neither take the lock nor wake the thread. The
+        check is unlocked: a task added concurrently is woken by the next
+        sample. A sensor already pending does not wake the thread again.
+        """
+        if not self._on_change.get(sensor):
+            return
+        with self._cond:
+            if sensor in self._pending:
+                return
+            self._pending[sensor] = time.monotonic()
+            self._cond.notify()
+
+    def stop(self) -> None:
+        """
+        Stop the scheduler thread and wait for it to exit.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+
+    def thread_cpu_sec(self) -> float:
+        """
+        Total CPU time used by the scheduler thread.
+        """
+        return thread_cpu_sec(self._thread)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def _register(self, task: ScheduledTask) -> None:
+        if task.key in self._tasks:
+            raise ValueError(f"Task '{task.key}' is already scheduled")
+        self._tasks[task.key] = task
+
+    def _push(self, task: ScheduledTask) -> None:
+        self._counter += 1
+        heapq.heappush(self._heap, (task.deadline, self._counter, task))
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and not self._pending:
+                    if self._heap:
+                        timeout = self._heap[0][0] - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        self._cond.wait(timeout)
+                    else:
+                        self._cond.wait()
+                if self._stopped:
+                    return
+
+                now = time.monotonic()
+                due: List[Tuple[ScheduledTask, float]] = []
+
+                pending, self._pending = self._pending, {}
+                for sensor, notified_at in pending.items():
+                    for task in self._on_change.get(sensor, ()):
+                        due.append((task, now - notified_at))
+
+                while self._heap and self._heap[0][0] <= now:
+                    deadline, _, task = heapq.heappop(self._heap)
+                    if task.cancelled:
+                        continue
+                    due.append((task, now - deadline))
+                    task.deadline = deadline + task.period_sec
+                    if task.deadline <= now:
+                        missed = math.ceil((now - task.deadline) / task.period_sec)
+                        task.jitter.missed_ticks += missed
+                        task.deadline += missed * task.period_sec
+                    self._push(task)
+
+            for task, lateness in due:
+                if task.cancelled:
+                    continue
+                task.jitter.record(lateness)
+                task.lateness.record(int(lateness * 1e9))
+                cpu_start = time.thread_time_ns()
+                try:
+                    task.callback()
+                except Exception as e:
+                    print(f"[SCHED] task {task.key} error: {e}")
+                task.cpu_ns += time.thread_time_ns() - cpu_start
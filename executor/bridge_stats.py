@@ -0,0 +1,109 @@
+import os
+import time
+
+# counts[0] is < 1 us, counts[n] is [2^(n-1), 2^n) us, last bucket open-ended (~1 s+)
+HISTOGRAM_BUCKETS = 22
+
+
+class LatencyHistogram:
+    """
+    Fixed log2 histogram of durations.
+
+    record() is a bit_length() and a list increment, cheap enough to leave
+    on for every publish.
+    """
+    __slots__ = ("counts", "total", "sum_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.total = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        idx = (ns // 1000).bit_length()
+        if idx >= HISTOGRAM_BUCKETS:
+            idx = HISTOGRAM_BUCKETS - 1
+        self.counts[idx] += 1
+        self.total += 1
+        self.sum_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def to_proto(self, msg) -> None:
+        """
+        Fill a bridge_pb.LatencyHistogram.
+        """
+        msg.counts.extend(self.counts)
+        msg.total = self.total
+        msg.sum_us = self.sum_ns / 1000.0
+        msg.max_us = self.max_ns / 1000.0
+
+
+class BridgeStats:
+    """
+    Counters for one bridge. Written only from the scheduler thread.
+    """
+    __slots__ = (
+        "opened_at",
+        "publishes",
+        "stale",
+        "empty",
+        "publish_errors",
+        "encode_cache_hits",
+        "bytes_out",
+        "encode",
+        "put",
+        "pipeline",
+    )
+
+    def __init__(self):
+        self.opened_at = time.monotonic()
+        self.publishes = 0
+        self.stale = 0
+        self.empty = 0
+        self.publish_errors = 0
+        self.encode_cache_hits = 0
+        self.bytes_out = 0
+        self.encode = LatencyHistogram()
+        self.put = LatencyHistogram()
+        self.pipeline = LatencyHistogram()
+
+    @property
+    def uptime_sec(self) -> float:
+        return time.monotonic() - self.opened_at
+
+    @property
+    def publish_rate_hz(self) -> float:
+        uptime = self.uptime_sec
+        return self.publishes / uptime if uptime > 0 else 0.0
+
+
+def thread_cpu_sec(thread) -> float:
+    """
+    CPU time consumed so far by the threading.Thread thread, or 0.0 if it
+    is None or not alive. The ident of a finished thread may already
+    belong to another thread (or to none), so it is never queried.
+    """
+    if thread is None or not thread.is_alive():
+        return 0.0
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+    except (OSError, AttributeError):
+        return 0.0
+
+
+def process_cpu_sec(pid) -> float:
+    """
+    CPU time (user + system) consumed so far by process pid, or 0.0 if it
+    is unknown or has exited. Linux only (reads /proc).
+    """
+    if pid is None:
+        return 0.0
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # comm may contain spaces; fields after it are space separated
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return 0.0
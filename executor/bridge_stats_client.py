@@ -0,0 +1,56 @@
+import argparse
+import zenoh
+import bridge_request_pb2 as bridge_pb
+import service_reply_pb2 as service_reply_pb
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zenoh-endpoint", required=True)
+    parser.add_argument("--bridge-id", default="", help="Only report this bridge (default: all)")
+    args = parser.parse_args()
+
+    config = zenoh.Config()
+    config.insert_json5("connect/endpoints", f'["{args.zenoh_endpoint}"]')
+    z = zenoh.open(config)
+
+    req = bridge_pb.BridgeStatsRequest(bridge_id=args.bridge_id)
+
+    replies = z.get(
+        "backend/bridge_mgmt/stats",
+        payload=req.SerializeToString(),
+    )
+
+    for reply in replies:
+        if reply.ok is not None:
+            rep = bridge_pb.BridgeStatsReply()
+            rep.ParseFromString(reply.ok.payload.to_bytes())
+            for b in rep.bridges:
+                mean_put = b.put_us.sum_us / b.put_us.total if b.put_us.total else 0.0
+                mean_enc = b.encode_us.sum_us / b.encode_us.total if b.encode_us.total else 0.0
+                print(
+                    f"bridge {b.bridge_id} topic={b.outbound_topic} pubs={b.publishes} "
+                    f"rate={b.publish_rate_hz:.1f}Hz suppressed={b.suppressed} stale={b.stale} errors={b.publish_errors} "
+                    f"encode={mean_enc:.1f}us put={mean_put:.1f}us missed={b.missed_ticks} cpu={b.cpu_sec:.3f}s"
+                )
+            for s in rep.sensors:
+                health = bridge_pb.SensorHealth.Name(s.health).removeprefix("SENSOR_").lower()
+                print(
+                    f"sensor {s.name} updates={s.updates} rate={s.update_rate_hz:.1f}Hz cpu={s.cpu_sec:.3f}s "
+                    f"health={health} restarts={s.restarts}" + (f" last_error={s.last_error!r}" if s.last_error else "")
+                )
+            print(f"scheduler cpu={rep.scheduler_cpu_sec:.3f}s")
+            for m in rep.services:
+                mean_handle = m.handle_us.sum_us / m.handle_us.total if m.handle_us.total else 0.0
+                print(
+                    f"service {m.name} calls={m.calls} errors={m.errors} rejected={m.rejected} "
+                    f"in_flight={m.in_flight} handle={mean_handle:.1f}us max={m.handle_us.max_us:.1f}us"
+                )
+        else:
+            rep = service_reply_pb.ServiceReply()
+            rep.ParseFromString(reply.err.payload.to_bytes())
+            print("error:", rep.message, rep.error)
+
+    z.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import math
+from typing import Optional
+
+
+class BridgeThrottle:
+    """
+    Per-bridge gate deciding which samples are worth publishing.
+
+    - min_interval_sec: at most one publish per interval (rate cap)
+    - decimation: only every Nth admitted candidate is published
+    - deadband_m: for "distance" sensors (DWM), samples closer than this
+      to the last published position are suppressed
+    - deadband_rad: for "rotation" sensors (IMU), samples rotated less
+      than this from the last published quaternion are suppressed
+
+    deadband_kind is the sensor driver's deadband ("distance", "rotation"
+    or None) and selects which of the two applies.
+
+    The deadband compares against the last *published* value, so slow
+    drift still goes out once it accumulates past the threshold.
+    """
+    __slots__ = (
+        "min_interval_sec",
+        "decimation",
+        "deadband_m",
+        "deadband_rad",
+        "deadband_kind",
+        "_min_abs_dot",
+        "_last_pub_time",
+        "_last_value",
+        "_counter",
+        "suppressed",
+    )
+
+    def __init__(
+        self,
+        *,
+        min_interval_sec: float = 0.0,
+        decimation: int = 1,
+        deadband_m: float = 0.0,
+        deadband_rad: float = 0.0,
+        deadband_kind: Optional[str] = None,
+    ):
+        if min_interval_sec < 0 or deadband_m < 0 or deadband_rad < 0:
+            raise ValueError("Rate limit and deadbands must be non-negative")
+        if decimation < 1:
+            raise ValueError(f"decimation must be >= 1, got {decimation}")
+
+        self.min_interval_sec = min_interval_sec
+        self.decimation = decimation
+        self.deadband_m = deadband_m
+        self.deadband_rad = deadband_rad
+        self.deadband_kind = deadband_kind
+        # |q1 . q2| >= cos(angle / 2) means the rotation between them is within angle.
+        self._min_abs_dot = math.cos(deadband_rad / 2.0)
+
+        self._last_pub_time: Optional[float] = None
+        self._last_value: Optional[tuple] = None
+        self._counter = 0
+        self.suppressed = 0
+
+    @property
+    def needs_value(self) -> bool:
+        """
+        True if admit() needs the decoded sample value (deadband active).
+        """
+        if self.deadband_kind == "distance":
+            return self.deadband_m > 0
+        if self.deadband_kind == "rotation":
+            return self.deadband_rad > 0
+        return False
+
+    def admit(self, value: Optional[tuple], now: float) -> bool:
+        """
+        Return True if this sample should be published, recording it as
+        the last published sample. now is a monotonic time in seconds.
+        """
+        if self._last_pub_time is not None and now - self._last_pub_time < self.min_interval_sec:
+            self.suppressed += 1
+            return False
+
+        if value is not None and self._last_value is not None and self._within_deadband(value):
+            self.suppressed += 1
+            return False
+
+        self._counter += 1
+        if self._counter < self.decimation:
+            self.suppressed += 1
+            return False
+        self._counter = 0
+
+        self._last_pub_time = now
+        self._last_value = value
+        return True
+
+    def _within_deadband(self, value: tuple) -> bool:
+        last = self._last_value
+        if self.deadband_kind == "distance" and self.deadband_m > 0:
+            dist_sq = sum((a - b) * (a - b) for a, b in zip(value, last))
+            return dist_sq < self.deadband_m * self.deadband_m
+        if self.deadband_kind == "rotation" and self.deadband_rad > 0:
+            dot = abs(value[0] * last[0] + value[1] * last[1] + value[2] * last[2] + value[3] * last[3])
+            return dot > self._min_abs_dot
+        return False
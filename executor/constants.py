@@ -1,18 +1,73 @@
 # ---- Timing ----
-IMU_POLL_SEC = 0.05
-DWM_POLL_SEC = 0.10
-
 PUBLISH_PERIOD_SEC = 0.10  # per bridge publisher loop rate
 
+# ---- IMU / BNO08x ----
+IMU_REPORT_RATE_HZ = 200.0  # requested rate for every enabled report
+IMU_REPORTS = ("rotation", "accel", "gyro")  # see bno08x_reader._REPORT_IDS
+IMU_I2C_FREQUENCY = 400_000  # fast-mode I2C; 100 kHz cannot carry 3 x 200 Hz reports
+IMU_IDLE_SLEEP_SEC = 0.001  # reader sleep when a wakeup found no reports
+
+# ---- SharedState ----
+SENSOR_HISTORY_LEN = 1024  # samples kept per sensor ring buffer (0 disables)
+SHM_POLL_SEC = 0.001  # shared-memory state: update poll period for cross-process readers
+SHM_READ_RETRIES = 100  # seqlock read attempts before serving the last good sample
+SENSOR_PROCESS_JOIN_SEC = 2.0  # grace period before a sensor process is terminated
+
+# ---- Sensor supervisor ----
+SUPERVISOR_CHECK_SEC = 0.02  # health check period; bounds stall detection latency
+SUPERVISOR_BACKOFF_INITIAL_SEC = 0.05  # first restart delay; doubles per failed attempt
+SUPERVISOR_BACKOFF_MAX_SEC = 5.0
+SUPERVISOR_START_GRACE_SEC = 5.0  # time a (re)started worker gets to produce its first sample
+# The IMU stall timeout follows the configured report rate (see
+# BridgeManager.start_sensors): IMU_STALL_REPORTS report periods, but never
+# less than IMU_STALL_SEC, which is also the default for other callers.
+IMU_STALL_SEC = 0.25  # no IMU sample for this long -> stalled
+IMU_STALL_REPORTS = 5
+# A DWM1001 tag reports at its stationary update rate (the "aurs" urs
+# setting) while it is not moving, so gaps between fixes are that long in
+# normal operation. Set this to the slowest rate the tags are configured
+# with; the stall timeout allows a few missed fixes on top of it.
+DWM_STATIONARY_UPDATE_SEC = 5.0
+DWM_STALL_UPDATES = 3
+DWM_STALL_SEC = DWM_STALL_UPDATES * DWM_STATIONARY_UPDATE_SEC  # no DWM fix for this long -> stalled
+IMU_MAX_READ_ERRORS = 20  # consecutive failed IMU reads before the reader gives up and reopens
+
+# ---- Simulated sensors ----
+SIM_IMU_RATE_HZ = 200.0
+SIM_DWM_RATE_HZ = 10.0
+
+# ---- Pose fusion ----
+FUSION_DELAY_MS = 0.0  # output lag; > 0 interpolates between samples instead of extrapolating
+FUSION_MAX_EXTRAPOLATION_SEC = 0.5  # dead reckoning horizon past the last DWM fix
+FUSION_IMU_HISTORY = 64  # IMU samples kept for interpolation
+
+# ---- Recorder ----
+RECORDER_QUEUE_SIZE = 65_536  # samples buffered between state listener and writer
+RECORDER_CHUNK_RECORDS = 4096  # records per chunk index entry
+RECORDER_FLUSH_SEC = 0.05  # writer thread wakeup period
+
 # ---- DWM / Serial ----
 DWM_DEFAULT_PORT = "/dev/ttyACM0"
 DWM_BAUD = 115_200
-DWM_SERIAL_TIMEOUT_SEC = 1.0
+DWM_SHELL_TIMEOUT_SEC = 2.0  # wait for the "dwm>" prompt after entering shell mode
+DWM_READ_WAIT_SEC = 0.05  # select() timeout; bounds how long stop takes to be seen
+
+# ---- Service runtime (queryable handlers) ----
+SERVICE_MAX_WORKERS = 4  # handler threads shared by all methods of a runtime
+SERVICE_MAX_PENDING = 64  # queries queued or running across all methods before new ones are rejected
+SERVICE_MAX_IN_FLIGHT = 8  # default per-method limit on queued + running queries
 
 # ---- Zenoh ----
 ZENOH_ENDPOINT = "tcp/localhost:7447"
 PI_IP = "172.29.254.77"
 
-# ---- IMU thresholds (example for task logic) ----
-STABLE_W_THRESHOLD = 0.50
+# ---- Orientation analytics (task logic) ----
+TASK_PERIOD_SEC = 0.2
+STABILITY_WINDOW_SEC = 1.0  # IMU history each stability decision looks at
+STABILITY_MAX_RATE_RAD_S = 0.5  # p90 angular speed at which the stability score reaches 0
+STABILITY_MAX_SPREAD_RAD = 0.15  # spread around the window mean at which the score reaches 0
+STABLE_SCORE_THRESHOLD = 0.5
+TASK_BRIDGE_MGMT = "backend/bridge_mgmt"  # bridge manager task loops read sensor history from
+TASK_BRIDGE_BATCH_MS = 50  # batching of the bridge feeding a task loop's history
+TASK_BRIDGE_TIMEOUT_SEC = 2.0  # open/close_bridge query timeout
 
@@ -2,41 +2,22 @@ import time
 from concurrent.futures import ThreadPoolExecutor
 from threading import Event, Lock
 
-from constants import (
-    DWM_DEFAULT_PORT, DWM_BAUD, DWM_SERIAL_TIMEOUT_SEC,
-    DWM_POLL_SEC, PUBLISH_PERIOD_SEC
-)
+from constants import DWM_DEFAULT_PORT, PUBLISH_PERIOD_SEC
 from shared_state import SharedState
 
 
 def dwm_worker(stop: Event, state: SharedState, port: str) -> None:
-    from serial import Serial
-
-    import dwm1001
     """
-    Background worker for DWM1001 (or similar serial sensor).
+    Background worker for DWM1001.
 
     - Opens serial port
-    - Starts position reporting
-    - Continuously reads position
-    - Writes latest position to SharedState
+    - Puts the tag in continuous position reporting ("lep")
+    - Parses every position frame from a non-blocking read loop
+    - Writes each position to SharedState with its arrival time
     """
-    print(f"[DWM] Initializing on {port}...")
-    ser = Serial(port, baudrate=DWM_BAUD, timeout=DWM_SERIAL_TIMEOUT_SEC)
-    tag = dwm1001.ActiveTag(ser)
-    tag.start_position_reporting()
-    print("[DWM] Worker started")
+    from dwm_stream_reader import run_dwm_stream
 
-    while not stop.is_set():
-        try:
-            pos = tag.position
-            if pos:
-                state.set_dwm_pos(pos)
-        except Exception:
-            pass
-        time.sleep(DWM_POLL_SEC)
-
-    print("[DWM] Worker stopping")
+    run_dwm_stream(stop, state, port)
 
 
 def main() -> None:
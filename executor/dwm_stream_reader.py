@@ -0,0 +1,132 @@
+import math
+import select
+import time
+from typing import List, NamedTuple, Optional
+
+from constants import DWM_BAUD, DWM_READ_WAIT_SEC, DWM_SHELL_TIMEOUT_SEC
+
+_PROMPT = b"dwm>"
+_MAX_LINE = 512  # longer garbage without a newline is dropped
+
+
+class DwmPosition(NamedTuple):
+    """
+    One position frame from the tag's "lep"/"lec" output.
+    """
+    x_m: float
+    y_m: float
+    z_m: float
+    quality: int
+
+
+class DwmLineParser:
+    """
+    Incremental parser for the DWM1001 shell's position output.
+
+    feed() takes whatever bytes the port returned, keeps any partial line
+    for the next call and returns every complete position frame, so frames
+    are never split or dropped by read boundaries. Understands "lep" lines
+    (POS,x,y,z,qf) and "lec" lines (DIST,...,POS,x,y,z,qf); other lines
+    (prompt, echoes) are ignored.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self.frames = 0
+        self.parse_errors = 0
+
+    def feed(self, data: bytes) -> List[DwmPosition]:
+        buf = self._buf
+        buf += data
+        out = []
+        start = 0
+        while True:
+            end = buf.find(b"\n", start)
+            if end < 0:
+                break
+            pos = self._parse_line(bytes(buf[start:end]))
+            if pos is not None:
+                out.append(pos)
+            start = end + 1
+        del buf[:start]
+        if len(buf) > _MAX_LINE:
+            self.parse_errors += 1
+            buf.clear()
+        return out
+
+    def _parse_line(self, line: bytes) -> Optional[DwmPosition]:
+        idx = line.find(b"POS,")
+        if idx < 0:
+            return None
+        fields = line[idx + 4:].strip().split(b",")
+        try:
+            x, y, z = float(fields[0]), float(fields[1]), float(fields[2])
+            quality = int(fields[3]) if len(fields) > 3 else 0
+        except (IndexError, ValueError):
+            self.parse_errors += 1
+            return None
+        if math.isnan(x) or math.isnan(y) or math.isnan(z):
+            return None
+        self.frames += 1
+        return DwmPosition(x, y, z, quality)
+
+
+def _enter_shell(ser) -> None:
+    """
+    Switch the tag's UART into shell mode and wait for the prompt.
+
+    Two carriage returns within a second enter shell mode; if the tag is
+    already in the shell (e.g. still streaming from a previous run) one
+    more return just stops the stream and re-prints the prompt.
+    """
+    ser.reset_input_buffer()
+    ser.write(b"\r\r")
+    start = time.monotonic()
+    retried = False
+    seen = bytearray()
+    while time.monotonic() - start < DWM_SHELL_TIMEOUT_SEC:
+        seen += ser.read(256)
+        if _PROMPT in seen:
+            return
+        if not retried and time.monotonic() - start > DWM_SHELL_TIMEOUT_SEC / 2:
+            ser.write(b"\r")
+            retried = True
+        time.sleep(0.05)
+    raise TimeoutError("DWM1001 shell prompt not seen")
+
+
+def run_dwm_stream(stop, state, port: str, baud: int = DWM_BAUD) -> None:
+    """
+    Stream every DWM1001 position frame into SharedState until stop is set.
+
+    The tag is put in continuous "lep" reporting mode once; the port is
+    then read non-blocking whenever select() reports data, and each frame
+    is stored with the monotonic arrival time of the bytes that completed it.
+    """
+    from serial import Serial
+
+    print(f"[DWM] Initializing on {port}...")
+    ser = Serial(port, baudrate=baud, timeout=0)
+    parser = DwmLineParser()
+    try:
+        _enter_shell(ser)
+        ser.reset_input_buffer()
+        ser.write(b"lep\r")
+        print("[DWM] Worker started")
+
+        while not stop.is_set():
+            ready, _, _ = select.select([ser], [], [], DWM_READ_WAIT_SEC)
+            if not ready:
+                continue
+            data = ser.read(max(1, ser.in_waiting))
+            arrival_ns = time.monotonic_ns()
+            for pos in parser.feed(data):
+                state.set_dwm_pos(pos, read_ns=arrival_ns)
+    finally:
+        try:
+            # Any input stops "lep" streaming.
+            ser.write(b"\r")
+        except Exception:
+            pass
+        ser.close()
+        print(f"[DWM] Worker stopping (frames={parser.frames}, parse_errors={parser.parse_errors})")
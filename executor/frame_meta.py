@@ -0,0 +1,49 @@
+import struct
+from typing import NamedTuple, Optional
+
+FRAME_META_VERSION = 1
+
+# FrameMeta.flags bits
+FRAME_STALE = 0x01  # a source sensor of the bridge was not healthy (see SensorSupervisor)
+
+# version, flags, pad, frame_seq, sample_seq, read_ns, encode_ns, publish_ns, publish_ts
+_FRAME_META = struct.Struct("<BB6xQQqqqd")
+
+
+class FrameMeta(NamedTuple):
+    """
+    Timing and sequencing carried in the Zenoh attachment of every bridge frame.
+
+    It travels beside the payload rather than inside it so that encoded
+    payload bytes stay shareable between bridges (see the encode cache).
+
+    *_ns fields are CLOCK_MONOTONIC nanoseconds on the publishing host and
+    are only comparable with each other. publish_ts is wall-clock seconds,
+    for estimating network latency against the subscriber's clock.
+    """
+    frame_seq: int  # per bridge, +1 per frame put; gaps mean lost frames
+    sample_seq: int  # newest sensor sample seq in the frame
+    read_ns: int  # when that sample was read from the sensor
+    encode_ns: int  # when the payload was encoded
+    publish_ns: int  # just before put
+    publish_ts: float
+    flags: int = 0  # FRAME_* bits; was padding before flags existed, so old frames read as 0
+
+    @property
+    def stale(self) -> bool:
+        return bool(self.flags & FRAME_STALE)
+
+    def pack(self) -> bytes:
+        return _FRAME_META.pack(FRAME_META_VERSION, self.flags, *self[:-1])
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Optional["FrameMeta"]:
+        """
+        Parse an attachment, or return None if it is not a FrameMeta.
+        """
+        if len(data) != _FRAME_META.size:
+            return None
+        version, flags, *fields = _FRAME_META.unpack(data)
+        if version != FRAME_META_VERSION:
+            return None
+        return cls(*fields, flags)
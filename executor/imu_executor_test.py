@@ -2,39 +2,23 @@ import time
 from concurrent.futures import ThreadPoolExecutor
 from threading import Event, Lock
 
-from constants import IMU_POLL_SEC, PUBLISH_PERIOD_SEC
+from constants import IMU_REPORT_RATE_HZ, PUBLISH_PERIOD_SEC
 from shared_state import SharedState
 
 
-def imu_worker(stop: Event, state: SharedState) -> None:
-    import board
-    import busio
-    from adafruit_bno08x.i2c import BNO08X_I2C
-    from adafruit_bno08x import BNO_REPORT_ROTATION_VECTOR
+def imu_worker(stop: Event, state: SharedState, rate_hz: float = IMU_REPORT_RATE_HZ) -> None:
     """
     Background worker function for IMU.
 
-    - Initializes the BNO085 IMU
-    - Continuously reads quaternion data
-    - Stores latest orientation in SharedState
+    - Initializes the BNO085 IMU with rotation vector, accelerometer and
+      gyroscope reports at rate_hz
+    - Drains every pending report on each wakeup
+    - Stores each report, timestamped, in SharedState
     - Stops cleanly when stop Event is set
     """
-    print("[IMU] Initializing...")
-    i2c = busio.I2C(board.SCL, board.SDA)
-    bno = BNO08X_I2C(i2c)
-    bno.enable_feature(BNO_REPORT_ROTATION_VECTOR)
-    print("[IMU] Worker started")
+    from bno08x_reader import run_bno08x
 
-    while not stop.is_set():
-        try:
-            quat = bno.quaternion
-            if quat:
-                state.set_imu_quat(quat)
-        except Exception as e:
-            print(f"[IMU] Error: {e}")
-        time.sleep(IMU_POLL_SEC)
-
-    print("[IMU] Worker stopping")
+    run_bno08x(stop, state, rate_hz=rate_hz)
 
 
 def main() -> None:
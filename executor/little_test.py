@@ -1,5 +1,5 @@
 import zenoh
-import bridge_mgmt_pb2 as bridge_pb
+import bridge_request_pb2 as bridge_pb
 
 cfg = zenoh.Config()
 cfg.insert_json5("connect/endpoints", '["tcp/localhost:7447"]')
@@ -3,7 +3,59 @@ from enum import Enum
 
 class MessageType(str, Enum):
     """
-    Message types that a bridge can publish.
+    Built-in message types that a bridge can publish.
+
+    Each names a driver in sensor_drivers; bridges accept the name of any
+    registered driver, not only these members.
     """
     IMU = "imu"
-    DWM = "dwm"
\ No newline at end of file
+    DWM = "dwm"
+    IMU_ACCEL = "imu_accel"
+    IMU_GYRO = "imu_gyro"
+    POSE = "pose"
+
+
+class PublishMode(str, Enum):
+    """
+    When a bridge publishes.
+
+    PERIODIC re-publishes the latest sample every PUBLISH_PERIOD_SEC.
+    ON_CHANGE publishes the latest sample at most once per scheduler
+    wake-up after the sensor writes (bursts coalesce to the newest; batched
+    and filtered bridges still see every sample through the history ring).
+    """
+    PERIODIC = "periodic"
+    ON_CHANGE = "on_change"
+
+
+class Codec(str, Enum):
+    """
+    Wire encoding for bridge payloads.
+    """
+    JSON = "json"
+    PROTOBUF = "protobuf"
+
+
+class SensorSource(str, Enum):
+    """
+    Where a sensor's samples come from.
+
+    HARDWARE runs the driver's real worker, SIM a simulated source and
+    REPLAY plays back a recorded sample log.
+    """
+    HARDWARE = "hardware"
+    SIM = "sim"
+    REPLAY = "replay"
+
+
+class StalePolicy(str, Enum):
+    """
+    What a bridge does while a source sensor is not healthy (see
+    sensor_supervisor.SensorHealth).
+
+    PUBLISH ignores sensor health, SUPPRESS publishes nothing until the
+    sensor recovers, MARK publishes with FRAME_STALE set in FrameMeta.
+    """
+    PUBLISH = "publish"
+    SUPPRESS = "suppress"
+    MARK = "mark"
@@ -1,37 +1,135 @@
 import argparse
 import zenoh
 import bridge_request_pb2 as bridge_pb
-import service_reply_pb2 as service_reply_pb
+from sensor_drivers import get_driver, sensor_names
+
+_STAGE_LIST_FIELDS = ("translation", "rotation")
+
+
+def parse_stage(text: str) -> bridge_pb.BridgeStage:
+    """
+    "TYPE[:key=value,...]" -> BridgeStage, e.g. "ema:alpha=0.2",
+    "median:window=5" or "frame_transform:rotation=0/0/0.7071/0.7071".
+    List values (translation, rotation) are separated by "/".
+    """
+    kind, _, params = text.partition(":")
+    stage = bridge_pb.BridgeStage()
+    stage.type = bridge_pb.BridgeStageType.Value(f"STAGE_{kind.upper()}")
+    for item in filter(None, params.split(",")):
+        key, _, value = item.partition("=")
+        if key in _STAGE_LIST_FIELDS:
+            getattr(stage, key).extend(float(v) for v in value.split("/"))
+        elif key in ("window", "max_rejects"):
+            setattr(stage, key, int(value))
+        else:
+            setattr(stage, key, float(value))
+    return stage
+
+
+def _open_one(z, req: bridge_pb.OpenBridgeRequest) -> None:
+    replies = z.get(
+        "backend/bridge_mgmt/open_bridge",
+        payload=req.SerializeToString(),
+    )
+
+    for reply in replies:
+        result = reply.ok if reply.ok is not None else reply.err
+        rep = bridge_pb.OpenBridgeReply()
+        rep.ParseFromString(result.payload.to_bytes())
+        print("success:", rep.status.is_successful)
+        print("message:", rep.status.message)
+        print("error:", rep.status.error)
+        if rep.bridge_id:
+            print(f"bridge_id: {rep.bridge_id} ref_count={rep.ref_count}")
+
+
+def _open_many(z, reqs) -> None:
+    """
+    Open every bridge with one open_bridges query (one round trip).
+    """
+    batch = bridge_pb.OpenBridgesRequest()
+    batch.bridges.extend(reqs)
+    replies = z.get(
+        "backend/bridge_mgmt/open_bridges",
+        payload=batch.SerializeToString(),
+    )
+
+    for reply in replies:
+        result = reply.ok if reply.ok is not None else reply.err
+        rep = bridge_pb.OpenBridgesReply()
+        rep.ParseFromString(result.payload.to_bytes())
+        print("success:", rep.status.is_successful)
+        print("message:", rep.status.message)
+        print("error:", rep.status.error)
+        for req, bridge_id in zip(reqs, rep.bridge_ids):
+            print(f"bridge_id: {bridge_id} topic={req.outbound_topic}")
+
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--zenoh-endpoint", required=True)
-    parser.add_argument("--topic", required=True)
-    parser.add_argument("--type", required=True, choices=["imu", "dwm"])
+    parser.add_argument("--topic", required=True, action="append", help="Repeat with --type to open several bridges in one query")
+    parser.add_argument("--type", required=True, action="append", choices=sensor_names())
+    parser.add_argument("--mode", default="periodic", choices=["periodic", "on_change"])
+    parser.add_argument("--codec", default="json", choices=["json", "protobuf"])
+    parser.add_argument(
+        "--priority",
+        default="default",
+        choices=["default", "real_time", "interactive_high", "interactive_low", "data_high", "data", "data_low", "background"],
+    )
+    parser.add_argument("--express", action="store_true", help="Disable Zenoh batching for this bridge")
+    parser.add_argument("--congestion", default="default", choices=["default", "drop", "block"])
+    parser.add_argument("--batch-samples", type=int, default=0, help="Samples per batched frame (0 = no limit)")
+    parser.add_argument("--batch-ms", type=int, default=0, help="Max milliseconds of samples per batched frame")
+    parser.add_argument("--rate-hz", type=float, default=0.0, help="Publish rate (0 = backend default)")
+    parser.add_argument("--decimation", type=int, default=1, help="Publish every Nth sample")
+    parser.add_argument("--deadband-m", type=float, default=0.0, help="Min DWM position change to publish")
+    parser.add_argument("--deadband-rad", type=float, default=0.0, help="Min IMU rotation to publish")
+    parser.add_argument(
+        "--stage",
+        action="append",
+        default=[],
+        type=parse_stage,
+        help='Pipeline stage, repeatable and applied in order, e.g. "outlier_gate:max_jump=0.5" "ema:alpha=0.3"',
+    )
+    parser.add_argument(
+        "--stale-policy",
+        default="publish",
+        choices=["publish", "suppress", "mark"],
+        help="While the source sensor is stalled or restarting: publish anyway, publish nothing, or flag frames stale",
+    )
     args = parser.parse_args()
+    if len(args.topic) != len(args.type):
+        parser.error("--topic and --type must be given the same number of times")
 
     config = zenoh.Config()
     config.insert_json5("connect/endpoints", f'["{args.zenoh_endpoint}"]')
     z = zenoh.open(config)
 
-    req = bridge_pb.OpenBridgeRequest()
-    req.outbound_topic = args.topic
-    req.message_type = bridge_pb.IMU if args.type == "imu" else bridge_pb.DWM
+    reqs = []
+    for topic, sensor in zip(args.topic, args.type):
+        req = bridge_pb.OpenBridgeRequest()
+        req.outbound_topic = topic
+        req.message_type = get_driver(sensor).proto_type
+        req.publish_mode = bridge_pb.PUBLISH_ON_CHANGE if args.mode == "on_change" else bridge_pb.PUBLISH_PERIODIC
+        req.codec = bridge_pb.CODEC_PROTOBUF if args.codec == "protobuf" else bridge_pb.CODEC_JSON
+        req.qos.priority = bridge_pb.BridgePriority.Value(f"BRIDGE_PRIORITY_{args.priority.upper()}")
+        req.qos.express = args.express
+        req.qos.congestion_control = bridge_pb.BridgeCongestionControl.Value(f"CONGESTION_{args.congestion.upper()}")
+        req.batch_max_samples = args.batch_samples
+        req.batch_max_ms = args.batch_ms
+        req.rate_hz = args.rate_hz
+        req.decimation = args.decimation
+        req.deadband_m = args.deadband_m
+        req.deadband_rad = args.deadband_rad
+        req.stages.extend(args.stage)
+        req.stale_policy = bridge_pb.BridgeStalePolicy.Value(f"STALE_{args.stale_policy.upper()}")
+        reqs.append(req)
 
-    replies = z.get(
-        "backend/bridge_mgmt/open_bridge",
-        payload=req.SerializeToString(),
-    )
-
-    for reply in replies:
-        if reply.ok is not None:
-            rep = service_reply_pb.ServiceReply()
-            rep.ParseFromString(reply.ok.payload.to_bytes())
-            print("success:", rep.is_successful)
-            print("message:", rep.message)
-            print("error:", rep.error)
-        else:
-            print("Received error reply")
+    if len(reqs) == 1:
+        _open_one(z, reqs[0])
+    else:
+        _open_many(z, reqs)
 
     z.close()
 
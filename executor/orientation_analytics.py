@@ -0,0 +1,145 @@
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from constants import STABILITY_MAX_RATE_RAD_S, STABILITY_MAX_SPREAD_RAD
+from ring_buffer import RingWindow
+
+# Every function takes quaternions as an (n, 4) array of (i, j, k, w) rows,
+# the IMU column order, e.g. SharedState.history("imu").last(k).values.
+
+
+def normalize(quats: np.ndarray) -> np.ndarray:
+    quats = np.asarray(quats, dtype=np.float64)
+    return quats / np.linalg.norm(quats, axis=-1, keepdims=True)
+
+
+def conjugate(quats: np.ndarray) -> np.ndarray:
+    out = np.array(quats, dtype=np.float64)
+    out[..., :3] *= -1.0
+    return out
+
+
+def multiply(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Hamilton product p * q, broadcast over leading dimensions.
+    """
+    p = np.asarray(p, dtype=np.float64)
+    q = np.asarray(q, dtype=np.float64)
+    pv, pw = p[..., :3], p[..., 3:]
+    qv, qw = q[..., :3], q[..., 3:]
+    v = pw * qv + qw * pv + np.cross(pv, qv)
+    w = pw * qw - np.sum(pv * qv, axis=-1, keepdims=True)
+    return np.concatenate([v, w], axis=-1)
+
+
+def angular_distance(quats: np.ndarray, reference: Sequence[float]) -> np.ndarray:
+    """
+    Rotation angle (rad, 0..pi) between each quaternion and reference.
+    """
+    dot = np.abs(normalize(quats) @ normalize(np.asarray(reference, dtype=np.float64)))
+    return 2.0 * np.arccos(np.clip(dot, 0.0, 1.0))
+
+
+def angular_velocity(ts: np.ndarray, quats: np.ndarray) -> np.ndarray:
+    """
+    Body-frame angular velocity (rad/s) between consecutive samples, (n-1, 3).
+
+    Pairs with a non-positive time step give zero.
+    """
+    quats = normalize(quats)
+    delta = multiply(conjugate(quats[:-1]), quats[1:])
+    # q and -q are the same rotation; take the short way round.
+    delta *= np.where(delta[:, 3:] < 0.0, -1.0, 1.0)
+    vec_norm = np.linalg.norm(delta[:, :3], axis=1)
+    angle = 2.0 * np.arctan2(vec_norm, delta[:, 3])
+    dt = np.diff(np.asarray(ts, dtype=np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where((vec_norm > 0.0) & (dt > 0.0), angle / (vec_norm * dt), 0.0)
+    return delta[:, :3] * scale[:, None]
+
+
+def angular_speed(ts: np.ndarray, quats: np.ndarray) -> np.ndarray:
+    """
+    Magnitude of angular_velocity (rad/s), (n-1,).
+    """
+    return np.linalg.norm(angular_velocity(ts, quats), axis=1)
+
+
+def euler_zyx(quats: np.ndarray) -> np.ndarray:
+    """
+    (roll, pitch, yaw) in radians per row, ZYX (yaw-pitch-roll) convention.
+    """
+    q = normalize(quats)
+    x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    roll = np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+    pitch = np.arcsin(np.clip(2.0 * (w * y - z * x), -1.0, 1.0))
+    yaw = np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+    return np.stack([roll, pitch, yaw], axis=1)
+
+
+def mean_orientation(quats: np.ndarray) -> np.ndarray:
+    """
+    Normalized average after flipping every row into the first row's
+    hemisphere. Accurate for the small spreads of a stability window.
+    """
+    quats = normalize(quats)
+    signs = np.where(quats @ quats[0] < 0.0, -1.0, 1.0)
+    mean = np.sum(quats * signs[:, None], axis=0)
+    return mean / np.linalg.norm(mean)
+
+
+class OrientationStats(NamedTuple):
+    """
+    Summary of a window of IMU orientation samples.
+
+    - samples: number of samples in the window
+    - mean: mean orientation (i, j, k, w)
+    - spread_rad: 90th percentile angular distance from mean
+    - drift_rad_s: rotation between the means of the window's two halves,
+      per second between their centres
+    - speed_p50 / speed_p90: median / 90th percentile sample-to-sample
+      angular speed (rad/s); includes sensor noise differentiated at the
+      sample rate
+    - stability: 1.0 = perfectly still, 0.0 = drifting at least
+      STABILITY_MAX_RATE_RAD_S or spread over STABILITY_MAX_SPREAD_RAD
+    """
+    samples: int
+    mean: np.ndarray
+    spread_rad: float
+    drift_rad_s: float
+    speed_p50: float
+    speed_p90: float
+    stability: float
+
+
+def analyze_window(
+    window: RingWindow,
+    *,
+    max_rate: float = STABILITY_MAX_RATE_RAD_S,
+    max_spread: float = STABILITY_MAX_SPREAD_RAD,
+) -> Optional[OrientationStats]:
+    """
+    Compute OrientationStats for a window of IMU samples.
+
+    The stability score is built from averaged quantities (half-window
+    drift and p90 spread) rather than sample-to-sample speed, so sensor
+    noise at high IMU rates and single outliers do not flip the decision.
+    Returns None for windows with fewer than two samples.
+    """
+    n = len(window)
+    if n < 2:
+        return None
+    ts, quats = window.ts, window.values
+    speed = angular_speed(ts, quats)
+    mean = mean_orientation(quats)
+    spread = float(np.percentile(angular_distance(quats, mean), 90))
+
+    half = n // 2
+    span = float(np.mean(ts[half:]) - np.mean(ts[:half]))
+    drift_angle = float(angular_distance(mean_orientation(quats[half:])[None, :], mean_orientation(quats[:half]))[0])
+    drift = drift_angle / span if span > 0 else 0.0
+
+    p50, p90 = (float(v) for v in np.percentile(speed, (50, 90)))
+    stability = max(0.0, 1.0 - drift / max_rate) * max(0.0, 1.0 - spread / max_spread)
+    return OrientationStats(n, mean, spread, drift, p50, p90, stability)
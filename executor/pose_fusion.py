@@ -0,0 +1,147 @@
+import math
+from collections import deque
+from typing import Deque, NamedTuple, Tuple
+
+from constants import FUSION_DELAY_MS, FUSION_IMU_HISTORY, FUSION_MAX_EXTRAPOLATION_SEC
+from message_types import MessageType
+from position_fields import position_xyz
+
+Quat = Tuple[float, float, float, float]
+Vec3 = Tuple[float, float, float]
+
+
+class Pose(NamedTuple):
+    """
+    Fused IMU orientation and DWM position at one timestamp.
+
+    position_age_s is how far past the last DWM fix the position was
+    dead-reckoned (0 when interpolated between fixes).
+    """
+    x_m: float
+    y_m: float
+    z_m: float
+    i: float
+    j: float
+    k: float
+    w: float
+    position_age_s: float
+
+
+def slerp(q0: Quat, q1: Quat, f: float) -> Quat:
+    """
+    Spherical linear interpolation from q0 (f=0) to q1 (f=1), (i, j, k, w).
+
+    Takes the short way round; nearly parallel quaternions fall back to a
+    normalized lerp.
+    """
+    dot = q0[0] * q1[0] + q0[1] * q1[1] + q0[2] * q1[2] + q0[3] * q1[3]
+    if dot < 0.0:
+        q1 = (-q1[0], -q1[1], -q1[2], -q1[3])
+        dot = -dot
+    if dot > 0.9995:
+        out = tuple(a + (b - a) * f for a, b in zip(q0, q1))
+        norm = math.sqrt(sum(c * c for c in out))
+        return tuple(c / norm for c in out)
+    theta = math.acos(dot)
+    sin_theta = math.sin(theta)
+    a = math.sin((1.0 - f) * theta) / sin_theta
+    b = math.sin(f * theta) / sin_theta
+    return tuple(a * c0 + b * c1 for c0, c1 in zip(q0, q1))
+
+
+class PoseFusion:
+    """
+    Fuses the IMU and DWM streams in SharedState into a "pose" stream.
+
+    Runs as a state listener: each DWM sample is remembered as a position
+    fix, and each IMU sample emits one Pose at the IMU rate for the common
+    timestamp t = IMU read_ns - delay. Orientation at t is slerped between
+    the bracketing IMU samples; position at t is interpolated between the
+    last two DWM fixes or, past the newest fix, dead-reckoned with their
+    constant velocity for at most max_extrapolation_sec. With delay 0 the
+    orientation is the newest IMU sample and the position is extrapolated;
+    a delay of about one DWM period trades latency for interpolation.
+
+    The pose is written with read_ns = t, so bridges on "pose" carry the
+    fused sample's own time in their frame metadata.
+    """
+
+    def __init__(
+        self,
+        state,
+        *,
+        delay_ms: float = FUSION_DELAY_MS,
+        max_extrapolation_sec: float = FUSION_MAX_EXTRAPOLATION_SEC,
+    ):
+        self.state = state
+        self._delay_ns = int(delay_ms * 1e6)
+        self._max_extrapolation_ns = int(max_extrapolation_sec * 1e9)
+        # Appended from the IMU / DWM writer threads; deque appends are atomic.
+        self._imu: Deque[Tuple[int, Quat]] = deque(maxlen=FUSION_IMU_HISTORY)
+        self._fixes: Deque[Tuple[int, Vec3]] = deque(maxlen=2)
+        self._started = False
+        self.poses = 0
+
+    def start(self) -> None:
+        if not self._started:
+            self.state.add_listener(self._on_update)
+            self._started = True
+            print(f"[FUSION] Publishing pose (delay={self._delay_ns / 1e6:g} ms)")
+
+    def stop(self) -> None:
+        if self._started:
+            self.state.remove_listener(self._on_update)
+            self._started = False
+
+    def _on_update(self, sensor: str, seq: int) -> None:
+        if sensor == MessageType.DWM:
+            sample = self.state.latest(sensor)
+            row = position_xyz(sample.value) if sample.value is not None else None
+            if row is not None:
+                self._fixes.append((sample.read_ns, row))
+            return
+        if sensor != MessageType.IMU:
+            return
+
+        sample = self.state.latest(sensor)
+        if sample.value is None:
+            return
+        self._imu.append((sample.read_ns, tuple(sample.value)))
+        fixes = tuple(self._fixes)
+        if not fixes:
+            return
+
+        t = sample.read_ns - self._delay_ns
+        quat = self._orientation_at(t)
+        pos, age_ns = self._position_at(t, fixes)
+        self.state.update(MessageType.POSE.value, Pose(*pos, *quat, age_ns / 1e9), t)
+        self.poses += 1
+
+    def _orientation_at(self, t: int) -> Quat:
+        imu = self._imu
+        newest_ns, newest = imu[-1]
+        if t >= newest_ns:
+            return newest
+        later_ns, later = newest_ns, newest
+        for ns, quat in reversed(imu):
+            if ns <= t:
+                span = later_ns - ns
+                return slerp(quat, later, (t - ns) / span) if span > 0 else later
+            later_ns, later = ns, quat
+        return later
+
+    def _position_at(self, t: int, fixes: Tuple[Tuple[int, Vec3], ...]) -> Tuple[Vec3, int]:
+        last_ns, last = fixes[-1]
+        age_ns = t - last_ns
+        if len(fixes) < 2:
+            return last, max(0, age_ns)
+
+        prev_ns, prev = fixes[0]
+        span = last_ns - prev_ns
+        if span <= 0 or span > self._max_extrapolation_ns:
+            # Too far apart for a meaningful velocity: hold the last fix.
+            return last, max(0, age_ns)
+
+        dt = max(-span, min(age_ns, self._max_extrapolation_ns)) / span
+        pos = tuple(b + (b - a) * dt for a, b in zip(prev, last))
+        return pos, max(0, age_ns)
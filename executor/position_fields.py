@@ -0,0 +1,49 @@
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+# Attribute names DWM position objects may expose, in output order
+POSITION_ATTRS = ("x_m", "y_m", "z_m", "x", "y", "z")
+
+PositionExtractor = Callable[[Any], Tuple[Tuple[str, float], ...]]
+
+_extractors: Dict[type, PositionExtractor] = {}
+
+
+class PositionXYZ(NamedTuple):
+    """
+    Plain DWM position, used where only x/y/z are stored (e.g. shared memory).
+    """
+    x_m: float
+    y_m: float
+    z_m: float
+
+
+def position_extractor(pos: Any) -> PositionExtractor:
+    """
+    Return a cached function that pulls (name, value) pairs out of pos.
+
+    The attribute probe runs once per position class instead of on every
+    sample. Returns an extractor yielding () if pos has no known fields.
+    """
+    cls = type(pos)
+    extractor = _extractors.get(cls)
+    if extractor is None:
+        names = tuple(name for name in POSITION_ATTRS if hasattr(pos, name))
+
+        def extractor(p: Any, _names: Tuple[str, ...] = names) -> Tuple[Tuple[str, float], ...]:
+            return tuple((name, float(getattr(p, name))) for name in _names)
+
+        _extractors[cls] = extractor
+    return extractor
+
+
+def position_xyz(pos: Any) -> Optional[Tuple[float, float, float]]:
+    """
+    Return (x_m, y_m, z_m) for pos, or None if it has no known fields.
+    """
+    fields = position_extractor(pos)(pos)
+    if not fields:
+        return None
+    xyz = [0.0, 0.0, 0.0]
+    for name, value in fields:
+        xyz["xyz".index(name[0])] = value
+    return xyz[0], xyz[1], xyz[2]
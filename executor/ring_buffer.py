@@ -0,0 +1,89 @@
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+
+class RingWindow(NamedTuple):
+    """
+    Views onto a run of consecutive samples, oldest first.
+
+    ts is (n,), seq is (n,), values is (n, width).
+    """
+    ts: np.ndarray
+    seq: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+class SampleRing:
+    """
+    Fixed-size history of the last `capacity` samples of one sensor.
+
+    Storage is preallocated once and mirrored: every sample is written to
+    slot i and slot i + capacity of arrays twice the capacity, so the last
+    k samples are always one contiguous slice. last() and since() therefore
+    return zero-copy views with no per-call allocation beyond the view
+    objects themselves.
+
+    Single writer, many readers. The sample count is bumped only after a
+    sample is fully written, so readers never see a half-written newest
+    sample. Views alias the live buffer: a view covering k samples stays
+    valid for capacity - k further appends; copy() it to keep it longer.
+    """
+
+    def __init__(self, capacity: int, width: int):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.width = width
+        self._ts = np.zeros(2 * capacity, dtype=np.float64)
+        self._seq = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.zeros((2 * capacity, width), dtype=np.float64)
+        self._count = 0
+
+    def append(self, ts: float, seq: int, value: Sequence[float]) -> None:
+        i = self._count % self.capacity
+        j = i + self.capacity
+        self._values[i] = value
+        self._values[j] = value
+        self._ts[i] = self._ts[j] = ts
+        self._seq[i] = self._seq[j] = seq
+        self._count += 1
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """
+        Number of samples ever appended.
+        """
+        return self._count
+
+    def last(self, k: int) -> RingWindow:
+        """
+        Views of the last k samples (fewer if the ring holds fewer).
+        """
+        count = self._count
+        n = max(0, min(k, count, self.capacity))
+        start = (count - n) % self.capacity
+        end = start + n
+        return RingWindow(self._ts[start:end], self._seq[start:end], self._values[start:end])
+
+    def since(self, t: float) -> RingWindow:
+        """
+        Views of all held samples with ts >= t.
+        """
+        window = self.last(self.capacity)
+        idx = int(np.searchsorted(window.ts, t, side="left"))
+        return RingWindow(window.ts[idx:], window.seq[idx:], window.values[idx:])
+
+    def after_seq(self, seq: int) -> RingWindow:
+        """
+        Views of all held samples with a sequence number greater than seq.
+        """
+        window = self.last(self.capacity)
+        idx = int(np.searchsorted(window.seq, seq, side="right"))
+        return RingWindow(window.ts[idx:], window.seq[idx:], window.values[idx:])
@@ -0,0 +1,355 @@
+import os
+import struct
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from constants import RECORDER_CHUNK_RECORDS, RECORDER_FLUSH_SEC, RECORDER_QUEUE_SIZE
+from ring_buffer import RingWindow
+from sensor_drivers import get_driver, sensor_names
+from shared_state import Sample
+
+# ---- File format ----
+#
+# <log>      header (HEADER_SIZE bytes) followed by fixed-size records
+# <log>.idx  one IndexEntry per completed chunk of chunk_records records
+#
+# Both files are append-only; a torn final record is ignored on open.
+# Everything is little-endian, so records map straight onto RECORD_DTYPE.
+
+LOG_MAGIC = b"HRTLOG1\0"
+LOG_VERSION = 2
+HEADER_SIZE = 1024
+MAX_VALUES = 8
+MAX_SENSORS = 30
+
+# magic, version, header size, record size, chunk records, sensor count, created ts
+_HEADER = struct.Struct("<8sIIIII4xd")
+# sensor name, value width
+_SENSOR_ENTRY = struct.Struct("<24sI4x")
+
+RECORD_DTYPE = np.dtype([
+    ("sensor", "<u2"),  # index into the header's sensor table
+    ("width", "<u2"),  # used entries of values
+    ("seq", "<u8"),  # per-sensor SharedState seq
+    ("ts", "<f8"),  # wall-clock store time
+    ("read_ns", "<i8"),  # monotonic sensor read time
+    ("values", "<f8", (MAX_VALUES,)),
+], align=True)
+
+INDEX_DTYPE = np.dtype([
+    ("first_record", "<u8"),
+    ("count", "<u4"),
+    ("min_ts", "<f8"),
+    ("max_ts", "<f8"),
+], align=True)
+
+
+def _index_path(path: str) -> str:
+    return path + ".idx"
+
+
+def _write_header(f, sensors: List[Tuple[str, int]], chunk_records: int) -> None:
+    header = bytearray(HEADER_SIZE)
+    _HEADER.pack_into(
+        header, 0, LOG_MAGIC, LOG_VERSION, HEADER_SIZE, RECORD_DTYPE.itemsize,
+        chunk_records, len(sensors), time.time(),
+    )
+    offset = _HEADER.size
+    for name, width in sensors:
+        _SENSOR_ENTRY.pack_into(header, offset, name.encode(), width)
+        offset += _SENSOR_ENTRY.size
+    f.write(header)
+
+
+class SampleRecorder:
+    """
+    Records SharedState updates to a SampleLog file without slowing writers.
+
+    The state listener only appends (sensor, Sample) to a bounded deque, a
+    couple of GIL-atomic operations; when the deque is full the sample is
+    counted in dropped instead of blocking. If the notified sample is not
+    the one after the last recorded seq (listeners of a SharedMemoryState
+    are fired by a polling thread and can skip samples), the missing
+    samples are taken from the sensor's history ring, or counted in
+    dropped when the state keeps no history. A background thread wakes every
+    RECORDER_FLUSH_SEC, converts the queued samples into one NumPy record
+    block and appends it with a single write, adding an index entry each
+    time chunk_records records complete a chunk.
+    """
+
+    def __init__(
+        self,
+        state,
+        path: str,
+        *,
+        sensors: Optional[Iterable[str]] = None,
+        queue_size: int = RECORDER_QUEUE_SIZE,
+        chunk_records: int = RECORDER_CHUNK_RECORDS,
+    ):
+        names = tuple(sensors) if sensors is not None else sensor_names()
+        if len(names) > MAX_SENSORS:
+            raise ValueError(f"At most {MAX_SENSORS} sensors per log, got {len(names)}")
+        self._drivers = [get_driver(name) for name in names]
+        for driver in self._drivers:
+            if driver.width > MAX_VALUES:
+                raise ValueError(f"Sensor {driver.name} has {driver.width} columns; logs hold {MAX_VALUES}")
+        self._sensor_ids = {driver.name: i for i, driver in enumerate(self._drivers)}
+
+        self.state = state
+        self.path = path
+        self.queue_size = queue_size
+        self.chunk_records = chunk_records
+
+        # (sensor_id, Sample, row): row is None for a live Sample, or the
+        # history ring row of a sample recovered after a seq gap.
+        self._queue: Deque[Tuple[int, object, Optional[tuple]]] = deque()
+        self._last_seq: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._index_file = None
+        self._chunk_ts: List[float] = []  # ts of records in the open chunk
+
+        self.records = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._file = open(self.path, "wb")
+        self._index_file = open(_index_path(self.path), "wb")
+        _write_header(self._file, [(d.name, d.width) for d in self._drivers], self.chunk_records)
+        self._file.flush()
+
+        self._last_seq = {driver.name: self.state.seq(driver.name) for driver in self._drivers}
+        self._thread = threading.Thread(target=self._run, name="sample-recorder", daemon=True)
+        self._thread.start()
+        self.state.add_listener(self._on_update)
+        print(f"[RECORDER] Recording {','.join(self._sensor_ids)} to {self.path}")
+
+    def stop(self) -> None:
+        """
+        Detach from the state, write everything still queued and close the files.
+        """
+        if self._thread is None:
+            return
+        self.state.remove_listener(self._on_update)
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._file.close()
+        self._index_file.close()
+        print(f"[RECORDER] Stopped: records={self.records} dropped={self.dropped}")
+
+    def _on_update(self, sensor: str, seq: int) -> None:
+        sensor_id = self._sensor_ids.get(sensor)
+        if sensor_id is None:
+            return
+        sample = self.state.latest(sensor)
+        last_seq = self._last_seq[sensor]
+        if sample.seq <= last_seq:
+            return
+        self._last_seq[sensor] = sample.seq
+        if sample.seq > last_seq + 1:
+            self._recover_gap(sensor_id, sensor, last_seq, sample.seq)
+        if len(self._queue) >= self.queue_size:
+            self.dropped += 1
+            return
+        self._queue.append((sensor_id, sample, None))
+
+    def _recover_gap(self, sensor_id: int, sensor: str, last_seq: int, seq: int) -> None:
+        """
+        Queue the samples between last_seq and seq from the history ring;
+        whatever the ring no longer holds is counted in dropped.
+        """
+        missing = seq - last_seq - 1
+        ring = self.state.history(sensor)
+        if ring is not None:
+            window = ring.after_seq(last_seq)
+            for ts, s, row in zip(window.ts.tolist(), window.seq.tolist(), window.values.tolist()):
+                if s >= seq:
+                    break
+                if len(self._queue) >= self.queue_size:
+                    break
+                self._queue.append((sensor_id, Sample(None, ts, s), tuple(row)))
+                missing -= 1
+        self.dropped += missing
+
+    def _run(self) -> None:
+        while not self._stop.wait(RECORDER_FLUSH_SEC):
+            self._drain()
+        self._drain()
+
+    def _drain(self) -> None:
+        queue = self._queue
+        n = len(queue)
+        if n == 0:
+            return
+        ids, seqs, ts, read_ns, values = [], [], [], [], []
+        pad = (0.0,) * MAX_VALUES
+        for _ in range(n):
+            sensor_id, sample, row = queue.popleft()
+            if row is None and sample.value is not None:
+                row = self._drivers[sensor_id].to_row(sample.value)
+            if row is None:
+                continue
+            ids.append(sensor_id)
+            seqs.append(sample.seq)
+            ts.append(sample.ts)
+            read_ns.append(sample.read_ns)
+            values.append(tuple(row) + pad[len(row):])
+        if not ids:
+            return
+
+        block = np.zeros(len(ids), dtype=RECORD_DTYPE)
+        block["sensor"] = ids
+        block["width"] = [self._drivers[i].width for i in ids]
+        block["seq"] = seqs
+        block["ts"] = ts
+        block["read_ns"] = read_ns
+        block["values"] = values
+        self._file.write(block.tobytes())
+        self._file.flush()
+        self._index_chunks(block["ts"])
+        self.records += len(block)
+
+    def _index_chunks(self, ts: np.ndarray) -> None:
+        pending = self._chunk_ts
+        pending.extend(ts.tolist())
+        while len(pending) >= self.chunk_records:
+            chunk = pending[:self.chunk_records]
+            del pending[:self.chunk_records]
+            entry = np.zeros(1, dtype=INDEX_DTYPE)
+            entry["first_record"] = self.records + len(ts) - len(pending) - self.chunk_records
+            entry["count"] = self.chunk_records
+            entry["min_ts"] = min(chunk)
+            entry["max_ts"] = max(chunk)
+            self._index_file.write(entry.tobytes())
+        self._index_file.flush()
+
+
+class SampleLog:
+    """
+    Read-only view of a recorded log.
+
+    records is an np.memmap over the whole file with RECORD_DTYPE, so
+    opening costs one header read regardless of log size. index holds one
+    INDEX_DTYPE row per completed chunk (rebuilt from the records if the
+    .idx file is missing).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path}: truncated header")
+        magic, version, header_size, record_size, chunk_records, count, created_ts = _HEADER.unpack_from(header)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f"{path}: not a sample log (magic={magic!r}, version={version})")
+        if record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{path}: record size {record_size} != {RECORD_DTYPE.itemsize}")
+
+        self.chunk_records = chunk_records
+        self.created_ts = created_ts
+        self.sensors: List[Tuple[str, int]] = []
+        for i in range(count):
+            name, width = _SENSOR_ENTRY.unpack_from(header, _HEADER.size + i * _SENSOR_ENTRY.size)
+            self.sensors.append((name.rstrip(b"\0").decode(), width))
+        self._sensor_ids: Dict[str, int] = {name: i for i, (name, _) in enumerate(self.sensors)}
+
+        n = (os.path.getsize(path) - header_size) // record_size
+        if n > 0:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=header_size, shape=(n,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        self.index = self._load_index()
+
+    def _load_index(self) -> np.ndarray:
+        idx_path = _index_path(self.path)
+        if os.path.exists(idx_path):
+            index = np.fromfile(idx_path, dtype=INDEX_DTYPE)
+            return index[index["first_record"] + index["count"] <= len(self.records)]
+        n_chunks = len(self.records) // self.chunk_records
+        index = np.zeros(n_chunks, dtype=INDEX_DTYPE)
+        for i in range(n_chunks):
+            ts = self.records["ts"][i * self.chunk_records:(i + 1) * self.chunk_records]
+            index[i] = (i * self.chunk_records, self.chunk_records, ts.min(), ts.max())
+        return index
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def sensor_names(self) -> Tuple[str, ...]:
+        return tuple(self._sensor_ids)
+
+    def seek(self, ts: float) -> int:
+        """
+        Index of the first record that could have ts >= the given time.
+
+        Uses the chunk index to skip whole chunks; records within a chunk
+        are in arrival order, so callers should still compare ts.
+        """
+        index = self.index
+        chunk = int(np.searchsorted(index["max_ts"], ts, side="left")) if len(index) else 0
+        if chunk < len(index):
+            return int(index["first_record"][chunk])
+        return int(index["first_record"][-1] + index["count"][-1]) if len(index) else 0
+
+    def stream(self, sensor: str, start: int = 0, stop: Optional[int] = None) -> RingWindow:
+        """
+        ts / seq / values (n, width) of one sensor's records in [start, stop).
+
+        Copies the selected rows out of the memmap.
+        """
+        sensor_id = self._sensor_ids.get(sensor)
+        if sensor_id is None:
+            raise ValueError(f"Sensor {sensor} is not in {self.path}")
+        width = self.sensors[sensor_id][1]
+        records = self.records[start:stop]
+        rows = records[records["sensor"] == sensor_id]
+        return RingWindow(rows["ts"], rows["seq"].astype(np.int64), rows["values"][:, :width])
+
+    def to_npz(self, path: str) -> None:
+        """
+        Export per-sensor arrays (<name>_ts, _seq, _read_ns, _values) to .npz.
+        """
+        arrays = {}
+        for sensor_id, (name, width) in enumerate(self.sensors):
+            rows = self.records[self.records["sensor"] == sensor_id]
+            arrays[f"{name}_ts"] = rows["ts"]
+            arrays[f"{name}_seq"] = rows["seq"]
+            arrays[f"{name}_read_ns"] = rows["read_ns"]
+            arrays[f"{name}_values"] = rows["values"][:, :width]
+        np.savez(path, **arrays)
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or export a recorded sample log")
+    parser.add_argument("log")
+    parser.add_argument("--npz", default=None, help="Export to this .npz file")
+    args = parser.parse_args()
+
+    log = SampleLog(args.log)
+    print(f"{args.log}: {len(log)} records, {len(log.index)} indexed chunks")
+    for name, _ in log.sensors:
+        window = log.stream(name)
+        if len(window):
+            span = window.ts[-1] - window.ts[0]
+            rate = (len(window) - 1) / span if span > 0 else 0.0
+            print(f"  {name}: {len(window)} samples over {span:.1f}s ({rate:.1f} Hz)")
+        else:
+            print(f"  {name}: no samples")
+    if args.npz:
+        log.to_npz(args.npz)
+        print(f"Exported to {args.npz}")
+
+
+if __name__ == "__main__":
+    main()
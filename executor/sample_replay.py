@@ -0,0 +1,109 @@
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from message_types import MessageType
+from sample_log import SampleLog
+from sensor_drivers import get_driver
+
+_BLOCK_RECORDS = 4096  # records converted from the memmap per step
+
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    """
+    Sample log playback settings.
+
+    - path: log written by SampleRecorder
+    - speed: playback rate multiplier (1.0 = real time, 0 = as fast as possible)
+    - start_ts: recorded wall-clock time to start from (None = start of log)
+    - loop: restart from start_ts at the end of the log instead of stopping
+    """
+    path: str
+    speed: float = 1.0
+    start_ts: Optional[float] = None
+    loop: bool = False
+
+    def __post_init__(self):
+        if self.speed < 0:
+            raise ValueError(f"speed must be non-negative, got {self.speed}")
+
+
+def replay_log(stop, state, config: ReplayConfig, sensors: Iterable[str], tag: str = "[REPLAY]") -> None:
+    """
+    Play the given sensors of a sample log into SharedState until stop is
+    set or the log ends (and loop is off).
+
+    Records are written in their recorded order, paced by their recorded
+    ts relative to the start point, with read_ns set to the time of the
+    write so latency is measured from playback. Every worker reading the
+    same log anchors at the same start point, so streams replayed by
+    separate workers keep their recorded relative timing.
+    """
+    log = SampleLog(config.path)
+    in_log = log.sensor_names()
+    drivers = {in_log.index(name): get_driver(name) for name in sensors if name in in_log}
+    if not drivers:
+        print(f"{tag} {config.path} has none of {','.join(sensors)}; nothing to replay")
+        return
+    wanted = np.array(sorted(drivers))
+
+    records = log.records
+    start = log.seek(config.start_ts) if config.start_ts is not None else 0
+    if start >= len(records):
+        print(f"{tag} Nothing in {config.path} after ts={config.start_ts}")
+        return
+    if config.start_ts is not None:
+        log_start = config.start_ts
+    else:
+        log_start = float(records["ts"][start:start + _BLOCK_RECORDS].min())
+
+    speed = config.speed
+    print(f"{tag} Replaying {','.join(d.name for d in drivers.values())} from {config.path} "
+          f"at {'max' if speed == 0 else f'{speed:g}x'}{' (loop)' if config.loop else ''}")
+
+    passes = 0
+    written = 0
+    while not stop.is_set():
+        wall_start = time.monotonic()
+        pass_written = 0
+        for block_start in range(start, len(records), _BLOCK_RECORDS):
+            block = records[block_start:block_start + _BLOCK_RECORDS]
+            mask = np.isin(block["sensor"], wanted) & (block["ts"] >= log_start)
+            rows = block[mask]
+            for sensor_id, ts, values in zip(rows["sensor"].tolist(), rows["ts"].tolist(), rows["values"].tolist()):
+                if speed:
+                    delay = wall_start + (ts - log_start) / speed - time.monotonic()
+                    if delay > 0 and stop.wait(delay):
+                        break
+                elif stop.is_set():
+                    break
+                driver = drivers[sensor_id]
+                state.update(driver.name, driver.from_row(values[:driver.width]), time.monotonic_ns())
+                pass_written += 1
+            if stop.is_set():
+                break
+
+        written += pass_written
+        passes += 1
+        if not config.loop or pass_written == 0:
+            break
+
+    print(f"{tag} Worker stopping (samples={written}, passes={passes})")
+
+
+def replay_imu_worker(stop, state, config: ReplayConfig) -> None:
+    """
+    Recorded stand-in for imu_worker: orientation, acceleration and gyro.
+    """
+    sensors = (MessageType.IMU.value, MessageType.IMU_ACCEL.value, MessageType.IMU_GYRO.value)
+    replay_log(stop, state, config, sensors, "[REPLAY_IMU]")
+
+
+def replay_dwm_worker(stop, state, config: ReplayConfig) -> None:
+    """
+    Recorded stand-in for dwm_worker.
+    """
+    replay_log(stop, state, config, (MessageType.DWM.value,), "[REPLAY_DWM]")
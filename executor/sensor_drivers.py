@@ -0,0 +1,201 @@
+import importlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import bridge_request_pb2 as bridge_pb
+
+from constants import DWM_STALL_SEC, IMU_STALL_SEC
+
+from message_types import MessageType, SensorSource
+from pose_fusion import Pose
+from position_fields import PositionXYZ, position_extractor, position_xyz
+
+
+@dataclass(frozen=True)
+class SensorDriver:
+    """
+    Everything the backend needs to know about one sensor type.
+
+    - name: SharedState slot name and bridge message type ("imu")
+    - proto_type: BridgeMessageType value used on the wire
+    - worker: "module:function" of the sensor worker, imported only when the
+      sensor is started, so its hardware libraries load on demand. Called as
+      worker(stop, state, *args). Empty if another sensor's worker feeds
+      this one (IMU acceleration and gyro come from the IMU worker).
+    - sim_worker: like worker, but a hardware-free simulated source
+    - replay_worker: like worker, but plays the sensor back from a sample log
+    - columns: numeric schema of one sample; also the protobuf field names
+      of proto_message / proto_batch and the JSON keys
+    - to_row: sensor value -> tuple matching columns (None if unusable)
+    - from_row: tuple -> sensor value (for states that store rows only)
+    - json_group: JSON key the columns are nested under, if any
+    - json_fields: optional override for single-sample JSON fields
+    - proto_message / proto_batch: position_pb2 message names
+    - deadband: "distance" or "rotation" (which bridge deadband applies)
+    - stall_sec: the supervisor treats the worker as stalled after this
+      long without a sample (0 = never)
+    - sources: sensors whose workers feed this stream, if not its own
+      (see source_sensors)
+    """
+    name: str
+    proto_type: int
+    worker: str
+    columns: Tuple[str, ...]
+    to_row: Callable[[Any], Optional[tuple]] = tuple
+    from_row: Callable[[tuple], Any] = tuple
+    json_group: Optional[str] = None
+    json_fields: Optional[Callable[[Any], dict]] = None
+    proto_message: str = ""
+    proto_batch: str = ""
+    deadband: Optional[str] = None
+    sim_worker: str = ""
+    replay_worker: str = ""
+    stall_sec: float = 0.0
+    sources: Tuple[str, ...] = ()
+
+    @property
+    def width(self) -> int:
+        return len(self.columns)
+
+    @property
+    def source_sensors(self) -> Tuple[str, ...]:
+        """
+        Supervised sensors this stream depends on; a bridge of this type
+        is stale when any of them is.
+        """
+        return self.sources or (self.name,)
+
+    def worker_path(self, source: SensorSource = SensorSource.HARDWARE) -> str:
+        path = {
+            SensorSource.HARDWARE: self.worker,
+            SensorSource.SIM: self.sim_worker,
+            SensorSource.REPLAY: self.replay_worker,
+        }[SensorSource(source)]
+        if not path:
+            raise ValueError(f"Sensor {self.name} has no {SensorSource(source).value} worker of its own")
+        return path
+
+    def load_worker(self, source: SensorSource = SensorSource.HARDWARE) -> Callable[..., None]:
+        module_name, func_name = self.worker_path(source).split(":")
+        return getattr(importlib.import_module(module_name), func_name)
+
+
+_DRIVERS: Dict[str, SensorDriver] = {}
+_BY_PROTO: Dict[int, SensorDriver] = {}
+
+
+def register_driver(driver: SensorDriver) -> SensorDriver:
+    """
+    Add a driver to the registry. Names and proto types must be unique.
+
+    Register before creating SharedState: state slots are allocated for
+    the drivers registered at that point, in registration order.
+    """
+    if driver.name in _DRIVERS:
+        raise ValueError(f"Sensor driver already registered: {driver.name}")
+    if driver.proto_type in _BY_PROTO:
+        raise ValueError(f"BridgeMessageType {driver.proto_type} already used by {_BY_PROTO[driver.proto_type].name}")
+    _DRIVERS[driver.name] = driver
+    _BY_PROTO[driver.proto_type] = driver
+    return driver
+
+
+def get_driver(name: Union[MessageType, str]) -> SensorDriver:
+    """
+    Look up a driver by name (MessageType members compare equal to their names).
+    """
+    try:
+        return _DRIVERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown sensor type: {name}") from None
+
+
+def driver_for_proto(proto_type: int) -> SensorDriver:
+    try:
+        return _BY_PROTO[proto_type]
+    except KeyError:
+        raise ValueError(f"Unknown BridgeMessageType: {proto_type}") from None
+
+
+def sensor_names() -> Tuple[str, ...]:
+    return tuple(_DRIVERS)
+
+
+def _dwm_json_fields(pos: Any) -> dict:
+    # Keep the position object's own attribute names (x/y/z or x_m/y_m/z_m).
+    fields = position_extractor(pos)(pos)
+    return dict(fields) if fields else {"raw": str(pos)}
+
+
+def _pose_json_fields(pose: Pose) -> dict:
+    return {
+        "pos": {"x_m": pose.x_m, "y_m": pose.y_m, "z_m": pose.z_m},
+        "quat": {"i": pose.i, "j": pose.j, "k": pose.k, "w": pose.w},
+        "position_age_s": pose.position_age_s,
+    }
+
+
+register_driver(SensorDriver(
+    name=MessageType.IMU.value,
+    proto_type=bridge_pb.IMU,
+    worker="imu_executor_test:imu_worker",
+    sim_worker="sim_sensors:sim_imu_worker",
+    replay_worker="sample_replay:replay_imu_worker",
+    columns=("i", "j", "k", "w"),
+    json_group="quat",
+    proto_message="Orientation",
+    proto_batch="OrientationBatch",
+    deadband="rotation",
+    stall_sec=IMU_STALL_SEC,
+))
+
+register_driver(SensorDriver(
+    name=MessageType.DWM.value,
+    proto_type=bridge_pb.DWM,
+    worker="dwm_executor_test:dwm_worker",
+    sim_worker="sim_sensors:sim_dwm_worker",
+    replay_worker="sample_replay:replay_dwm_worker",
+    columns=("x_m", "y_m", "z_m"),
+    to_row=position_xyz,
+    from_row=lambda row: PositionXYZ(*row),
+    json_fields=_dwm_json_fields,
+    proto_message="Position",
+    proto_batch="PositionBatch",
+    deadband="distance",
+    stall_sec=DWM_STALL_SEC,
+))
+
+register_driver(SensorDriver(
+    name=MessageType.IMU_ACCEL.value,
+    proto_type=bridge_pb.IMU_ACCEL,
+    worker="",
+    columns=("x", "y", "z"),
+    json_group="accel",
+    proto_message="Vector3",
+    proto_batch="Vector3Batch",
+    sources=(MessageType.IMU.value,),
+))
+
+register_driver(SensorDriver(
+    name=MessageType.IMU_GYRO.value,
+    proto_type=bridge_pb.IMU_GYRO,
+    worker="",
+    columns=("x", "y", "z"),
+    json_group="gyro",
+    proto_message="Vector3",
+    proto_batch="Vector3Batch",
+    sources=(MessageType.IMU.value,),
+))
+
+# Derived stream: written by pose_fusion.PoseFusion, not by a worker.
+register_driver(SensorDriver(
+    name=MessageType.POSE.value,
+    proto_type=bridge_pb.POSE,
+    worker="",
+    columns=Pose._fields,
+    from_row=lambda row: Pose(*row),
+    json_fields=_pose_json_fields,
+    proto_message="Pose",
+    proto_batch="PoseBatch",
+    sources=(MessageType.IMU.value, MessageType.DWM.value),
+))
@@ -0,0 +1,271 @@
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, Iterable, Optional
+
+from constants import (
+    SENSOR_PROCESS_JOIN_SEC,
+    SUPERVISOR_BACKOFF_INITIAL_SEC,
+    SUPERVISOR_BACKOFF_MAX_SEC,
+    SUPERVISOR_CHECK_SEC,
+    SUPERVISOR_START_GRACE_SEC,
+)
+
+
+class SensorHealth(str, Enum):
+    """
+    Supervised sensor state.
+
+    STARTING: worker (re)started, no sample yet
+    OK: samples arriving
+    STALE: no sample for longer than the sensor's stall timeout
+    FAILED: worker died or was stopped for stalling; waiting to restart
+    STOPPED: not running (shut down, or finished without restart)
+    """
+    STARTING = "starting"
+    OK = "ok"
+    STALE = "stale"
+    FAILED = "failed"
+    STOPPED = "stopped"
+
+
+class SensorStatus:
+    """
+    Health of one supervised sensor worker. Written by the supervisor,
+    read by anyone (single attribute reads are atomic).
+    """
+
+    def __init__(self, name: str, stall_sec: float, restart: bool):
+        self.name = name
+        self.stall_sec = stall_sec
+        self.restart = restart
+        self.health = SensorHealth.STARTING
+        self.since = time.monotonic()
+        self.restarts = 0
+        self.last_error = ""
+
+        self._attempt_stop: Optional[threading.Event] = None
+        self._process = None
+        self._spawn: Optional[Callable[[], object]] = None
+        self._started_at = time.monotonic()
+        self._last_seq = 0
+        self._last_change = 0.0
+        self._was_ok = False
+        self._backoff = SUPERVISOR_BACKOFF_INITIAL_SEC
+        self._respawn_at: Optional[float] = None
+
+    def _set(self, health: SensorHealth) -> None:
+        if health != self.health:
+            self.health = health
+            self.since = time.monotonic()
+
+    def _next_backoff(self) -> float:
+        """
+        Delay before the next restart: back to the initial delay after a
+        run that produced samples, doubling after runs that did not.
+        """
+        if self._was_ok:
+            self._backoff = SUPERVISOR_BACKOFF_INITIAL_SEC
+        delay = self._backoff
+        self._backoff = min(self._backoff * 2.0, SUPERVISOR_BACKOFF_MAX_SEC)
+        return delay
+
+
+class _AttemptStop:
+    """
+    Stop flag handed to one worker attempt: set by the global stop or by
+    the supervisor restarting this worker. Offers the Event methods
+    workers use (is_set, wait).
+    """
+    __slots__ = ("_stop", "_attempt")
+
+    def __init__(self, stop, attempt: threading.Event):
+        self._stop = stop
+        self._attempt = attempt
+
+    def is_set(self) -> bool:
+        return self._attempt.is_set() or self._stop.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._attempt.wait(timeout) or self._stop.is_set()
+
+
+class SensorSupervisor:
+    """
+    Keeps sensor workers running and reports their health.
+
+    A monitor thread polls each sensor's SharedState seq every
+    SUPERVISOR_CHECK_SEC. A sensor with no new sample for its stall_sec
+    (while starting, SUPERVISOR_START_GRACE_SEC if that is longer) is
+    marked STALE and, if restartable, its worker is stopped and started
+    again. A worker that raises or returns is restarted the same way after
+    an exponential backoff (SUPERVISOR_BACKOFF_INITIAL_SEC doubling to
+    SUPERVISOR_BACKOFF_MAX_SEC, reset once a run produces samples), so a
+    USB hiccup costs one short backoff rather than a manual restart.
+
+    Thread workers get a per-attempt stop flag and must poll it, as all
+    built-in workers do; a worker blocked forever inside a driver call
+    cannot be recovered in-process. Process workers are terminated and
+    respawned.
+    """
+
+    def __init__(self, state, stop):
+        self.state = state
+        self._stop = stop
+        self._sensors: Dict[str, SensorStatus] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- Registration ----
+
+    def _add(self, name: str, stall_sec: float, restart: bool) -> SensorStatus:
+        status = SensorStatus(name, stall_sec, restart)
+        status._last_seq = self.state.seq(name)
+        with self._lock:
+            self._sensors[name] = status
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._monitor, name="sensor-supervisor", daemon=True)
+                self._thread.start()
+        return status
+
+    def run_thread(self, name: str, worker: Callable[..., None], args: tuple, *, stall_sec: float, restart: bool) -> None:
+        """
+        Run worker(stop, state, *args) in the calling thread until the
+        global stop is set, restarting it on failure or stall if restart.
+        """
+        status = self._add(name, stall_sec, restart)
+        while not self._stop.is_set():
+            attempt = threading.Event()
+            status._attempt_stop = attempt
+            status._started_at = time.monotonic()
+            status._was_ok = False
+            status._set(SensorHealth.STARTING)
+
+            try:
+                worker(_AttemptStop(self._stop, attempt), self.state, *args)
+                error = "stalled" if attempt.is_set() else "worker returned"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            if self._stop.is_set():
+                break
+            if not restart and error == "worker returned":
+                break
+
+            status.last_error = error
+            status._set(SensorHealth.FAILED)
+            if not restart:
+                print(f"[SUPERVISOR] {name} failed: {error}")
+                return
+            delay = status._next_backoff()
+            print(f"[SUPERVISOR] {name} failed: {error}; restarting in {delay * 1000:.0f} ms")
+            if self._stop.wait(delay):
+                break
+            status.restarts += 1
+
+        status._set(SensorHealth.STOPPED)
+
+    def add_process(self, name: str, spawn: Callable[[], object], *, stall_sec: float, restart: bool) -> None:
+        """
+        Supervise a sensor process. spawn() starts a new process and
+        returns it; it is called now and for every restart.
+        """
+        status = self._add(name, stall_sec, restart)
+        status._spawn = spawn
+        status._process = spawn()
+
+    # ---- Queries ----
+
+    def status(self, name: str) -> Optional[SensorStatus]:
+        return self._sensors.get(name)
+
+    def statuses(self) -> Dict[str, SensorStatus]:
+        with self._lock:
+            return dict(self._sensors)
+
+    def is_stale(self, names: Iterable[str]) -> bool:
+        """
+        True if any of the named sensors is supervised and not OK.
+        """
+        sensors = self._sensors
+        for name in names:
+            status = sensors.get(name)
+            if status is not None and status.health != SensorHealth.OK:
+                return True
+        return False
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for the monitor thread to exit after the stop flag is set; no
+        process is respawned once this returns.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # ---- Monitor ----
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(SUPERVISOR_CHECK_SEC):
+            now = time.monotonic()
+            for status in self.statuses().values():
+                self._check(status, now)
+        # Wake any worker waiting on its attempt flag.
+        for status in self.statuses().values():
+            if status._attempt_stop is not None:
+                status._attempt_stop.set()
+
+    def _check(self, status: SensorStatus, now: float) -> None:
+        seq = self.state.seq(status.name)
+        if seq != status._last_seq:
+            status._last_seq = seq
+            status._last_change = now
+            status._was_ok = True
+            if status.health in (SensorHealth.STARTING, SensorHealth.STALE):
+                status._set(SensorHealth.OK)
+        elif status.stall_sec > 0 and status.health in (SensorHealth.STARTING, SensorHealth.OK):
+            if status.health == SensorHealth.STARTING:
+                stalled = now - status._started_at > max(SUPERVISOR_START_GRACE_SEC, status.stall_sec)
+            else:
+                stalled = now - status._last_change > status.stall_sec
+            if stalled:
+                status._set(SensorHealth.STALE)
+                print(f"[SUPERVISOR] {status.name} stale (no sample for {now - max(status._last_change, status._started_at):.2f}s)")
+                if status.restart and status._attempt_stop is not None:
+                    status._attempt_stop.set()
+                elif status.restart and status._process is not None:
+                    status._process.terminate()
+
+        if status._process is not None:
+            self._check_process(status, now)
+
+    def _check_process(self, status: SensorStatus, now: float) -> None:
+        proc = status._process
+        if status._respawn_at is not None:
+            if now >= status._respawn_at:
+                status._respawn_at = None
+                status._process = status._spawn()
+                status._started_at = now
+                status._was_ok = False
+                status.restarts += 1
+                status._set(SensorHealth.STARTING)
+            return
+        if proc.is_alive():
+            return
+
+        proc.join(SENSOR_PROCESS_JOIN_SEC)
+        error = "stalled" if status.health == SensorHealth.STALE else f"process exited with code {proc.exitcode}"
+        if not status.restart:
+            status._set(SensorHealth.STOPPED if proc.exitcode == 0 else SensorHealth.FAILED)
+            status._process = None
+            return
+        status.last_error = error
+        status._set(SensorHealth.FAILED)
+        delay = status._next_backoff()
+        status._respawn_at = now + delay
+        print(f"[SUPERVISOR] {status.name} failed: {error}; restarting in {delay * 1000:.0f} ms")
+
+    def process(self, name: str):
+        """
+        Current process of a supervised sensor process (None if not running).
+        """
+        status = self._sensors.get(name)
+        return status._process if status is not None else None
@@ -0,0 +1,241 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Type
+
+import zenoh
+from google.protobuf.message import DecodeError, Message
+
+from bridge_stats import LatencyHistogram
+from constants import SERVICE_MAX_IN_FLIGHT, SERVICE_MAX_PENDING, SERVICE_MAX_WORKERS
+from service_utils import make_service_reply
+
+# Called as handler(request) -> reply message; request is None for
+# methods declared without a request_type.
+ServiceHandler = Callable[[Optional[Message]], Message]
+
+
+class ServiceError(Exception):
+    """
+    Raised by a service handler to fail with a specific reply message and
+    error code (e.g. ServiceError("Task queue is full", "QueueFull")).
+    Any other exception fails with the method's failure message and str(e).
+    """
+
+    def __init__(self, message: str, error: str = ""):
+        super().__init__(message)
+        self.message = message
+        self.error = error
+
+
+class MethodStats:
+    """
+    Counters for one service method. in_flight counts queries admitted
+    but not yet replied to (queued or running).
+    """
+    __slots__ = ("calls", "errors", "rejected", "in_flight", "wait", "handle")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.wait = LatencyHistogram()  # admitted -> handler started
+        self.handle = LatencyHistogram()  # handler + reply
+
+    def to_proto(self, msg) -> None:
+        """
+        Fill a bridge_pb.ServiceMethodStats (name is set by the caller).
+        """
+        msg.calls = self.calls
+        msg.errors = self.errors
+        msg.rejected = self.rejected
+        msg.in_flight = self.in_flight
+        self.wait.to_proto(msg.wait_us)
+        self.handle.to_proto(msg.handle_us)
+
+
+class _Method:
+    __slots__ = ("key_expr", "name", "queryable", "handler", "request_type", "reply_type", "max_in_flight", "failure_message", "stats")
+
+    def __init__(self, key_expr, name, handler, request_type, reply_type, max_in_flight, failure_message):
+        self.key_expr = key_expr
+        self.name = name
+        self.queryable: Optional[zenoh.Queryable] = None
+        self.handler = handler
+        self.request_type = request_type
+        self.reply_type = reply_type
+        self.max_in_flight = max_in_flight
+        self.failure_message = failure_message
+        self.stats = MethodStats()
+
+
+class ServiceRuntime:
+    """
+    Runs Zenoh queryable handlers off Zenoh's callback threads.
+
+    The queryable callback only does admission control and hands the
+    query to a bounded worker pool, so a slow handler never delays other
+    queries or subscriber callbacks of the session. A query is rejected
+    at once with a "Busy" ServiceReply when its method already has
+    max_in_flight queries queued or running, or when max_pending queries
+    are outstanding across all methods.
+
+    Handlers take the parsed request and return the reply message; the
+    runtime serializes it and replies. Parse failures, ServiceError and
+    any other exception become error replies, so handlers carry no
+    try/except reply boilerplate. Per-method counts and wait / handle
+    latency are kept in MethodStats (see stats()).
+    """
+
+    def __init__(
+        self,
+        session: zenoh.Session,
+        *,
+        max_workers: int = SERVICE_MAX_WORKERS,
+        max_pending: int = SERVICE_MAX_PENDING,
+        name: str = "service",
+    ):
+        self._session = session
+        self._max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._methods: Dict[str, _Method] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    def declare(
+        self,
+        key_expr: str,
+        handler: ServiceHandler,
+        *,
+        request_type: Optional[Type[Message]] = None,
+        reply_type: Optional[Type[Message]] = None,
+        max_in_flight: int = SERVICE_MAX_IN_FLIGHT,
+        failure_message: str = "",
+    ) -> zenoh.Queryable:
+        """
+        Declare a queryable on key_expr served by handler.
+
+        request_type is parsed from the query payload (an empty payload
+        parses as the default message). Error replies are a ServiceReply,
+        wrapped in reply_type's status field when reply_type is given.
+        failure_message defaults to "Failed to <method>", the method being
+        the last key segment with "_" read as a space.
+        """
+        if key_expr in self._methods:
+            raise ValueError(f"Service method already declared: {key_expr}")
+        method_name = key_expr.rsplit("/", 1)[-1]
+        method = _Method(
+            key_expr,
+            method_name,
+            handler,
+            request_type,
+            reply_type,
+            max_in_flight,
+            failure_message or f"Failed to {method_name.replace('_', ' ')}",
+        )
+        method.queryable = self._session.declare_queryable(key_expr, lambda query: self._admit(method, query))
+        self._methods[key_expr] = method
+        return method.queryable
+
+    def stats(self) -> Dict[str, MethodStats]:
+        """
+        MethodStats of every declared method, keyed by key expression.
+        """
+        return {key: method.stats for key, method in list(self._methods.items())}
+
+    def undeclare(self, *key_exprs: str) -> None:
+        """
+        Undeclare the queryables on key_exprs (all of them if none are
+        given); queries already admitted still complete.
+        """
+        for key in key_exprs or list(self._methods):
+            method = self._methods.pop(key, None)
+            if method is not None:
+                method.queryable.undeclare()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.undeclare()
+        self._pool.shutdown(wait=wait)
+
+    # ---- Dispatch ----
+
+    def _admit(self, method: _Method, query: zenoh.Query) -> None:
+        """
+        Queryable callback, on a Zenoh thread: admit or reject, never block.
+        """
+        stats = method.stats
+        with self._lock:
+            busy = stats.in_flight >= method.max_in_flight or self._pending >= self._max_pending
+            if not busy:
+                stats.in_flight += 1
+                self._pending += 1
+        if busy:
+            with self._lock:
+                stats.rejected += 1
+            self._reply_error(method, query, f"{method.name} busy: {stats.in_flight} request(s) in flight", "Busy")
+            return
+        try:
+            self._pool.submit(self._serve, method, query, time.perf_counter_ns())
+        except RuntimeError:
+            # Pool already shut down.
+            self._release(stats)
+            self._reply_error(method, query, f"{method.name} is shutting down", "ShuttingDown")
+
+    def _serve(self, method: _Method, query: zenoh.Query, admitted_ns: int) -> None:
+        start = time.perf_counter_ns()
+        failed = True
+        try:
+            request = None
+            if method.request_type is not None:
+                request = method.request_type()
+                if query.payload is not None:
+                    request.ParseFromString(query.payload.to_bytes())
+            rep = method.handler(request)
+            query.reply(method.key_expr, payload=zenoh.ZBytes(rep.SerializeToString()))
+            failed = False
+        except DecodeError:
+            self._reply_error(method, query, f"Unable to parse {method.name} request", "DecodeError")
+        except ServiceError as e:
+            self._reply_error(method, query, e.message, e.error)
+        except Exception as e:
+            self._reply_error(method, query, method.failure_message, str(e))
+        finally:
+            end = time.perf_counter_ns()
+            stats = method.stats
+            # Workers finish concurrently; counters and histograms are not atomic.
+            with self._lock:
+                stats.calls += 1
+                stats.errors += failed
+                stats.wait.record(start - admitted_ns)
+                stats.handle.record(end - start)
+                stats.in_flight -= 1
+                self._pending -= 1
+
+    def _release(self, stats: MethodStats) -> None:
+        with self._lock:
+            stats.in_flight -= 1
+            self._pending -= 1
+
+    def _reply_error(self, method: _Method, query: zenoh.Query, message: str, error: str) -> None:
+        rep = make_service_reply(is_successful=False, message=message, error=error)
+        if method.reply_type is not None:
+            wrapped = method.reply_type()
+            wrapped.status.CopyFrom(rep)
+            rep = wrapped
+        try:
+            query.reply_err(payload=zenoh.ZBytes(rep.SerializeToString()))
+        except Exception as e:
+            print(f"[SERVICE] {method.name}: error reply failed: {e}")
+
+
+def method_stats_to_proto(runtime: ServiceRuntime, msgs) -> None:
+    """
+    Append one bridge_pb.ServiceMethodStats per method of runtime to the
+    repeated field msgs.
+    """
+    for key, stats in runtime.stats().items():
+        msg = msgs.add()
+        msg.name = key
+        stats.to_proto(msg)
+
@@ -1,11 +1,44 @@
-from dataclasses import dataclass
-from threading import Lock
-from typing import Optional, Tuple, Any
+from dataclasses import dataclass, field
+from threading import Condition, Lock
+from typing import Any, Callable, Dict, Optional, Tuple
 import time
 
+from constants import SENSOR_HISTORY_LEN
+from sensor_drivers import SensorDriver, get_driver, sensor_names
+
 # Quaternion type alias (IMU orientation)
 Quat = Tuple[float, float, float, float]
 
+# Called as listener(sensor, seq) after every write
+UpdateListener = Callable[[str, int], None]
+
+
+class Sample:
+    """
+    One immutable sensor reading.
+
+    value is the sensor payload (quaternion for IMU, position object for
+    DWM), ts the wall-clock time it was stored, seq its per-sensor
+    sequence number (0 means "no sample yet") and read_ns the
+    time.monotonic_ns() at which the sensor produced it.
+    """
+    __slots__ = ("value", "ts", "seq", "read_ns")
+
+    def __init__(self, value: Any, ts: float, seq: int, read_ns: int = 0):
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "ts", ts)
+        object.__setattr__(self, "seq", seq)
+        object.__setattr__(self, "read_ns", read_ns)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Sample is immutable")
+
+    def __repr__(self) -> str:
+        return f"Sample(value={self.value!r}, ts={self.ts}, seq={self.seq}, read_ns={self.read_ns})"
+
+
+_EMPTY = Sample(None, 0.0, 0)
+
 
 @dataclass
 class SharedState:
@@ -14,43 +47,189 @@ class SharedState:
 
     All sensor threads write here.
     All consumers (tasks, Zenoh, logging) read from here.
+
+    Each sensor has its own slot holding an immutable Sample. A write
+    builds a new Sample and swaps the slot reference, so latest() readers
+    never take a lock and always see a value/ts/seq triple that belongs
+    together. Writers only serialize against writers of the same sensor.
+
+    Every write bumps the sensor's sequence number and wakes anyone
+    blocked in wait_for_update(), so consumers can react to new samples
+    instead of polling. Listeners registered with add_listener() are
+    called after each write, outside the lock.
+
+    There is one slot per driver registered in sensor_drivers when the
+    state is created. With history_len > 0 each sensor also keeps a NumPy
+    SampleRing of its last history_len samples; see history().
     """
     _lock: Lock
-    imu_quat: Optional[Quat] = None
-    imu_ts: float = 0.0
+    history_len: int = SENSOR_HISTORY_LEN
+
+    _drivers: Dict[str, SensorDriver] = field(init=False, repr=False)
+    _samples: Dict[str, Sample] = field(init=False, repr=False)
+    _history: Dict[str, Any] = field(init=False, repr=False)
+    _updated: Dict[str, Condition] = field(init=False, repr=False)
+    _listeners: Tuple[UpdateListener, ...] = field(default=(), init=False, repr=False)
 
-    dwm_pos: Optional[Any] = None
-    dwm_ts: float = 0.0
+    def __post_init__(self) -> None:
+        self._drivers = {name: get_driver(name) for name in sensor_names()}
+        self._samples = {name: _EMPTY for name in self._drivers}
+        self._updated = {name: Condition(Lock()) for name in self._drivers}
+        self._history = {}
+        if self.history_len > 0:
+            from ring_buffer import SampleRing
+
+            self._history = {
+                name: SampleRing(self.history_len, driver.width)
+                for name, driver in self._drivers.items()
+            }
 
-    def set_imu_quat(self, quat: Quat) -> None:
+    def set_imu_quat(self, quat: Quat, read_ns: Optional[int] = None) -> None:
         """
         Update the latest IMU quaternion.
 
-        Uses a lock to prevent race conditions when multiple
-        threads read/write simultaneously.
+        read_ns is the time.monotonic_ns() the driver read it at; defaults
+        to now.
         """
-        with self._lock:
-            self.imu_quat = quat
-            self.imu_ts = time.time()
+        self._store("imu", quat, read_ns)
 
-    def set_dwm_pos(self, pos: Any) -> None:
+    def set_dwm_pos(self, pos: Any, read_ns: Optional[int] = None) -> None:
         """
         Update the latest DWM position.
+
+        read_ns is the time.monotonic_ns() the driver read it at; defaults
+        to now.
+        """
+        self._store("dwm", pos, read_ns)
+
+    def update(self, sensor: str, value: Any, read_ns: Optional[int] = None) -> None:
+        """
+        Store a new value for any registered sensor.
+        """
+        if sensor not in self._samples:
+            raise ValueError(f"Unknown sensor: {sensor}")
+        self._store(sensor, value, read_ns)
+
+    def _store(self, sensor: str, value: Any, read_ns: Optional[int]) -> None:
+        if read_ns is None:
+            read_ns = time.monotonic_ns()
+        updated = self._updated[sensor]
+        with updated:
+            seq = self._samples[sensor].seq + 1
+            sample = Sample(value, time.time(), seq, read_ns)
+            ring = self._history.get(sensor)
+            if ring is not None:
+                row = self._drivers[sensor].to_row(value)
+                if row is not None:
+                    ring.append(sample.ts, seq, row)
+            self._samples[sensor] = sample
+            updated.notify_all()
+        self._notify_listeners(sensor, seq)
+
+    def latest(self, sensor: str) -> Sample:
+        """
+        Return the most recent Sample for sensor ("imu" or "dwm").
+
+        Lock-free: a single reference read of the sensor's slot.
         """
+        try:
+            return self._samples[sensor]
+        except KeyError:
+            raise ValueError(f"Unknown sensor: {sensor}") from None
+
+    def seq(self, sensor: str) -> int:
+        """
+        Return the current sequence number for sensor ("imu" or "dwm").
+
+        The sequence starts at 0 and increments once per stored sample.
+        """
+        return self.latest(sensor).seq
+
+    def history(self, sensor: str):
+        """
+        Return the SampleRing for sensor, or None if history is disabled.
+
+        Rows follow the sensor driver's columns: (i, j, k, w) for IMU and
+        (x_m, y_m, z_m) for DWM.
+        """
+        if sensor not in self._samples:
+            raise ValueError(f"Unknown sensor: {sensor}")
+        return self._history.get(sensor)
+
+    def wait_for_update(self, sensor: str, last_seq: int, timeout: Optional[float] = None) -> int:
+        """
+        Block until sensor has a sample newer than last_seq.
+
+        Returns the current sequence number. If timeout expires first the
+        returned value equals last_seq.
+        """
+        updated = self._updated.get(sensor)
+        if updated is None:
+            raise ValueError(f"Unknown sensor: {sensor}")
+        with updated:
+            updated.wait_for(lambda: self._samples[sensor].seq != last_seq, timeout)
+            return self._samples[sensor].seq
+
+    # ---- Compatibility accessors (pre-Sample attribute names) ----
+
+    @property
+    def imu_quat(self) -> Optional[Quat]:
+        return self._samples["imu"].value
+
+    @property
+    def imu_ts(self) -> float:
+        return self._samples["imu"].ts
+
+    @property
+    def imu_seq(self) -> int:
+        return self._samples["imu"].seq
+
+    @property
+    def dwm_pos(self) -> Optional[Any]:
+        return self._samples["dwm"].value
+
+    @property
+    def dwm_ts(self) -> float:
+        return self._samples["dwm"].ts
+
+    @property
+    def dwm_seq(self) -> int:
+        return self._samples["dwm"].seq
+
+    def add_listener(self, listener: UpdateListener) -> None:
+        """
+        Register listener(sensor, seq) to be called after every write.
+
+        Listeners run on the writing sensor thread and must be quick.
+        """
+        with self._lock:
+            self._listeners = self._listeners + (listener,)
+
+    def remove_listener(self, listener: UpdateListener) -> None:
         with self._lock:
-            self.dwm_pos = pos
-            self.dwm_ts = time.time()
+            self._listeners = tuple(l for l in self._listeners if l != listener)
+
+    def _notify_listeners(self, sensor: str, seq: int) -> None:
+        for listener in self._listeners:
+            try:
+                listener(sensor, seq)
+            except Exception as e:
+                print(f"[STATE] listener error sensor={sensor}: {e}")
 
     def snapshot(self) -> dict:
         """
-        Take an atomic snapshot of all shared state.
+        Compatibility wrapper returning all sensors as a dict.
 
-        This ensures consumers see a consistent view.
+        Each sensor's value/ts/seq are consistent with each other; the
+        sensors are read independently. Prefer latest() on hot paths.
         """
-        with self._lock:
-            return {
-                "imu_quat": self.imu_quat,
-                "imu_ts": self.imu_ts,
-                "dwm_pos": self.dwm_pos,
-                "dwm_ts": self.dwm_ts,
-            }
+        imu = self._samples["imu"]
+        dwm = self._samples["dwm"]
+        return {
+            "imu_quat": imu.value,
+            "imu_ts": imu.ts,
+            "imu_seq": imu.seq,
+            "dwm_pos": dwm.value,
+            "dwm_ts": dwm.ts,
+            "dwm_seq": dwm.seq,
+        }
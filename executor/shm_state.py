@@ -0,0 +1,330 @@
+import importlib
+import struct
+import time
+import uuid
+from multiprocessing import shared_memory
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Optional, Tuple
+
+from constants import SHM_POLL_SEC, SHM_READ_RETRIES
+from position_fields import PositionXYZ
+from sensor_drivers import get_driver, sensor_names
+from shared_state import Quat, Sample, UpdateListener
+
+_MAGIC = 0x53484D31  # "SHM1"
+_VERSION = 2
+
+# magic, version, sensor count, reserved
+_HEADER = struct.Struct("<IIII")
+# seqlock counter (odd while a write is in progress)
+_COUNTER = struct.Struct("<Q")
+_MAX_WIDTH = 8
+
+# seq, wall-clock ts, value count, _MAX_WIDTH value slots, monotonic read ns
+_BODY = struct.Struct(f"<QdI4x{_MAX_WIDTH}dq")
+_SLOT_SIZE = 128  # counter + body padded to two cache lines per sensor
+
+_EMPTY = Sample(None, 0.0, 0)
+
+# DWM values read back from shared memory
+ShmPosition = PositionXYZ
+
+
+class SharedMemoryState:
+    """
+    SharedState backend living in a named multiprocessing.shared_memory segment.
+
+    Lets sensor workers run in their own processes (one GIL each) while
+    BridgeManager and task processes read the latest samples zero-copy.
+
+    Layout: a 16-byte header followed by one 128-byte slot per registered
+    sensor driver, in registration order (drivers with at most 8 columns).
+    Values are stored as the driver's row and rebuilt with from_row().
+
+    Each slot is a seqlock: the writer bumps the counter to odd, writes
+    seq/ts/values/read_ns, then bumps it to even; readers retry if the
+    counter was odd or changed while they read, yielding between tries.
+    After SHM_READ_RETRIES failed tries (a writer killed mid-write) the
+    last good sample is returned. One writer per sensor.
+
+    Cross-process writes cannot signal a threading.Condition, so
+    wait_for_update() polls and listeners are driven by a watcher thread
+    polling every SHM_POLL_SEC. There is no ring-buffer history here;
+    history() returns None.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool):
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+        self._drivers = {name: get_driver(name) for name in sensor_names()}
+        for driver in self._drivers.values():
+            if driver.width > _MAX_WIDTH:
+                raise ValueError(f"Sensor {driver.name} has {driver.width} columns; shared memory slots hold {_MAX_WIDTH}")
+        self._offsets = {name: _HEADER.size + i * _SLOT_SIZE for i, name in enumerate(self._drivers)}
+        # sensor -> (counter, Sample) of the last decoded read
+        self._cache: Dict[str, Tuple[int, Sample]] = {name: (0, _EMPTY) for name in self._drivers}
+
+        self._lock = Lock()
+        self._listeners: Tuple[UpdateListener, ...] = ()
+        self._watch_stop = Event()
+        self._watcher: Optional[Thread] = None
+
+    @classmethod
+    def create(cls, name: Optional[str] = None) -> "SharedMemoryState":
+        """
+        Create and initialize a new segment. The creator unlinks it on close().
+        """
+        count = len(sensor_names())
+        size = _HEADER.size + count * _SLOT_SIZE
+        shm = shared_memory.SharedMemory(name=name or f"hrt_state_{uuid.uuid4().hex[:8]}", create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, count, 0)
+        try:
+            return cls(shm, owner=True)
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name: str, *, untrack: bool = True) -> "SharedMemoryState":
+        """
+        Attach to a segment created by another process.
+
+        untrack=False is for children spawned by the creator: they share its
+        resource_tracker, so unregistering there would drop the creator's
+        own registration.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        if untrack:
+            _untrack(shm)
+        magic, version, count, _ = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC or version != _VERSION or count != len(sensor_names()):
+            shm.close()
+            raise ValueError(f"Shared memory segment '{name}' has an incompatible layout")
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    # ---- Writers ----
+
+    def set_imu_quat(self, quat: Quat, read_ns: Optional[int] = None) -> None:
+        """
+        Update the latest IMU quaternion.
+        """
+        self.update("imu", quat, read_ns)
+
+    def set_dwm_pos(self, pos: Any, read_ns: Optional[int] = None) -> None:
+        """
+        Update the latest DWM position (only x/y/z are shared).
+        """
+        self.update("dwm", pos, read_ns)
+
+    def update(self, sensor: str, value: Any, read_ns: Optional[int] = None) -> None:
+        """
+        Store a new value for any registered sensor, as its driver row.
+        """
+        driver = self._drivers.get(sensor)
+        if driver is None:
+            raise ValueError(f"Unknown sensor: {sensor}")
+        row = driver.to_row(value)
+        if row is not None:
+            self._store(sensor, tuple(row), read_ns)
+
+    def _store(self, sensor: str, row: tuple, read_ns: Optional[int]) -> None:
+        # CLOCK_MONOTONIC is system-wide, so read_ns stays comparable across processes.
+        if read_ns is None:
+            read_ns = time.monotonic_ns()
+        buf = self._buf
+        off = self._offsets[sensor]
+        counter = _COUNTER.unpack_from(buf, off)[0]
+        seq = _BODY.unpack_from(buf, off + _COUNTER.size)[0]
+        padded = row + (0.0,) * (_MAX_WIDTH - len(row))
+        _COUNTER.pack_into(buf, off, counter + 1)
+        _BODY.pack_into(buf, off + _COUNTER.size, seq + 1, time.time(), len(row), *padded, read_ns)
+        _COUNTER.pack_into(buf, off, counter + 2)
+
+    def recover_writer(self, sensors) -> None:
+        """
+        Close writes left half done by a writer process that was killed
+        mid-update, so readers stop retrying its slots. Call only while no
+        process writes these sensors (before spawning the replacement).
+        """
+        buf = self._buf
+        for sensor in sensors:
+            off = self._offsets[sensor]
+            counter = _COUNTER.unpack_from(buf, off)[0]
+            if counter & 1:
+                _COUNTER.pack_into(buf, off, counter + 1)
+
+    # ---- Readers ----
+
+    def latest(self, sensor: str) -> Sample:
+        """
+        Return the most recent Sample for sensor ("imu" or "dwm").
+
+        Decodes the slot only when it changed since the last call. If no
+        consistent read succeeds within SHM_READ_RETRIES tries, returns the
+        last good sample rather than spinning on a dead writer.
+        """
+        off = self._offsets.get(sensor)
+        if off is None:
+            raise ValueError(f"Unknown sensor: {sensor}")
+        buf = self._buf
+        for _ in range(SHM_READ_RETRIES):
+            counter = _COUNTER.unpack_from(buf, off)[0]
+            cached_counter, cached = self._cache[sensor]
+            if counter == cached_counter:
+                return cached
+            if not counter & 1:
+                seq, ts, count, *values, read_ns = _BODY.unpack_from(buf, off + _COUNTER.size)
+                if _COUNTER.unpack_from(buf, off)[0] == counter:
+                    break
+            # Let the writer (or anything else holding the GIL) run.
+            time.sleep(0)
+        else:
+            return self._cache[sensor][1]
+
+        if seq == 0:
+            sample = _EMPTY
+        else:
+            value = self._drivers[sensor].from_row(tuple(values[:count]))
+            sample = Sample(value, ts, seq, read_ns)
+        self._cache[sensor] = (counter, sample)
+        return sample
+
+    def seq(self, sensor: str) -> int:
+        return self.latest(sensor).seq
+
+    def history(self, sensor: str):
+        if sensor not in self._offsets:
+            raise ValueError(f"Unknown sensor: {sensor}")
+        return None
+
+    def wait_for_update(self, sensor: str, last_seq: int, timeout: Optional[float] = None) -> int:
+        """
+        Poll until sensor has a sample newer than last_seq or timeout expires.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            seq = self.latest(sensor).seq
+            if seq != last_seq:
+                return seq
+            if deadline is not None and time.monotonic() >= deadline:
+                return seq
+            time.sleep(SHM_POLL_SEC)
+
+    @property
+    def imu_quat(self) -> Optional[Quat]:
+        return self.latest("imu").value
+
+    @property
+    def imu_ts(self) -> float:
+        return self.latest("imu").ts
+
+    @property
+    def imu_seq(self) -> int:
+        return self.latest("imu").seq
+
+    @property
+    def dwm_pos(self) -> Optional[Any]:
+        return self.latest("dwm").value
+
+    @property
+    def dwm_ts(self) -> float:
+        return self.latest("dwm").ts
+
+    @property
+    def dwm_seq(self) -> int:
+        return self.latest("dwm").seq
+
+    def snapshot(self) -> dict:
+        imu = self.latest("imu")
+        dwm = self.latest("dwm")
+        return {
+            "imu_quat": imu.value,
+            "imu_ts": imu.ts,
+            "imu_seq": imu.seq,
+            "dwm_pos": dwm.value,
+            "dwm_ts": dwm.ts,
+            "dwm_seq": dwm.seq,
+        }
+
+    # ---- Listeners ----
+
+    def add_listener(self, listener: UpdateListener) -> None:
+        """
+        Register listener(sensor, seq), called from the watcher thread
+        whenever any process writes a new sample.
+        """
+        with self._lock:
+            self._listeners = self._listeners + (listener,)
+            if self._watcher is None:
+                self._watcher = Thread(target=self._watch, name="shm-state-watcher", daemon=True)
+                self._watcher.start()
+
+    def remove_listener(self, listener: UpdateListener) -> None:
+        with self._lock:
+            self._listeners = tuple(l for l in self._listeners if l != listener)
+
+    def _watch(self) -> None:
+        last = {name: self.latest(name).seq for name in self._drivers}
+        while not self._watch_stop.wait(SHM_POLL_SEC):
+            for name in last:
+                seq = self.latest(name).seq
+                if seq == last[name]:
+                    continue
+                last[name] = seq
+                for listener in self._listeners:
+                    try:
+                        listener(name, seq)
+                    except Exception as e:
+                        print(f"[STATE] listener error sensor={name}: {e}")
+
+    def close(self) -> None:
+        """
+        Stop the watcher and release the segment (unlinking it if we created it).
+        """
+        self._watch_stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+        self._cache.clear()
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """
+    Keep this process's resource_tracker from unlinking a segment it only
+    attached to (before Python 3.13 attachments are registered as if owned).
+    """
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def run_sensor_process(shm_name: str, worker_path: str, stop, *args) -> None:
+    """
+    Entry point for a sensor worker running in its own process.
+
+    worker_path is "module:function", e.g. "imu_executor_test:imu_worker".
+    The worker is called as worker(stop, state, *args) with a
+    SharedMemoryState attached to shm_name.
+    """
+    module_name, func_name = worker_path.split(":")
+    worker = getattr(importlib.import_module(module_name), func_name)
+    state = SharedMemoryState.attach(shm_name, untrack=False)
+    try:
+        worker(stop, state, *args)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        state.close()
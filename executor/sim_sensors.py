@@ -0,0 +1,150 @@
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from constants import SIM_DWM_RATE_HZ, SIM_IMU_RATE_HZ
+from dwm_stream_reader import DwmPosition
+
+GRAVITY = 9.80665
+
+# 1-sigma noise at SimConfig.noise == 1.0 (roughly BNO085 / DWM1001 class)
+_QUAT_NOISE_RAD = 0.002
+_ACCEL_NOISE = 0.05  # m/s^2
+_GYRO_NOISE = 0.005  # rad/s
+_POS_NOISE_M = 0.03
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    """
+    Simulated sensor settings.
+
+    - imu_rate_hz / dwm_rate_hz: sample rates (kHz rates are fine)
+    - noise: multiplier on realistic sensor noise (0 = noiseless)
+    - dropout: probability that any one sample is silently dropped
+    - seed: RNG seed for repeatable runs
+    """
+    imu_rate_hz: float = SIM_IMU_RATE_HZ
+    dwm_rate_hz: float = SIM_DWM_RATE_HZ
+    noise: float = 1.0
+    dropout: float = 0.0
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.imu_rate_hz <= 0 or self.dwm_rate_hz <= 0:
+            raise ValueError("Simulated sensor rates must be positive")
+        if not 0.0 <= self.dropout < 1.0:
+            raise ValueError(f"dropout must be in [0, 1), got {self.dropout}")
+        if self.noise < 0:
+            raise ValueError(f"noise must be non-negative, got {self.noise}")
+
+
+def _ticks(stop, rate_hz: float):
+    """
+    Yield (t, read_ns) at rate_hz on an absolute schedule until stop is set.
+
+    Sleeps to each deadline so the average rate holds at high rates; if
+    the consumer falls more than a second behind the schedule is reset
+    instead of bursting to catch up.
+    """
+    period_ns = int(1e9 / rate_hz)
+    start_ns = time.monotonic_ns()
+    deadline = start_ns
+    while not stop.is_set():
+        now = time.monotonic_ns()
+        if deadline > now:
+            time.sleep((deadline - now) / 1e9)
+            now = time.monotonic_ns()
+        elif now - deadline > 1_000_000_000:
+            deadline = now
+        yield (deadline - start_ns) / 1e9, now
+        deadline += period_ns
+
+
+def sim_imu_worker(stop, state, config: SimConfig = SimConfig()) -> None:
+    """
+    Simulated BNO08x: a person turning and swaying.
+
+    Writes orientation ("imu", i/j/k/w), specific force ("imu_accel") and
+    body angular rate ("imu_gyro") consistent with the same ZYX Euler
+    trajectory, each with Gaussian noise, at config.imu_rate_hz.
+    """
+    rng = random.Random(config.seed)
+    noise = config.noise
+    print(f"[SIM_IMU] Worker started at {config.imu_rate_hz:g} Hz")
+
+    for t, read_ns in _ticks(stop, config.imu_rate_hz):
+        if config.dropout and rng.random() < config.dropout:
+            continue
+
+        # Euler angles and their rates
+        yaw = 1.2 * math.sin(0.2 * t) + 0.05 * t
+        yaw_d = 0.24 * math.cos(0.2 * t) + 0.05
+        pitch = 0.15 * math.sin(1.3 * t)
+        pitch_d = 0.195 * math.cos(1.3 * t)
+        roll = 0.10 * math.sin(0.9 * t + 0.5)
+        roll_d = 0.09 * math.cos(0.9 * t + 0.5)
+
+        if noise:
+            yaw += rng.gauss(0.0, _QUAT_NOISE_RAD * noise)
+            pitch += rng.gauss(0.0, _QUAT_NOISE_RAD * noise)
+            roll += rng.gauss(0.0, _QUAT_NOISE_RAD * noise)
+
+        cy, sy = math.cos(yaw / 2), math.sin(yaw / 2)
+        cp, sp = math.cos(pitch / 2), math.sin(pitch / 2)
+        cr, sr = math.cos(roll / 2), math.sin(roll / 2)
+        quat = (
+            sr * cp * cy - cr * sp * sy,
+            cr * sp * cy + sr * cp * sy,
+            cr * cp * sy - sr * sp * cy,
+            cr * cp * cy + sr * sp * sy,
+        )
+
+        sin_p, cos_p = math.sin(pitch), math.cos(pitch)
+        sin_r, cos_r = math.sin(roll), math.cos(roll)
+        gyro = (
+            roll_d - yaw_d * sin_p,
+            pitch_d * cos_r + yaw_d * cos_p * sin_r,
+            -pitch_d * sin_r + yaw_d * cos_p * cos_r,
+        )
+        accel = (-GRAVITY * sin_p, GRAVITY * cos_p * sin_r, GRAVITY * cos_p * cos_r)
+        if noise:
+            gyro = tuple(v + rng.gauss(0.0, _GYRO_NOISE * noise) for v in gyro)
+            accel = tuple(v + rng.gauss(0.0, _ACCEL_NOISE * noise) for v in accel)
+
+        state.update("imu", quat, read_ns)
+        state.update("imu_accel", accel, read_ns)
+        state.update("imu_gyro", gyro, read_ns)
+
+    print("[SIM_IMU] Worker stopping")
+
+
+def sim_dwm_worker(stop, state, config: SimConfig = SimConfig()) -> None:
+    """
+    Simulated DWM1001 tag walking a figure-eight in a 4 m x 3 m room at
+    config.dwm_rate_hz, with Gaussian position noise and a varying
+    quality factor.
+    """
+    rng = random.Random(config.seed)
+    sigma = _POS_NOISE_M * config.noise
+    print(f"[SIM_DWM] Worker started at {config.dwm_rate_hz:g} Hz")
+
+    for t, read_ns in _ticks(stop, config.dwm_rate_hz):
+        if config.dropout and rng.random() < config.dropout:
+            continue
+
+        w = 0.25 * t
+        x = 2.0 + 1.5 * math.sin(w)
+        y = 1.5 + 1.0 * math.sin(2 * w)
+        z = 1.0 + 0.03 * math.sin(5 * w)
+        if sigma:
+            x += rng.gauss(0.0, sigma)
+            y += rng.gauss(0.0, sigma)
+            z += rng.gauss(0.0, sigma)
+        quality = max(0, min(100, int(85 + 10 * math.sin(0.1 * t) + rng.gauss(0.0, 3.0))))
+
+        state.set_dwm_pos(DwmPosition(x, y, z, quality), read_ns)
+
+    print("[SIM_DWM] Worker stopping")
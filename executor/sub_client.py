@@ -1,8 +1,87 @@
 import argparse
 import time
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, List, Optional
 
 import zenoh
 
+from frame_meta import FrameMeta
+
+# Latency samples kept per stage for percentile reports
+STATS_WINDOW = 4096
+
+STAGES = ("read_to_encode", "encode_to_publish", "publish_to_receive", "end_to_end")
+
+
+class StreamStats:
+    """
+    Latency and loss bookkeeping for one topic, fed from FrameMeta attachments.
+
+    Stages (milliseconds):
+    - read_to_encode: sensor read -> payload encoded (includes batching wait)
+    - encode_to_publish: encoded -> handed to Zenoh (scheduler delay)
+    - publish_to_receive: put -> this subscriber (wall clock, needs synced clocks)
+    - end_to_end: sensor read -> this subscriber
+
+    Loss is gap-based on the per-bridge frame_seq: a jump from n to n + k
+    counts k - 1 lost frames; frames at or below the last seen seq count as
+    reordered/duplicate. stale counts frames flagged FRAME_STALE (sent
+    while a source sensor was stalled or restarting).
+    """
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.latency_ms: Dict[str, Deque[float]] = {stage: deque(maxlen=window) for stage in STAGES}
+        self.received = 0
+        self.lost = 0
+        self.reordered = 0
+        self.stale = 0
+        self.last_frame_seq: Optional[int] = None
+
+    def add(self, meta: FrameMeta, recv_ts: float) -> None:
+        self.received += 1
+        if meta.stale:
+            self.stale += 1
+        last = self.last_frame_seq
+        if last is not None:
+            if meta.frame_seq > last + 1:
+                self.lost += meta.frame_seq - last - 1
+            elif meta.frame_seq <= last:
+                self.reordered += 1
+        if last is None or meta.frame_seq > last:
+            self.last_frame_seq = meta.frame_seq
+
+        network_ms = (recv_ts - meta.publish_ts) * 1e3
+        self.latency_ms["read_to_encode"].append((meta.encode_ns - meta.read_ns) / 1e6)
+        self.latency_ms["encode_to_publish"].append((meta.publish_ns - meta.encode_ns) / 1e6)
+        self.latency_ms["publish_to_receive"].append(network_ms)
+        self.latency_ms["end_to_end"].append((meta.publish_ns - meta.read_ns) / 1e6 + network_ms)
+
+    @property
+    def loss_rate(self) -> float:
+        expected = self.received + self.lost
+        return self.lost / expected if expected else 0.0
+
+    def report(self) -> List[str]:
+        lines = [
+            f"  frames={self.received} lost={self.lost} ({self.loss_rate:.2%}) "
+            f"reordered={self.reordered} stale={self.stale}"
+        ]
+        for stage in STAGES:
+            values = sorted(self.latency_ms[stage])
+            if not values:
+                continue
+            p50, p90, p99 = (_percentile(values, q) for q in (0.50, 0.90, 0.99))
+            lines.append(
+                f"  {stage:<18} p50={p50:8.3f} p90={p90:8.3f} p99={p99:8.3f} max={values[-1]:8.3f} ms"
+            )
+        return lines
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    idx = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[idx]
+
 
 def main():
     parser = argparse.ArgumentParser()
@@ -16,6 +95,12 @@ def main():
         required=True,
         help="Topic to subscribe to, e.g. human/imu",
     )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Report per-stage latency percentiles and frame loss instead of printing payloads",
+    )
+    parser.add_argument("--report-sec", type=float, default=5.0, help="Stats report period")
     args = parser.parse_args()
 
     config = zenoh.Config()
@@ -24,7 +109,20 @@ def main():
 
     z = zenoh.open(config)
 
+    streams: Dict[str, StreamStats] = {}
+    streams_lock = Lock()
+
     def listener(sample):
+        if args.stats:
+            recv_ts = time.time()
+            attachment = sample.attachment
+            meta = FrameMeta.unpack(attachment.to_bytes()) if attachment is not None else None
+            if meta is None:
+                return
+            with streams_lock:
+                streams.setdefault(str(sample.key_expr), StreamStats()).add(meta, recv_ts)
+            return
+
         try:
             payload = sample.payload.to_bytes().decode()
         except Exception:
@@ -37,11 +135,17 @@ def main():
     print(f"Subscribed to {args.topic}. Press Ctrl+C to stop.")
     try:
         while True:
-            time.sleep(1.0)
+            time.sleep(args.report_sec if args.stats else 1.0)
+            if args.stats:
+                with streams_lock:
+                    for key, stream in streams.items():
+                        print(f"[{key}]")
+                        for line in stream.report():
+                            print(line)
     except KeyboardInterrupt:
         sub.undeclare()
         z.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
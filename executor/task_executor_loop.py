@@ -1,40 +1,89 @@
 # task_executor_loop.py
+import argparse
 import time
-from executor.constants import TASK_PERIOD_SEC, STABLE_W_THRESHOLD
-from executor.bridge_executor_service import BridgeService
+
+import zenoh
+
+from bridge_history import BridgeHistory
+from constants import STABILITY_WINDOW_SEC, STABLE_SCORE_THRESHOLD, TASK_BRIDGE_MGMT, TASK_PERIOD_SEC
+from message_types import MessageType
+from orientation_analytics import analyze_window
+
+# Key of the private bridge manager a --standalone loop runs, so it never
+# collides with the backend's management services.
+STANDALONE_MGMT = "task/bridge_mgmt"
 
 
 def main() -> None:
     """
     Task loop that consumes sensor data and makes decisions.
 
-    - Periodically reads BridgeService snapshot
-    - Evaluates IMU orientation
+    - Periodically takes the last STABILITY_WINDOW_SEC of IMU history
+    - Scores orientation stability over that window
     - Decides whether to trigger actuators
+
+    By default the IMU history is streamed from the running backend's
+    bridge manager (see BridgeHistory), so the loop opens no devices and
+    declares no services. --standalone runs a private BridgeManager on
+    STANDALONE_MGMT with its own sensors instead (hardware, or simulated
+    with --sim); only use it when no backend owns the sensors.
     """
-    bridge = BridgeService()
-    bridge.start()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zenoh-endpoint", default=None, help='Optional Zenoh router endpoint, e.g. "tcp/192.168.1.50:7447"')
+    parser.add_argument("--bridge-mgmt", default=TASK_BRIDGE_MGMT, help="Bridge manager to stream IMU history from")
+    parser.add_argument("--standalone", action="store_true", help="Run own sensors instead of using the backend's")
+    parser.add_argument("--sim", action="store_true", help="With --standalone: use simulated sensors instead of hardware")
+    args = parser.parse_args()
+    if args.sim and not args.standalone:
+        parser.error("--sim needs --standalone")
+
+    config = zenoh.Config()
+    if args.zenoh_endpoint:
+        config.insert_json5("connect/endpoints", f'["{args.zenoh_endpoint}"]')
+    z = zenoh.open(config)
+
+    mgr = feed = None
+    if args.standalone:
+        from bridge_executor_service import BridgeManager
+
+        mgr = BridgeManager(z, STANDALONE_MGMT)
+        if args.sim:
+            from sim_sensors import SimConfig
+
+            mgr.start_sensors(sim=SimConfig())
+        else:
+            mgr.start_sensors()
+        imu_history = mgr.state.history(MessageType.IMU)
+    else:
+        feed = BridgeHistory(z, MessageType.IMU, mgmt_key=args.bridge_mgmt)
+        feed.open()
+        imu_history = feed.history()
 
     try:
         while True:
-            snap = bridge.snapshot()
-            quat = snap["imu_quat"]
+            window = imu_history.since(time.time() - STABILITY_WINDOW_SEC)
+            stats = analyze_window(window)
 
-            if quat:
-                i, j, k, w = quat
-                if w >= STABLE_W_THRESHOLD:
-                    print("[TASK] Stable orientation (w>=threshold)")
+            if stats is not None:
+                detail = f"score={stats.stability:.2f} drift={stats.drift_rad_s:.2f}rad/s spread={stats.spread_rad:.3f}rad"
+                if stats.stability >= STABLE_SCORE_THRESHOLD:
+                    print(f"[TASK] Stable orientation ({detail})")
                 else:
-                    print("[TASK] Orientation changed -> would trigger actuator")
+                    print(f"[TASK] Orientation changed -> would trigger actuator ({detail})")
 
-            # you can also read DWM position here:
-            # pos = snap["dwm_pos"]
+            # DWM position history works the same way:
+            # BridgeHistory(z, MessageType.DWM) or mgr.state.history(MessageType.DWM)
 
             time.sleep(TASK_PERIOD_SEC)
 
     except KeyboardInterrupt:
         print("\n[TASK] Shutting down...")
-        bridge.shutdown()
+    finally:
+        if feed is not None:
+            feed.close()
+        if mgr is not None:
+            mgr.shutdown()
+        z.close()
 
 
 if __name__ == "__main__":
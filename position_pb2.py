@@ -13,7 +13,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0eposition.proto\x12\ttelemetry\"N\n\x08Position\x12\x0b\n\x03x_m\x18\x01 \x01(\x02\x12\x0b\n\x03y_m\x18\x02 \x01(\x02\x12\x0b\n\x03z_m\x18\x03 \x01(\x02\x12\x0b\n\x03seq\x18\x04 \x01(\x04\x12\x0e\n\x06source\x18\x05 \x01(\tb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0eposition.proto\x12\ttelemetry\"Z\n\x08Position\x12\x0b\n\x03x_m\x18\x01 \x01(\x02\x12\x0b\n\x03y_m\x18\x02 \x01(\x02\x12\x0b\n\x03z_m\x18\x03 \x01(\x02\x12\x0b\n\x03seq\x18\x04 \x01(\x04\x12\x0e\n\x06source\x18\x05 \x01(\t\x12\n\n\x02ts\x18\x06 \x01(\x01\"b\n\x0bOrientation\x12\t\n\x01i\x18\x01 \x01(\x02\x12\t\n\x01j\x18\x02 \x01(\x02\x12\t\n\x01k\x18\x03 \x01(\x02\x12\t\n\x01w\x18\x04 \x01(\x02\x12\x0b\n\x03seq\x18\x05 \x01(\x04\x12\x0e\n\x06source\x18\x06 \x01(\t\x12\n\n\x02ts\x18\x07 \x01(\x01\"_\n\rPositionBatch\x12\n\n\x02ts\x18\x01 \x03(\x01\x12\x0b\n\x03seq\x18\x02 \x03(\x04\x12\x0b\n\x03x_m\x18\x03 \x03(\x02\x12\x0b\n\x03y_m\x18\x04 \x03(\x02\x12\x0b\n\x03z_m\x18\x05 \x03(\x02\x12\x0e\n\x06source\x18\x06 \x01(\t\"g\n\x10OrientationBatch\x12\n\n\x02ts\x18\x01 \x03(\x01\x12\x0b\n\x03seq\x18\x02 \x03(\x04\x12\t\n\x01i\x18\x03 \x03(\x02\x12\t\n\x01j\x18\x04 \x03(\x02\x12\t\n\x01k\x18\x05 \x03(\x02\x12\t\n\x01w\x18\x06 \x03(\x02\x12\x0e\n\x06source\x18\x07 \x01(\t\"S\n\x07Vector3\x12\t\n\x01x\x18\x01 \x01(\x02\x12\t\n\x01y\x18\x02 \x01(\x02\x12\t\n\x01z\x18\x03 \x01(\x02\x12\x0b\n\x03seq\x18\x04 \x01(\x04\x12\x0e\n\x06source\x18\x05 \x01(\t\x12\n\n\x02ts\x18\x06 \x01(\x01\"X\n\x0cVector3Batch\x12\n\n\x02ts\x18\x01 \x03(\x01\x12\x0b\n\x03seq\x18\x02 \x03(\x04\x12\t\n\x01x\x18\x03 \x03(\x02\x12\t\n\x01y\x18\x04 \x03(\x02\x12\t\n\x01z\x18\x05 \x03(\x02\x12\x0e\n\x06source\x18\x06 \x01(\t\"\x9a\x01\n\x04Pose\x12\x0b\n\x03x_m\x18\x01 \x01(\x02\x12\x0b\n\x03y_m\x18\x02 \x01(\x02\x12\x0b\n\x03z_m\x18\x03 \x01(\x02\x12\t\n\x01i\x18\x04 \x01(\x02\x12\t\n\x01j\x18\x05 \x01(\x02\x12\t\n\x01k\x18\x06 \x01(\x02\x12\t\n\x01w\x18\x07 \x01(\x02\x12\x16\n\x0eposition_age_s\x18\x08 \x01(\x02\x12\x0b\n\x03seq\x18\t \x01(\x04\x12\x0e\n\x06source\x18\n \x01(\t\x12\n\n\x02ts\x18\x0b \x01(\x01\"\x9f\x01\n\tPoseBatch\x12\n\n\x02ts\x18\x01 \x03(\x01\x12\x0b\n\x03seq\x18\x02 \x03(\x04\x12\x0b\n\x03x_m\x18\x03 \x03(\x02\x12\x0b\n\x03y_m\x18\x04 \x03(\x02\x12\x0b\n\x03z_m\x18\x05 \x03(\x02\x12\t\n\x01i\x18\x06 \x03(\x02\x12\t\n\x01j\x18\x07 \x03(\x02\x12\t\n\x01k\x18\x08 \x03(\x02\x12\t\n\x01w\x18\t \x03(\x02\x12\x16\n\x0eposition_age_s\x18\n \x03(\x02\x12\x0e\n\x06source\x18\x0b \x01(\tb\x06proto3')
 
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'position_pb2', globals())
@@ -21,5 +21,19 @@ if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
   _POSITION._serialized_start=29
-  _POSITION._serialized_end=107
+  _POSITION._serialized_end=119
+  _ORIENTATION._serialized_start=121
+  _ORIENTATION._serialized_end=219
+  _POSITIONBATCH._serialized_start=221
+  _POSITIONBATCH._serialized_end=316
+  _ORIENTATIONBATCH._serialized_start=318
+  _ORIENTATIONBATCH._serialized_end=421
+  _VECTOR3._serialized_start=423
+  _VECTOR3._serialized_end=506
+  _VECTOR3BATCH._serialized_start=508
+  _VECTOR3BATCH._serialized_end=596
+  _POSE._serialized_start=599
+  _POSE._serialized_end=753
+  _POSEBATCH._serialized_start=756
+  _POSEBATCH._serialized_end=915
 # @@protoc_insertion_point(module_scope)
@@ -1,32 +1,46 @@
+import sys
 import time
-from bridge_service import BridgeService
+from pathlib import Path
+
+import zenoh
+
+sys.path.append(str(Path(__file__).resolve().parent / "executor"))
+from bridge_history import BridgeHistory
+from constants import STABILITY_WINDOW_SEC, STABLE_SCORE_THRESHOLD, TASK_PERIOD_SEC
+from message_types import MessageType
+from orientation_analytics import analyze_window
 
 
 class Task:
-    def __init__(self, bridge):
-        self.bridge = bridge
+    def __init__(self, imu_history):
+        self.imu_history = imu_history
 
     def execute(self):
-        state = self.bridge.snapshot()
-        imu = state["imu"]
+        window = self.imu_history.since(time.time() - STABILITY_WINDOW_SEC)
+        stats = analyze_window(window)
 
-        if imu:
-            _, _, _, w = imu
-            if w > 0.9:
-                print("[TASK] Stable orientation → do nothing")
+        if stats is not None:
+            if stats.stability >= STABLE_SCORE_THRESHOLD:
+                print(f"[TASK] Stable orientation (score {stats.stability:.2f}) → do nothing")
             else:
-                print("[TASK] Orientation changed → trigger actuator")
+                print(f"[TASK] Orientation changed (score {stats.stability:.2f}) → trigger actuator")
 
 
 if __name__ == "__main__":
-    bridge = BridgeService()
-    bridge.start()
+    # IMU history is streamed from the running backend's bridge manager;
+    # see executor/task_executor_loop.py --standalone to run own sensors.
+    z = zenoh.open(zenoh.Config())
+    feed = BridgeHistory(z, MessageType.IMU)
+    feed.open()
 
-    task = Task(bridge)
+    task = Task(feed.history())
 
     try:
         while True:
             task.execute()
-            time.sleep(0.5)
+            time.sleep(TASK_PERIOD_SEC)
     except KeyboardInterrupt:
-        pass
\ No newline at end of file
+        pass
+    finally:
+        feed.close()
+        z.close()